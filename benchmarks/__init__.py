@@ -0,0 +1 @@
+"""Générateurs d'automates et mesures de performance des opérations d'Automate."""
@@ -0,0 +1,187 @@
+"""Vérifie la croissance empirique des algorithmes, indépendamment de la vitesse de la machine.
+
+Chaque cas exécute une opération sur des tailles doublées, ajuste une droite sur
+(log taille, log temps) et échoue si la pente dépasse l'exposant déclaré.
+
+    python -m benchmarks.complexite                    # tous les cas, code de retour 1 si dépassement
+    python -m benchmarks.complexite --filtre minimiser
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks import generateurs as g
+from classes.Automate import Automate
+
+# Exposants tolérés. La marge absorbe le bruit, les facteurs logarithmiques et les
+# défauts de cache des parcours aléatoires (sensibles dès quelques milliers d'états) ;
+# elle reste loin de 2, l'exposant d'une boucle `next(...)` sur les transitions.
+LINEAIRE = 1.5
+N_LOG_N = 1.6
+# Coût indépendant de la taille de l'automate (à longueur de mot fixée)
+CONSTANTE = 0.3
+
+
+class CasComplexite:
+    """Une opération, une famille d'automates, des tailles doublées et l'exposant maximal.
+
+    La croissance est mesurée en fonction du nombre d'états et de transitions de
+    l'entrée, ou de l'automate produit si `selon_sortie` (construction des sous-ensembles).
+    Avec `preparer` (appliqué hors chronomètre), l'opération ne doit pas modifier
+    l'automate : il est généré une fois par taille et chaque mesure enchaîne
+    `appels` exécutions, pour les opérations trop brèves pour être chronométrées seules.
+    """
+
+    def __init__(self, operation: str, generateur: str, tailles: List[int], borne: float,
+                 fonction: Callable, selon_sortie: bool = False, preparer: Optional[Callable] = None,
+                 appels: int = 1):
+        self.operation = operation
+        self.generateur = generateur
+        self.tailles = tailles
+        self.borne = borne
+        self.fonction = fonction
+        self.selon_sortie = selon_sortie
+        self.preparer = preparer
+        self.appels = appels
+
+    @property
+    def cle(self) -> str:
+        return f"{self.operation}/{self.generateur}"
+
+
+def _taille(automate: Automate) -> int:
+    return len(automate.etats) + len(automate.transitions)
+
+
+def _charger_sauvegarder(automate: Automate):
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "a.json")
+        automate.sauvegarder_fichier(chemin)
+        return Automate.charger_fichier(chemin)
+
+
+def _completer(automate: Automate):
+    automate.completer_automate()
+
+
+MOT = g.mot_aleatoire("ab", 20)
+
+CAS = [
+    CasComplexite("emonder", "afd_aleatoire", [500, 1000, 2000, 4000], LINEAIRE, lambda a: a.emonder()),
+    CasComplexite("emonder", "chaine_profonde", [1000, 2000, 4000, 8000], LINEAIRE, lambda a: a.emonder()),
+    CasComplexite("tous_etats_accessibles", "afd_aleatoire", [500, 1000, 2000, 4000], LINEAIRE,
+                  lambda a: a.tous_etats_accessibles()),
+    CasComplexite("completer_automate", "afd_aleatoire", [500, 1000, 2000, 4000], LINEAIRE, _completer),
+    # Mot de longueur fixe, index déjà construit par un premier mot : ne doit pas croître avec |Q|
+    CasComplexite("reconnait_mot", "afd_aleatoire", [500, 1000, 2000, 4000], CONSTANTE,
+                  lambda a: a.reconnait_mot(MOT), preparer=lambda a: a.reconnait_mot(""), appels=1000),
+    CasComplexite("minimiser_auto", "afd_aleatoire", [500, 1000, 2000, 4000], N_LOG_N, lambda a: a.minimiser_auto()),
+    CasComplexite("minimiser_auto", "pire_cas_moore", [1000, 2000, 4000, 8000], N_LOG_N, lambda a: a.minimiser_auto()),
+    CasComplexite("minimiser_auto", "chaine_profonde", [1000, 2000, 4000, 8000], N_LOG_N, lambda a: a.minimiser_auto()),
+    CasComplexite("tous_etats_distinguables", "pire_cas_moore", [1000, 2000, 4000, 8000], N_LOG_N,
+                  lambda a: a.tous_etats_distinguables()),
+    # Construction des sous-ensembles : linéaire en la taille de l'AFD produit
+    CasComplexite("determiniser", "nieme_depuis_la_fin", [9, 10, 11, 12], LINEAIRE,
+                  lambda a: a.determiniser(), selon_sortie=True),
+    CasComplexite("sont_equivalents", "afd_aleatoire", [500, 1000, 2000, 4000], LINEAIRE,
+                  lambda a: Automate.sont_equivalents(a, a.copier(), 10 ** 9)),
+    CasComplexite("est_fini", "afd_aleatoire", [500, 1000, 2000, 4000], LINEAIRE, lambda a: a.est_fini()),
+    CasComplexite("mot_le_plus_long", "dag_fini", [1000, 2000, 4000, 8000], LINEAIRE,
+                  lambda a: a.mot_le_plus_long()),
+    CasComplexite("hash_canonique", "afd_aleatoire", [500, 1000, 2000, 4000], N_LOG_N,
+                  lambda a: a.hash_canonique()),
+    CasComplexite("charger_sauvegarder", "afd_aleatoire", [500, 1000, 2000, 4000], LINEAIRE, _charger_sauvegarder),
+]
+
+
+def pente(points: List[tuple]) -> float:
+    """Pente de la droite des moindres carrés sur (log x, log y)."""
+    xs = [math.log(x) for x, _ in points]
+    ys = [math.log(y) for _, y in points]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sum((x - mx) ** 2 for x in xs)
+
+
+def mesurer(cas: CasComplexite, repetitions: int = 3, duree_min: float = 0.2) -> Dict:
+    """Meilleur temps pour chaque taille, puis exposant ajusté comparé à la borne.
+
+    Les petites tailles sont répétées jusqu'à `duree_min` secondes cumulées pour
+    que le minimum ne soit pas dominé par le bruit ; le ramasse-miettes est
+    suspendu pendant chaque mesure, comme dans timeit.
+    """
+    points = []
+    for n in cas.tailles:
+        meilleur, taille, cumul, essais = None, None, 0.0, 0
+        automate = None
+        while essais < repetitions or cumul < duree_min:
+            if automate is None or cas.preparer is None:
+                automate = g.GENERATEURS[cas.generateur](n)
+                taille = _taille(automate)
+                if cas.preparer is not None:
+                    cas.preparer(automate)
+            gc.collect()
+            gc.disable()
+            try:
+                debut = time.perf_counter()
+                for _ in range(cas.appels):
+                    resultat = cas.fonction(automate)
+                duree = (time.perf_counter() - debut) / cas.appels
+            except Exception as e:
+                return {"operation": cas.operation, "generateur": cas.generateur, "taille": n,
+                        "erreur": f"{type(e).__name__}: {e}", "borne": cas.borne, "ok": False}
+            finally:
+                gc.enable()
+            meilleur = duree if meilleur is None else min(meilleur, duree)
+            cumul += duree * cas.appels
+            essais += 1
+            if cas.selon_sortie:
+                taille = _taille(resultat)
+        points.append((taille, max(meilleur, 1e-6)))
+    exposant = pente(points)
+    return {
+        "operation": cas.operation,
+        "generateur": cas.generateur,
+        "points": points,
+        "exposant": round(exposant, 3),
+        "borne": cas.borne,
+        "ok": exposant <= cas.borne,
+    }
+
+
+def executer(filtre: Optional[str] = None, repetitions: int = 3, journal=sys.stderr) -> List[Dict]:
+    resultats = []
+    for cas in CAS:
+        if filtre and filtre not in cas.cle:
+            continue
+        r = mesurer(cas, repetitions)
+        if "erreur" in r:
+            journal.write(f"ÉCHEC {cas.cle} n={r['taille']}: {r['erreur']}\n")
+        else:
+            journal.write(f"{'ok  ' if r['ok'] else 'ÉCHEC'} {cas.cle}: exposant {r['exposant']:.2f} "
+                          f"(borne {cas.borne})\n")
+        resultats.append(r)
+    return resultats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Exposants de croissance des opérations d'Automate.")
+    parser.add_argument("--filtre", help="ne mesurer que les cas dont 'operation/generateur' contient ce texte")
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--sortie", help="fichier JSON où écrire les résultats")
+    args = parser.parse_args(argv)
+
+    resultats = executer(args.filtre, args.repetitions)
+    if args.sortie:
+        with open(args.sortie, "w") as f:
+            json.dump(resultats, f, indent=4)
+    return 0 if all(r["ok"] for r in resultats) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
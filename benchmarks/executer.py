@@ -0,0 +1,206 @@
+"""Mesure les opérations d'Automate sur des balayages de tailles et compare à une référence.
+
+    python -m benchmarks                          # mesures, JSON sur la sortie standard
+    python -m benchmarks --sortie mesures.json    # écrit le résultat
+    python -m benchmarks --reference base.json    # code de retour 1 en cas de régression
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from benchmarks import generateurs as g
+from classes.Automate import Automate
+from classes.corpus import tester_corpus
+from classes.symbolique import AutomateSymbolique
+
+
+class Cas:
+    """Une opération mesurée sur une famille d'automates et une liste de tailles."""
+
+    def __init__(self, operation: str, generateur: str, tailles: List[int], fonction: Callable, rapide: List[int] = None):
+        self.operation = operation
+        self.generateur = generateur
+        self.tailles = tailles
+        self.rapide = rapide or tailles[:2]
+        self.fonction = fonction
+
+    @property
+    def cle(self) -> str:
+        return f"{self.operation}/{self.generateur}"
+
+
+def _charger_sauvegarder(automate: Automate):
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "a.json")
+        automate.sauvegarder_fichier(chemin)
+        Automate.charger_fichier(chemin)
+
+
+def _tester_corpus(automate: Automate):
+    """20 000 mots de 20 symboles, morceaux de 64 Kio sur deux processus."""
+    symboles = "".join(a.valeur for a in automate.alphabets if a.valeur != "ε")
+    with tempfile.TemporaryDirectory() as dossier:
+        entree = os.path.join(dossier, "mots.txt")
+        with open(entree, "w", encoding="utf-8") as f:
+            for i in range(20000):
+                f.write(g.mot_aleatoire(symboles, 20, i) + "\n")
+        tester_corpus(automate, entree, os.path.join(dossier, "resultats.txt"), jobs=2, taille_morceau=1 << 16)
+
+
+def _dessiner(automate: Automate):
+    """Rendu complet sur un canvas Tk hors écran ; ignoré sans affichage disponible."""
+    import tkinter as tk
+    from classes.rendu import RenduAutomate
+    from classes.disposition import MoteurDisposition
+
+    racine = tk.Tk()
+    try:
+        racine.withdraw()
+        canvas = tk.Canvas(racine, width=1000, height=800)
+        rendu = RenduAutomate(canvas, {"primary": "#4a6fa5", "secondary": "#f8f9fa", "text": "#212529",
+                                       "final_state_bg": "#d4edda"},
+                              MoteurDisposition(tempfile.mkdtemp()))
+        rendu.afficher(automate)
+        racine.update()
+    finally:
+        racine.destroy()
+
+
+def _mot(automate: Automate) -> str:
+    symboles = "".join(a.valeur for a in automate.alphabets if a.valeur != "ε")
+    return g.mot_aleatoire(symboles, 1000)
+
+
+CAS = [
+    Cas("reconnait_mot", "afd_aleatoire", [100, 200, 400, 800], lambda a: a.reconnait_mot(_mot(a))),
+    Cas("reconnait_mot", "afn_aleatoire", [50, 100, 200, 400], lambda a: a.reconnait_mot(_mot(a))),
+    Cas("determiniser", "afn_aleatoire", [8, 12, 16, 20], lambda a: a.determiniser()),
+    Cas("determiniser", "nieme_depuis_la_fin", [6, 8, 10, 12], lambda a: a.determiniser()),
+    Cas("determiniser_parallele", "nieme_depuis_la_fin", [6, 8, 10, 12], lambda a: a.determiniser_parallele(2)),
+    # Plafond de 64 Kio : les tables débordent sur disque dès n = 10
+    Cas("determiniser_borne", "nieme_depuis_la_fin", [6, 8, 10, 12], lambda a: a.determiniser_borne(1 << 16)),
+    Cas("determiniser", "chaine_epsilon", [50, 100, 200, 400], lambda a: a.determiniser()),
+    Cas("eliminer_epsilon", "chaine_epsilon", [50, 100, 200, 400], lambda a: a.eliminer_epsilon()),
+    Cas("reconnait_mot", "chaine_epsilon", [50, 100, 200, 400], lambda a: a.reconnait_mot(_mot(a))),
+    Cas("minimiser_auto", "afd_aleatoire", [50, 100, 200, 400], lambda a: a.minimiser_auto()),
+    # AFD intermédiaire en 2^n états pour un AFD minimal de n+1 états : Brzozowski l'évite
+    Cas("minimiser_nfa_classique", "nieme_quelconque", [6, 8, 10, 12], lambda a: a.minimiser_nfa("classique")),
+    Cas("minimiser_nfa_brzozowski", "nieme_quelconque", [6, 8, 10, 12], lambda a: a.minimiser_nfa("brzozowski")),
+    Cas("minimiser_nfa", "afn_aleatoire", [8, 12, 16, 20], lambda a: a.minimiser_nfa()),
+    Cas("minimiser_symbolique", "afn_aleatoire", [8, 12, 16, 20],
+        lambda a: AutomateSymbolique.depuis_automate(a).minimiser()),
+    Cas("minimiser_auto", "pire_cas_moore", [50, 100, 200, 400], lambda a: a.minimiser_auto()),
+    Cas("minimiser_auto", "chaine_profonde", [100, 200, 400, 800], lambda a: a.minimiser_auto()),
+    Cas("sont_equivalents", "afd_aleatoire", [50, 100, 200, 400],
+        lambda a: Automate.sont_equivalents(a, a.minimiser_auto(), 12)),
+    # Déterminiser nieme_depuis_la_fin coûte 2^n états ; les antichaînes restent polynomiales ici
+    Cas("sont_equivalents_antichaines", "nieme_depuis_la_fin", [6, 8, 10, 12],
+        lambda a: Automate.sont_equivalents(a, a.copier(), None, methode="antichaines")),
+    Cas("inclus_dans", "afn_aleatoire", [8, 12, 16, 20], lambda a: a.inclus_dans(a.determiniser())),
+    Cas("generer_mots_acceptes", "afd_aleatoire", [10, 20, 40, 80], lambda a: a.generer_mots_acceptes(8)),
+    Cas("charger_sauvegarder", "afd_aleatoire", [500, 1000, 2000, 4000], _charger_sauvegarder),
+    Cas("figer", "afd_aleatoire", [500, 1000, 2000, 4000], lambda a: a.figer().liberer()),
+    Cas("tester_corpus", "afd_aleatoire", [100, 1000, 10000, 100000], _tester_corpus),
+    Cas("dessiner", "afd_aleatoire", [50, 100, 200, 400], _dessiner),
+]
+
+
+def mesurer(cas: Cas, taille: int, repetitions: int) -> Dict:
+    """Meilleur temps sur `repetitions` exécutions ; l'automate est régénéré à chaque fois."""
+    resultat = {"operation": cas.operation, "generateur": cas.generateur, "taille": taille}
+    meilleur = None
+    for _ in range(repetitions):
+        automate = g.GENERATEURS[cas.generateur](taille)
+        gc.collect()
+        debut = time.perf_counter()
+        try:
+            cas.fonction(automate)
+        except Exception as e:
+            resultat["erreur"] = f"{type(e).__name__}: {e}"
+            return resultat
+        duree = time.perf_counter() - debut
+        meilleur = duree if meilleur is None else min(meilleur, duree)
+    resultat["secondes"] = meilleur
+    return resultat
+
+
+def executer(filtre: Optional[str] = None, rapide: bool = False, repetitions: int = 3, journal=sys.stderr) -> Dict:
+    resultats = []
+    for cas in CAS:
+        if filtre and filtre not in cas.cle:
+            continue
+        if cas.operation == "dessiner" and not _affichage_disponible():
+            journal.write(f"{cas.cle}: ignoré (pas d'affichage)\n")
+            continue
+        for taille in (cas.rapide if rapide else cas.tailles):
+            r = mesurer(cas, taille, repetitions)
+            journal.write(f"{cas.cle} n={taille}: {r.get('erreur') or format(r['secondes'], '.4f') + ' s'}\n")
+            resultats.append(r)
+    return {
+        "meta": {
+            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "plateforme": platform.platform(),
+        },
+        "resultats": resultats,
+    }
+
+
+def _affichage_disponible() -> bool:
+    try:
+        import tkinter as tk
+        tk.Tk().destroy()
+        return True
+    except Exception:
+        return False
+
+
+def comparer(mesures: Dict, reference: Dict, seuil: float = 1.5, plancher: float = 0.001) -> List[str]:
+    """Régressions : mesures plus lentes que `seuil` fois la référence (au-delà de `plancher` secondes)."""
+    base = {(r["operation"], r["generateur"], r["taille"]): r for r in reference["resultats"]}
+    regressions = []
+    for r in mesures["resultats"]:
+        b = base.get((r["operation"], r["generateur"], r["taille"]))
+        if b is None or "secondes" not in b:
+            continue
+        if "erreur" in r:
+            regressions.append(f"{r['operation']}/{r['generateur']} n={r['taille']}: {r['erreur']}")
+        elif r["secondes"] > plancher and r["secondes"] > seuil * b["secondes"]:
+            regressions.append(f"{r['operation']}/{r['generateur']} n={r['taille']}: "
+                               f"{r['secondes']:.4f} s contre {b['secondes']:.4f} s "
+                               f"(x{r['secondes'] / b['secondes']:.2f})")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks des opérations d'Automate.")
+    parser.add_argument("--filtre", help="ne mesurer que les cas dont 'operation/generateur' contient ce texte")
+    parser.add_argument("--rapide", action="store_true", help="seulement les plus petites tailles")
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--sortie", help="fichier JSON où écrire les mesures")
+    parser.add_argument("--reference", help="fichier JSON de référence à comparer")
+    parser.add_argument("--seuil", type=float, default=1.5, help="ralentissement toléré par rapport à la référence")
+    args = parser.parse_args(argv)
+
+    mesures = executer(args.filtre, args.rapide, args.repetitions)
+    if args.sortie:
+        with open(args.sortie, "w") as f:
+            json.dump(mesures, f, indent=4)
+    else:
+        json.dump(mesures, sys.stdout, indent=4)
+        sys.stdout.write("\n")
+
+    if args.reference:
+        with open(args.reference, "r") as f:
+            regressions = comparer(mesures, json.load(f), args.seuil)
+        for r in regressions:
+            sys.stderr.write(f"RÉGRESSION {r}\n")
+        return 1 if regressions else 0
+    return 0
@@ -0,0 +1,165 @@
+"""Générateurs d'automates paramétrés et reproductibles (graine fixe) pour les mesures."""
+import random
+
+from classes.Alphabet import Alphabet
+from classes.Automate import Automate
+from classes.Etat import Etat
+from classes.Transition import Transition
+
+
+class _Constructeur:
+    """Petit utilitaire pour construire un automate par ids entiers."""
+
+    def __init__(self, nom: str, symboles):
+        self.automate = Automate(nom)
+        self.symboles = {}
+        for i, s in enumerate(symboles):
+            self.symboles[s] = Alphabet(i + 1, s)
+            self.automate.ajouter_alphabet(self.symboles[s])
+        self.etats = {}
+
+    def etat(self, i: int, type_etat: str = "normal"):
+        # Unicité vérifiée par le dictionnaire : ajouter_etat est linéaire en le nombre d'états
+        if i in self.etats:
+            raise ValueError(f"État avec ID {i} existe déjà")
+        self.etats[i] = Etat(i, f"q{i}", type_etat)
+        self.automate.etats.append(self.etats[i])
+
+    def transition(self, src: int, symbole: str, dest: int):
+        t = Transition(len(self.automate.transitions) + 1, self.etats[src], self.etats[dest], self.symboles[symbole])
+        self.automate.ajouter_transition(t)
+
+
+def _type(i: int, final: bool) -> str:
+    # L'état initial n'est jamais final, pour garder les mêmes familles d'une mesure à l'autre
+    if i == 0:
+        return "initial"
+    return "final" if final else "normal"
+
+
+def afd_aleatoire(n: int, symboles: str = "ab", densite: float = 1.0, graine: int = 0) -> Automate:
+    """AFD à n états ; chaque couple (état, symbole) a une transition avec probabilité `densite`."""
+    rng = random.Random(graine)
+    c = _Constructeur(f"afd_{n}", symboles)
+    for i in range(n):
+        c.etat(i, _type(i, rng.random() < 0.3))
+    for i in range(n):
+        for s in symboles:
+            if rng.random() < densite:
+                c.transition(i, s, rng.randrange(n))
+    return c.automate
+
+
+def afn_aleatoire(n: int, symboles: str = "ab", densite: float = 2.0, graine: int = 0) -> Automate:
+    """AFN à n états avec en moyenne `densite` transitions par état et par symbole."""
+    rng = random.Random(graine)
+    c = _Constructeur(f"afn_{n}", symboles)
+    for i in range(n):
+        c.etat(i, _type(i, rng.random() < 0.3))
+    for i in range(n):
+        for s in symboles:
+            k = int(densite) + (rng.random() < densite - int(densite))
+            for d in rng.sample(range(n), min(k, n)):
+                c.transition(i, s, d)
+    return c.automate
+
+
+def nieme_depuis_la_fin(n: int) -> Automate:
+    """Langage « le n-ième symbole depuis la fin est 1 » : n+1 états, AFD minimal à 2^n états."""
+    c = _Constructeur(f"nieme_{n}", "01")
+    for i in range(n + 1):
+        c.etat(i, _type(i, i == n))
+    c.transition(0, "0", 0)
+    c.transition(0, "1", 0)
+    c.transition(0, "1", 1)
+    for i in range(1, n):
+        c.transition(i, "0", i + 1)
+        c.transition(i, "1", i + 1)
+    return c.automate
+
+
+def nieme_quelconque(n: int) -> Automate:
+    """« le n-ième symbole depuis la fin est 0 ou 1 », par deux branches : AFD à 2^n états, AFD minimal à n+1."""
+    c = _Constructeur(f"nieme_quelconque_{n}", "01")
+    for i in range(2 * n + 1):
+        c.etat(i, _type(i, i in (n, 2 * n)))
+    c.transition(0, "0", 0)
+    c.transition(0, "1", 0)
+    c.transition(0, "0", 1)
+    c.transition(0, "1", n + 1)
+    for i in range(1, n):
+        for s in "01":
+            c.transition(i, s, i + 1)
+            c.transition(n + i, s, n + i + 1)
+    return c.automate
+
+
+def chaine_epsilon(n: int) -> Automate:
+    """q0 -ε-> q1 -ε-> ... -ε-> qn, puis qn -a-> q(n+1) final : longues ε-fermetures."""
+    c = _Constructeur(f"epsilon_{n}", "aε")
+    for i in range(n + 2):
+        c.etat(i, _type(i, i == n + 1))
+    for i in range(n):
+        c.transition(i, "ε", i + 1)
+        c.transition(i, "a", i)
+    c.transition(n, "a", n + 1)
+    return c.automate
+
+
+def chaine_profonde(n: int) -> Automate:
+    """Chaîne q0 -a-> q1 -a-> ... -a-> q(n-1), seul le dernier état est final.
+
+    Chaque état n'atteint un état final qu'au bout de toute la chaîne, ce qui
+    pousse la recherche récursive d'états co-accessibles à sa profondeur maximale.
+    """
+    c = _Constructeur(f"chaine_{n}", "ab")
+    for i in range(n):
+        c.etat(i, _type(i, i == n - 1))
+    for i in range(n - 1):
+        c.transition(i, "a", i + 1)
+        c.transition(i, "b", 0)
+    return c.automate
+
+
+def dag_fini(n: int) -> Automate:
+    """qi -a-> q(i+1) et qi -b-> q(i+2), seul le dernier état est final : langage fini, mots de longueur n/2 à n-1."""
+    c = _Constructeur(f"dag_{n}", "ab")
+    for i in range(n):
+        c.etat(i, _type(i, i == n - 1))
+    for i in range(n - 1):
+        c.transition(i, "a", i + 1)
+        if i + 2 < n:
+            c.transition(i, "b", i + 2)
+    return c.automate
+
+
+def pire_cas_moore(n: int) -> Automate:
+    """AFD unaire q0 -> q1 -> ... -> q(n-1) ⟲ avec q(n-1) final.
+
+    Les états ne se distinguent que par leur distance à q(n-1) : l'algorithme de
+    Moore a besoin de n tours de raffinement.
+    """
+    c = _Constructeur(f"moore_{n}", "a")
+    for i in range(n):
+        c.etat(i, _type(i, i == n - 1))
+    for i in range(n - 1):
+        c.transition(i, "a", i + 1)
+    c.transition(n - 1, "a", n - 1)
+    return c.automate
+
+
+def mot_aleatoire(symboles: str, longueur: int, graine: int = 0) -> str:
+    rng = random.Random(graine)
+    return "".join(rng.choice(symboles) for _ in range(longueur))
+
+
+GENERATEURS = {
+    "afd_aleatoire": afd_aleatoire,
+    "afn_aleatoire": afn_aleatoire,
+    "nieme_depuis_la_fin": nieme_depuis_la_fin,
+    "nieme_quelconque": nieme_quelconque,
+    "chaine_epsilon": chaine_epsilon,
+    "chaine_profonde": chaine_profonde,
+    "pire_cas_moore": pire_cas_moore,
+    "dag_fini": dag_fini,
+}
@@ -1,3 +1,4 @@
+import hashlib
 import json
 import os
 from collections import deque, defaultdict
@@ -5,14 +6,72 @@ from typing import List, Dict,Set
 from classes.Alphabet import Alphabet
 from classes.Etat import Etat
 from classes.Transition import Transition
+from classes.metriques import mesure, compter
+from classes.persistant import ListePersistante
 from typing import Set, Dict, Tuple, List
 
+METHODES_EQUIVALENCE = ("produit", "antichaines")
+
 class Automate:
+    """Symboles, états et transitions sont des ListePersistante : `instantane()` est en O(1).
+
+    Les Etat, Transition et Alphabet sont partagés entre instantanés et ne sont
+    jamais modifiés sur place : on les remplace (voir copier()).
+    """
+
     def __init__(self, nom: str):
         self.nom = nom
         self.alphabets: List[Alphabet] = []
         self.etats: List[Etat] = []
         self.transitions: List[Transition] = []
+
+    # Toute séquence affectée est rangée dans une ListePersistante ; une ListePersistante est partagée (instantané)
+    @property
+    def alphabets(self) -> ListePersistante:
+        return self._alphabets
+
+    @alphabets.setter
+    def alphabets(self, valeurs):
+        self._alphabets = self._persistante(valeurs)
+
+    @property
+    def etats(self) -> ListePersistante:
+        return self._etats
+
+    @etats.setter
+    def etats(self, valeurs):
+        self._etats = self._persistante(valeurs)
+
+    @property
+    def transitions(self) -> ListePersistante:
+        return self._transitions
+
+    @transitions.setter
+    def transitions(self, valeurs):
+        self._transitions = self._persistante(valeurs)
+
+    @staticmethod
+    def _persistante(valeurs) -> ListePersistante:
+        return valeurs.instantane() if isinstance(valeurs, ListePersistante) else ListePersistante(valeurs)
+
+    def instantane(self, nom: str = None) -> 'Automate':
+        """Version figée de l'automate en O(1) : les deux automates partagent leur structure.
+
+        Modifier l'un (ajouts, émondage, complétion) ne change pas l'autre ; seules
+        les parties modifiées sont recopiées.
+        """
+        copie = Automate.__new__(type(self))
+        copie.nom = nom or self.nom
+        copie.alphabets = self.alphabets
+        copie.etats = self.etats
+        copie.transitions = self.transitions
+        return copie
+
+    def __getstate__(self):
+        # L'index de lecture se reconstruit à la demande
+        etat = self.__dict__.copy()
+        etat.pop("_cache_lecture", None)
+        return etat
     
     def ajouter_alphabet(self, alphabet: Alphabet):
         if any(a.valeur == alphabet.valeur for a in self.alphabets):
@@ -26,7 +85,38 @@ class Automate:
     
     def ajouter_transition(self, transition: Transition):
         self.transitions.append(transition)
+
+    def _successeurs(self) -> Dict[int, Dict[str, List[int]]]:
+        """Index source -> symbole -> destinations, construit en un seul passage sur les transitions."""
+        index = {}
+        for t in self.transitions:
+            index.setdefault(t.source.id, {}).setdefault(t.alphabet.valeur, []).append(t.destination.id)
+        return index
+
+    def _lecture(self) -> Tuple[Dict[int, Dict[str, List[int]]], Set[int], Set[int]]:
+        """(successeurs sans ε, initiaux, finaux) pour lire des mots, recalculé seulement après une modification.
+
+        L'index est invalidé par tout ajout, remplacement ou réaffectation des
+        listes d'états et de transitions (identité et version des ListePersistante).
+        """
+        cle = (self._etats, self._etats.version, self._transitions, self._transitions.version)
+        cache = self.__dict__.get("_cache_lecture")
+        if cache is not None and cache[0] is cle[0] and cache[2] is cle[2] and cache[1::2] == cle[1::2]:
+            return cache[4]
+        source = self.eliminer_epsilon() if self.contient_epsilon() else self
+        lecture = (source._successeurs(), frozenset(e.id for e in source.etats if "initial" in e.type),
+                   frozenset(e.id for e in source.etats if "final" in e.type))
+        self._cache_lecture = cle + (lecture,)
+        return lecture
+
+    def _table(self) -> Dict[Tuple[int, str], int]:
+        """Fonction de transition (source, symbole) -> destination ; la première transition l'emporte."""
+        table = {}
+        for t in self.transitions:
+            table.setdefault((t.source.id, t.alphabet.valeur), t.destination.id)
+        return table
     
+    @mesure()
     def est_deterministe(self) -> bool:
         # ovir si il ya plus de une etat initiaux
         initial_states = [state for state in self.etats if "initial" in state.type]
@@ -35,110 +125,168 @@ class Automate:
         
         transitions = defaultdict(dict)
         for t in self.transitions:
-            if t.alphabet.valeur in transitions[t.source.id]:
+            if t.alphabet.valeur == "ε" or t.alphabet.valeur in transitions[t.source.id]:
                 return False
             transitions[t.source.id][t.alphabet.valeur] = t.destination.id
         return True
     
     from collections import deque, defaultdict
 
-    def determiniser(self):
+    @mesure()
+    def determiniser(self, controle=None):
         if self.est_deterministe():
             return self  # Already deterministic
 
+        successeurs = self._successeurs()
+        finaux = {e.id for e in self.etats if "final" in e.type}
+
+        def nom_etat(sous_ensemble):
+            return "q" + "_".join(sorted(map(str, sous_ensemble)))
+
         # 1. Initialize with ε-closure of initial states
         initial_states = {e.id for e in self.etats if "initial" in e.type}
-        epsilon_closure = self.calculer_epsilon_fermeture(initial_states)
-        
-        # State management
-        new_states = {
-            "q" + "_".join(sorted(map(str, epsilon_closure))): {
-                "nfa_states": frozenset(epsilon_closure),
-                "obj": None  # Will store the Etat object
-            }
-        }
-        queue = deque([frozenset(epsilon_closure)])
-        
+        epsilon_closure = frozenset(self.calculer_epsilon_fermeture(initial_states, successeurs))
+
         # Create DFA
         afd = Automate(nom=f"{self.nom}_AFD")
-        
-        # First create all states with proper Etat parameters
-        for state_name, state_data in new_states.items():
-            nfa_states = state_data["nfa_states"]
-            is_final = any(e_id in {e.id for e in self.etats if "final" in e.type} 
-                        for e_id in nfa_states)
-            
-            state_type = ("initial" if state_name == "q" + "_".join(sorted(map(str, epsilon_closure)))
-                        else "final" if is_final else "normal")
-            
-            # Create state using EXACT Etat parameters
-            etat = Etat(
-                id_etat=len(afd.etats) + 1,
-                label_etat=state_name,
-                type_etat=state_type
-            )
-            afd.ajouter_etat(etat)
-            state_data["obj"] = etat
-        
-        # Then add transitions with proper Transition parameters
+        for a in self.alphabets:
+            if a.valeur != "ε":
+                afd.ajouter_alphabet(a)
+
+        # State management : sous-ensemble d'états de l'AFN -> état de l'AFD.
+        # Les ids sont attribués ici, d'où l'ajout direct sans vérification d'unicité.
+        etat_initial = Etat(1, nom_etat(epsilon_closure), "initial_final" if epsilon_closure & finaux else "initial")
+        afd.etats.append(etat_initial)
+        new_states = {epsilon_closure: etat_initial}
+        queue = deque([epsilon_closure])
+
+        parcourues = 0
         while queue:
+            if controle is not None:
+                controle.point(len(afd.etats), message=f"{len(afd.etats)} états créés, {len(queue)} en attente")
             current_state = queue.popleft()
-            current_state_name = "q" + "_".join(sorted(map(str, current_state)))
-            src_state = new_states[current_state_name]["obj"]
-            
-            for symbol in {a.valeur for a in self.alphabets}:
+            src_state = new_states[current_state]
+
+            for alphabet in afd.alphabets:
                 destinations = set()
                 for state_id in current_state:
-                    for t in self.transitions:
-                        if t.source.id == state_id and t.alphabet.valeur == symbol:
-                            destinations.add(t.destination.id)
-                
-                if destinations:
-                    dest_closure = self.calculer_epsilon_fermeture(destinations)
-                    dest_name = "q" + "_".join(sorted(map(str, dest_closure)))
-                    
-                    if dest_name not in new_states:
-                        # Create destination state
-                        is_final = any(e_id in {e.id for e in self.etats if "final" in e.type} 
-                                    for e_id in dest_closure)
-                        dest_etat = Etat(
-                            id_etat=len(afd.etats) + 1,
-                            label_etat=dest_name,
-                            type_etat="final" if is_final else "normal"
-                        )
-                        afd.ajouter_etat(dest_etat)
-                        new_states[dest_name] = {
-                            "nfa_states": frozenset(dest_closure),
-                            "obj": dest_etat
-                        }
-                        queue.append(frozenset(dest_closure))
-                    
-                    # Create transition using EXACT Transition parameters
-                    alphabet = next(a for a in self.alphabets if a.valeur == symbol)
-                    transition = Transition(
-                        id_transition=len(afd.transitions) + 1,
-                        etat_source=src_state,
-                        etat_destination=new_states[dest_name]["obj"],
-                        alphabet=alphabet
+                    destinations.update(successeurs.get(state_id, {}).get(alphabet.valeur, ()))
+                parcourues += len(current_state)
+                if not destinations:
+                    continue
+
+                dest_closure = frozenset(self.calculer_epsilon_fermeture(destinations, successeurs))
+                dest_etat = new_states.get(dest_closure)
+                if dest_etat is None:
+                    dest_etat = Etat(
+                        id_etat=len(afd.etats) + 1,
+                        label_etat=nom_etat(dest_closure),
+                        type_etat="final" if dest_closure & finaux else "normal"
                     )
-                    afd.ajouter_transition(transition)
-        
+                    afd.etats.append(dest_etat)
+                    new_states[dest_closure] = dest_etat
+                    queue.append(dest_closure)
+
+                afd.ajouter_transition(Transition(
+                    id_transition=len(afd.transitions) + 1,
+                    etat_source=src_state,
+                    etat_destination=dest_etat,
+                    alphabet=alphabet
+                ))
+
+        compter("transitions_parcourues", parcourues)
+        compter("sous_ensembles_crees", len(afd.etats))
         return afd
-    
-    def calculer_epsilon_fermeture(self, etats):
+
+    def determiniser_parallele(self, jobs: int = None, controle=None):
+        """AFD compact (classes.compact) calculé par `jobs` processus (classes.parallele).
+
+        Même numérotation des états que determiniser(), quel que soit le nombre de processus.
+        """
+        from classes.parallele import determiniser_parallele
+        return determiniser_parallele(self, jobs, controle)
+
+    def determiniser_borne(self, memoire_max: int = None, progression=None, dossier: str = None, controle=None):
+        """AFD compact dont les tables de construction débordent sur disque au-delà de `memoire_max` octets.
+
+        Voir classes.debordement ; `progression(statistiques)` reçoit les compteurs du parcours.
+        """
+        from classes.debordement import MEMOIRE_MAX, determiniser_borne
+        return determiniser_borne(self, memoire_max or MEMOIRE_MAX, progression, dossier, controle)
+
+    def contient_epsilon(self) -> bool:
+        return any(t.alphabet.valeur == "ε" for t in self.transitions)
+
+    @mesure()
+    def eliminer_epsilon(self, controle=None) -> 'Automate':
+        """AFN équivalent sans ε-transitions, réduit à ses états accessibles.
+
+        p --a--> r pour chaque q de la ε-fermeture de p et chaque q --a--> r
+        (sans doublons) ; p est final si sa fermeture contient un état final.
+        """
+        successeurs = self._successeurs()
+        finaux = {e.id for e in self.etats if "final" in e.type}
+        initiaux = [e.id for e in self.etats if "initial" in e.type]
+
+        # Parcours depuis les états initiaux : une fermeture par état atteint
+        sortantes = {}
+        est_final = {}
+        file = deque(initiaux)
+        vus = set(initiaux)
+        while file:
+            if controle is not None:
+                controle.point(len(vus), len(self.etats), "Calcul des ε-fermetures")
+            p = file.popleft()
+            fermeture = self.calculer_epsilon_fermeture({p}, successeurs)
+            est_final[p] = not fermeture.isdisjoint(finaux)
+            cibles = {}
+            for q in fermeture:
+                for symbole, destinations in successeurs.get(q, {}).items():
+                    if symbole == "ε":
+                        continue
+                    for r in destinations:
+                        cibles[(symbole, r)] = None
+                        if r not in vus:
+                            vus.add(r)
+                            file.append(r)
+            sortantes[p] = cibles
+
+        resultat = Automate(f"{self.nom}_sans_epsilon")
+        resultat.alphabets = [a for a in self.alphabets if a.valeur != "ε"]
+        symboles = {a.valeur: a for a in resultat.alphabets}
+        nouveaux = {}
+        for e in self.etats:
+            if e.id in vus and e.id not in nouveaux:
+                type_etat = []
+                if "initial" in e.type:
+                    type_etat.append("initial")
+                if est_final[e.id]:
+                    type_etat.append("final")
+                nouveaux[e.id] = Etat(e.id, e.label, "_".join(type_etat) or "normal")
+                resultat.etats.append(nouveaux[e.id])
+        for p, cibles in sortantes.items():
+            for symbole, r in cibles:
+                resultat.ajouter_transition(Transition(len(resultat.transitions) + 1, nouveaux[p], nouveaux[r],
+                                                       symboles[symbole]))
+        compter("transitions_creees", len(resultat.transitions))
+        return resultat
+
+    def calculer_epsilon_fermeture(self, etats, successeurs=None):
         """Compute ε-closure for a set of states"""
+        if successeurs is None:
+            successeurs = self._successeurs()
         fermeture = set(etats)
         queue = deque(etats)
-        
+
         while queue:
             etat_id = queue.popleft()
-            for t in self.transitions:
-                if t.source.id == etat_id and t.alphabet.valeur == "ε":
-                    if t.destination.id not in fermeture:
-                        fermeture.add(t.destination.id)
-                        queue.append(t.destination.id)
+            for dest in successeurs.get(etat_id, {}).get("ε", ()):
+                if dest not in fermeture:
+                    fermeture.add(dest)
+                    queue.append(dest)
         return fermeture
-    
+
+    @mesure()
     def est_complet(self) -> bool:
     # Create a mapping of source state to its outgoing transitions by symbol
         transitions = defaultdict(set)
@@ -156,6 +304,7 @@ class Automate:
                     return False
         return True
     
+    @mesure()
     def completer_automate(self):
        
         # Check if a sink state ("Puits") already exists
@@ -165,27 +314,68 @@ class Automate:
             sink = Etat(sink_id, "Puits", "normal")
             self.ajouter_etat(sink)
 
-        symbols = {a.valeur for a in self.alphabets}
+        existants = defaultdict(set)
+        for t in self.transitions:
+            existants[t.source.id].add(t.alphabet.valeur)
+        transition_id = max((t.id for t in self.transitions), default=0)
 
-        # Add missing transitions to sink
+        # Add missing transitions to sink (self-loops for the sink itself)
         for etat in self.etats:
-            if etat == sink:
-                continue
-            existing_symbols = {t.alphabet.valeur for t in self.transitions if t.source.id == etat.id}
-            for symbol in symbols - existing_symbols:
-                alphabet_obj = next(a for a in self.alphabets if a.valeur == symbol)
-                transition_id = max((t.id for t in self.transitions), default=0) + 1
-                self.ajouter_transition(Transition(transition_id, etat, sink, alphabet_obj))
+            for alphabet_obj in self.alphabets:
+                if alphabet_obj.valeur not in existants[etat.id]:
+                    transition_id += 1
+                    self.ajouter_transition(Transition(transition_id, etat, sink, alphabet_obj))
 
-        # Add self-loops for sink state
-        for symbol in symbols:
-            if not any(t.source.id == sink.id and t.alphabet.valeur == symbol for t in self.transitions):
-                alphabet_obj = next(a for a in self.alphabets if a.valeur == symbol)
-                transition_id = max((t.id for t in self.transitions), default=0) + 1
-                self.ajouter_transition(Transition(transition_id, sink, sink, alphabet_obj))
+    @mesure()
+    def copier(self, nom: str = None) -> 'Automate':
+        """Copie indépendante (nouveaux états et transitions, symboles partagés)."""
+        copie = Automate(nom or self.nom)
+        copie.alphabets = list(self.alphabets)
+        etats = {}
+        for e in self.etats:
+            etats[e.id] = Etat(e.id, e.label, e.type)
+            copie.etats.append(etats[e.id])
+        for t in self.transitions:
+            copie.ajouter_transition(Transition(t.id, etats[t.source.id], etats[t.destination.id], t.alphabet))
+        return copie
+
+    @mesure()
+    def complementer(self, controle=None):
+        """Automate reconnaissant le complément du langage sur le même alphabet.
 
+        L'automate est déterminisé puis complété avant d'échanger états finaux et non finaux.
+        """
+        complement = self.determiniser(controle).copier(f"{self.nom}_complement")
+        complement.completer_automate()
 
+        for e in complement.etats:
+            type_etat = []
+            if "initial" in e.type:
+                type_etat.append("initial")
+            if "final" not in e.type:
+                type_etat.append("final")
+            e.type = "_".join(type_etat) or "normal"
+        return complement
+
+    @mesure()
+    def renverser(self) -> 'Automate':
+        """Automate miroir : transitions inversées, états initiaux et finaux échangés."""
+        miroir = Automate(f"{self.nom}_miroir")
+        miroir.alphabets = list(self.alphabets)
+        etats = {}
+        for e in self.etats:
+            type_etat = []
+            if "final" in e.type:
+                type_etat.append("initial")
+            if "initial" in e.type:
+                type_etat.append("final")
+            etats[e.id] = Etat(e.id, e.label, "_".join(type_etat) or "normal")
+            miroir.etats.append(etats[e.id])
+        for t in self.transitions:
+            miroir.ajouter_transition(Transition(t.id, etats[t.destination.id], etats[t.source.id], t.alphabet))
+        return miroir
 
+    @mesure()
     def est_minimal(self) -> bool:
         print("→ Vérification de minimalité...")
         if not self.est_deterministe():
@@ -200,99 +390,132 @@ class Automate:
         print("L'automate est minimal.")
         return True
 
+    @mesure()
     def tous_etats_accessibles(self) -> bool:
         """Vérifie que tous les états sont accessibles depuis l'état initial"""
-        etats_accessibles = set()
         etats_initiaux = [e for e in self.etats if "initial" in e.type]
-        
         if not etats_initiaux:
             return False
-        
-        file = deque([etats_initiaux[0].id])
-        etats_accessibles.add(etats_initiaux[0].id)
-        
+
+        successeurs = defaultdict(list)
+        for transition in self.transitions:
+            successeurs[transition.source.id].append(transition.destination.id)
+        return len(self._parcours([etats_initiaux[0].id], successeurs)) == len(self.etats)
+
+    @staticmethod
+    def _parcours(depart, voisins, domaine=None) -> Set[int]:
+        """États atteints depuis `depart` en suivant `voisins` (restreint à `domaine` s'il est donné)."""
+        vus = set(depart)
+        file = deque(vus)
         while file:
-            etat_id = file.popleft()
-            for transition in self.transitions:
-                if transition.source.id == etat_id:
-                    if transition.destination.id not in etats_accessibles:
-                        etats_accessibles.add(transition.destination.id)
-                        file.append(transition.destination.id)
-        
-        return len(etats_accessibles) == len(self.etats)
+            for d in voisins.get(file.popleft(), ()):
+                if d not in vus and (domaine is None or d in domaine):
+                    vus.add(d)
+                    file.append(d)
+        return vus
 
+    @mesure()
     def tous_etats_distinguables(self) -> bool:
-        """Implémentation de l'algorithme de Moore pour vérifier la distinguabilité"""
-        # Partition initiale : F vs Q\F
+        """Vérifie que deux états distincts ne sont jamais équivalents (partition de Hopcroft)"""
         F = {e.id for e in self.etats if "final" in e.type}
-        non_F = {e.id for e in self.etats} - F
-        partitions = [F, non_F] if non_F else [F]
-        
-        # Table des transitions
-        transition_table = {
-            etat.id: {
-                a.valeur: next(
-                    (t.destination.id for t in self.transitions 
-                    if t.source.id == etat.id and t.alphabet.valeur == a.valeur),
-                    None
-                )
-                for a in self.alphabets
-            }
-            for etat in self.etats
-        }
-        
-        changed = True
-        while changed:
-            changed = False
-            nouvelles_partitions = []
-            
-            for groupe in partitions:
-                sous_groupes = {}
-                
-                for etat_id in groupe:
-                    cle = tuple(
-                        next(
-                            (i for i, p in enumerate(partitions) 
-                            if transition_table[etat_id][a.valeur] in p),
-                            -1
-                        )
-                        for a in self.alphabets
-                    )
-                    
-                    if cle not in sous_groupes:
-                        sous_groupes[cle] = []
-                    sous_groupes[cle].append(etat_id)
-                
-                nouvelles_partitions.extend(sous_groupes.values())
-                if len(sous_groupes) > 1:
-                    changed = True
-            
-            partitions = nouvelles_partitions
-        
+        partitions = self._partition_minimale([e.id for e in self.etats], F, self._table(),
+                                              [a.valeur for a in self.alphabets])
         # Si chaque état est dans sa propre partition, ils sont tous distinguables
         return all(len(p) == 1 for p in partitions)
+
+    @staticmethod
+    def _partition_minimale(ids, finaux, table, symboles, controle=None) -> List[List[int]]:
+        """Algorithme de Hopcroft : classes d'états équivalents en O(k·n·log n).
+
+        `table[(id, symbole)]` donne la destination. Une transition manquante mène à
+        un puits implicite gardé dans son propre bloc, comme le -1 des signatures de
+        l'algorithme de Moore. Chaque classe est triée dans l'ordre de `ids`, et les
+        classes dans l'ordre de leur premier état.
+        """
+        n = len(ids)
+        puits = n
+        indice = {e: i for i, e in enumerate(ids)}
+        inverses = []
+        for s in symboles:
+            inverse = [[] for _ in range(n + 1)]
+            for i, e in enumerate(ids):
+                inverse[indice.get(table.get((e, s)), puits)].append(i)
+            inverse[puits].append(puits)
+            inverses.append(inverse)
+
+        blocs = [b for b in (
+            {i for i, e in enumerate(ids) if e in finaux},
+            {i for i, e in enumerate(ids) if e not in finaux},
+            {puits},
+        ) if b]
+        bloc_de = [0] * (n + 1)
+        for b, membres in enumerate(blocs):
+            for i in membres:
+                bloc_de[i] = b
+
+        attente = deque((b, c) for b in range(len(blocs)) for c in range(len(symboles)))
+        en_attente = set(attente)
+        while attente:
+            if controle is not None:
+                controle.point(len(blocs), n, f"Raffinement : {len(blocs) - 1} classes")
+            b, c = attente.popleft()
+            en_attente.discard((b, c))
+
+            # Prédécesseurs par c du bloc b, regroupés par bloc
+            touches = defaultdict(list)
+            inverse = inverses[c]
+            for j in blocs[b]:
+                for i in inverse[j]:
+                    touches[bloc_de[i]].append(i)
+
+            for y, membres in touches.items():
+                if len(membres) == len(blocs[y]):
+                    continue
+                compter("decoupages")
+                z = len(blocs)
+                blocs[y].difference_update(membres)
+                blocs.append(set(membres))
+                for i in membres:
+                    bloc_de[i] = z
+                for c2 in range(len(symboles)):
+                    if (y, c2) in en_attente:
+                        nouveau = (z, c2)
+                    else:
+                        nouveau = (y, c2) if len(blocs[y]) <= len(blocs[z]) else (z, c2)
+                    attente.append(nouveau)
+                    en_attente.add(nouveau)
+
+        classes = [sorted(bloc) for bloc in blocs if puits not in bloc]
+        classes.sort()
+        return [[ids[i] for i in classe] for classe in classes]
     
 
     
     
+    @mesure()
     def reconnait_mot(self, mot: str) -> bool:
-        etats_actuels = {e.id for e in self.etats if "initial" in e.type}
+        """O(|mot| × états actifs) : l'index des transitions est construit une fois (voir _lecture)."""
+        successeurs, etats_actuels, finaux = self._lecture()
         
         for symbole in mot:
             nouveaux_etats = set()
             for etat_id in etats_actuels:
-                for t in self.transitions:
-                    if t.source.id == etat_id and t.alphabet.valeur == symbole:
-                        nouveaux_etats.add(t.destination.id)
+                nouveaux_etats.update(successeurs.get(etat_id, {}).get(symbole, ()))
+            compter("transitions_parcourues", len(etats_actuels))
             if not nouveaux_etats:
                 return False
             etats_actuels = nouveaux_etats
         
-        return any("final" in e.type for e in self.etats if e.id in etats_actuels)
+        return not finaux.isdisjoint(etats_actuels)
     
     def sauvegarder(self):
         os.makedirs("automates", exist_ok=True)
-        with open(f"automates/{self.nom}.json", "w") as f:
+        self.sauvegarder_fichier(f"automates/{self.nom}.json")
+
+    @mesure()
+    def sauvegarder_fichier(self, chemin):
+        """Sauvegarde l'automate dans un fichier JSON quelconque."""
+        with open(chemin, "w") as f:
             json.dump({
                 "nom": self.nom,
                 "alphabets": [a.to_dict() for a in self.alphabets],
@@ -300,35 +523,48 @@ class Automate:
                 "transitions": [t.to_dict() for t in self.transitions]
             }, f, indent=4)
 
-    def generer_mots_acceptes(self, max_length) -> Set[str]:
-        
-        etat_initial = next((etat for etat in self.etats if etat.type == "initial"), None)
+    @mesure()
+    def generer_mots_acceptes(self, max_length, controle=None) -> Set[str]:
+        if self.contient_epsilon():
+            return self.eliminer_epsilon(controle).generer_mots_acceptes(max_length, controle)
+
+        etat_initial = next((etat for etat in self.etats if "initial" in etat.type), None)
         if not etat_initial:
             return set()
-        etats_finaux = {etat for etat in self.etats if etat.type == "final"}
+        etats_finaux = {etat for etat in self.etats if "final" in etat.type}
+        sortantes = defaultdict(list)
+        for trans in self.transitions:
+            sortantes[trans.source].append(trans)
         mots_acceptes = set()
         file = deque([(etat_initial, "")]) 
 
         while file:
+            if controle is not None:
+                controle.point(len(mots_acceptes), message=f"{len(mots_acceptes)} mots acceptés")
             etat_actuel, mot_actuel = file.popleft()
             if len(mot_actuel) > max_length:
                 continue
             if etat_actuel in etats_finaux:
                 mots_acceptes.add(mot_actuel)
-            for trans in self.transitions:
-                if trans.source == etat_actuel:
-                    nouveau_mot = mot_actuel + trans.alphabet.valeur
-                    file.append((trans.destination, nouveau_mot))
+            for trans in sortantes[etat_actuel]:
+                nouveau_mot = mot_actuel + trans.alphabet.valeur
+                file.append((trans.destination, nouveau_mot))
+            compter("mots_explores")
         return mots_acceptes  
 
-    def generer_mots_rejetes(self, max_length) -> set:
-        etat_initial = next((e for e in self.etats if e.type == "initial"), None)
-        etats_finaux = {e for e in self.etats if e.type == "final"}
+    @mesure()
+    def generer_mots_rejetes(self, max_length, controle=None) -> set:
+        if self.contient_epsilon():
+            return self.eliminer_epsilon(controle).generer_mots_rejetes(max_length, controle)
+        etat_initial = next((e for e in self.etats if "initial" in e.type), None)
+        etats_finaux = {e for e in self.etats if "final" in e.type}
         if not etat_initial:
             return set()
         mots_rejetes = set()
         file = deque([(etat_initial, "", False)])  
         while file:
+            if controle is not None:
+                controle.point(len(mots_rejetes), message=f"{len(mots_rejetes)} mots rejetés")
             etat, mot, est_rejete = file.popleft()
             if len(mot) > max_length:
                 continue
@@ -345,9 +581,39 @@ class Automate:
         return mots_rejetes
 
 
-    def sont_equivalents(afd1, afd2, max_length) -> tuple[bool, str]:
-        alpha1 = {a.valeur for a in afd1.alphabets}
-        alpha2 = {a.valeur for a in afd2.alphabets}
+    @mesure()
+    def inclus_dans(self, autre: 'Automate', simulation: bool = False, controle=None):
+        """Un mot reconnu par self mais pas par `autre`, ou None si L(self) ⊆ L(autre).
+
+        Algorithme des antichaînes (classes.antichaines) : pas de déterminisation complète.
+        """
+        from classes.antichaines import inclusion
+        return inclusion(self, autre, simulation, controle)
+
+    @mesure()
+    def sont_equivalents(afd1, afd2, max_length, controle=None, methode="produit",
+                         simulation=False) -> tuple[bool, str]:
+        """Compare deux automates ; `methode` vaut "produit" ou "antichaines".
+
+        "produit" parcourt les paires d'états des AFD jusqu'à `max_length` et
+        exige les mêmes transitions ; "antichaines" compare exactement les
+        langages des AFN (max_length ignoré) et donne un contre-exemple.
+        """
+        if methode == "antichaines":
+            from classes.antichaines import equivalence
+            contre_exemple, qui = equivalence(afd1, afd2, simulation, controle)
+            if contre_exemple is None:
+                return True, "Les automates reconnaissent le même langage"
+            return False, (f"Le mot '{contre_exemple}' est reconnu par le "
+                           f"{'premier' if qui == 1 else 'second'} automate mais pas par le "
+                           f"{'second' if qui == 1 else 'premier'}")
+        if methode != "produit":
+            raise ValueError(f"Méthode inconnue '{methode}' (attendu : {', '.join(METHODES_EQUIVALENCE)})")
+        # La comparaison suit une seule transition par symbole : AFN et ε-transitions sont d'abord déterminisés
+        afd1 = afd1.determiniser(controle)
+        afd2 = afd2.determiniser(controle)
+        alpha1 = {a.valeur for a in afd1.alphabets if a.valeur != "ε"}
+        alpha2 = {a.valeur for a in afd2.alphabets if a.valeur != "ε"}
         if alpha1 != alpha2:
             return False, "Les alphabets des automates sont différents"
         
@@ -358,14 +624,24 @@ class Automate:
         if not etat_initial2:
             return False, "Second automate sans état initial"
         
+        table1 = {}
+        for t in afd1.transitions:
+            table1.setdefault((t.source.id, t.alphabet.valeur), t.destination)
+        table2 = {}
+        for t in afd2.transitions:
+            table2.setdefault((t.source.id, t.alphabet.valeur), t.destination)
+
         file = deque()
         file.append((etat_initial1, etat_initial2, ""))
         visited = set()
         while file:
+            if controle is not None:
+                controle.point(len(visited), message=f"{len(visited)} paires d'états explorées")
             e1, e2, mot = file.popleft()
             e1_final = "final" in e1.type
             e2_final = "final" in e2.type
             if e1_final != e2_final:
+                compter("paires_explorees", len(visited))
                 return False, f"Différence d'acceptation après le mot '{mot}' (état {e1.id} vs {e2.id})"
 
             if (e1.id, e2.id) in visited:
@@ -376,17 +652,10 @@ class Automate:
                 continue
 
             for symbole in alpha1:
-                dest1 = next(
-                    (t.destination for t in afd1.transitions 
-                    if t.source.id == e1.id and t.alphabet.valeur == symbole),
-                    None
-                )
-                dest2 = next(
-                    (t.destination for t in afd2.transitions 
-                    if t.source.id == e2.id and t.alphabet.valeur == symbole),
-                    None
-                )            
+                dest1 = table1.get((e1.id, symbole))
+                dest2 = table2.get((e2.id, symbole))
                 if (dest1 is None) != (dest2 is None):
+                    compter("paires_explorees", len(visited))
                     return False, (
                         f"Transition manquante pour le symbole '{symbole}' "
                         f"après le mot '{mot}'\n"
@@ -396,28 +665,240 @@ class Automate:
 
                 if dest1 and dest2:
                     file.append((dest1, dest2, mot + symbole))
+        compter("paires_explorees", len(visited))
         return True, f"Les automates sont équivalents pour tous les mots de longueur ≤ {max_length}"  
 
-    def union_mots(self, autre_automate: 'Automate', max_length: int = 5) -> set:
+    def _graphe_utile(self):
+        """(ids initiaux utiles, ids finaux, successeurs (symbole, dest), états utiles), ε-transitions comprises.
+
+        Utiles : accessibles depuis un état initial et co-accessibles depuis un
+        état final ; deux parcours en largeur. Les successeurs de chaque état sont
+        rangés dans l'ordre des symboles par seaux (un tri de l'alphabet, pas des
+        transitions), donc O(|Q| + |T|).
+        """
+        initiaux = [e.id for e in self.etats if "initial" in e.type]
+        finaux = {e.id for e in self.etats if "final" in e.type}
+        rangs = {v: i for i, v in enumerate(sorted({t.alphabet.valeur for t in self.transitions}))}
+        seaux = [[] for _ in rangs]
+        for t in self.transitions:
+            seaux[rangs[t.alphabet.valeur]].append(t)
+        successeurs = defaultdict(list)
+        predecesseurs = defaultdict(list)
+        for seau in seaux:
+            for t in seau:
+                successeurs[t.source.id].append((t.alphabet.valeur, t.destination.id))
+                predecesseurs[t.destination.id].append(t.source.id)
+        accessibles = self._parcours(initiaux, {e: [d for _, d in l] for e, l in successeurs.items()})
+        utiles = self._parcours(finaux & accessibles, predecesseurs, accessibles)
+        return [e for e in initiaux if e in utiles], finaux, successeurs, utiles
+
+    @staticmethod
+    def _composantes(utiles, successeurs) -> Tuple[Dict[int, int], List[List[int]]]:
+        """Composantes fortement connexes des états utiles (Tarjan itératif), chaque composante après ses successeurs.
+
+        Retourne (état -> numéro de composante, composantes) ; les composantes sont
+        listées dans l'ordre topologique inverse.
+        """
+        indice, bas = {}, {}
+        pile, sur_pile = [], set()
+        composante, composantes = {}, []
+        for racine in utiles:
+            if racine in indice:
+                continue
+            indice[racine] = bas[racine] = len(indice)
+            pile.append(racine)
+            sur_pile.add(racine)
+            appels = [(racine, iter(successeurs[racine]))]
+            while appels:
+                e, suite = appels[-1]
+                for _, d in suite:
+                    if d not in utiles:
+                        continue
+                    if d not in indice:
+                        indice[d] = bas[d] = len(indice)
+                        pile.append(d)
+                        sur_pile.add(d)
+                        appels.append((d, iter(successeurs[d])))
+                        break
+                    if d in sur_pile:
+                        bas[e] = min(bas[e], indice[d])
+                else:
+                    appels.pop()
+                    if appels:
+                        parent = appels[-1][0]
+                        bas[parent] = min(bas[parent], bas[e])
+                    if bas[e] == indice[e]:
+                        membres = []
+                        while True:
+                            d = pile.pop()
+                            sur_pile.discard(d)
+                            composante[d] = len(composantes)
+                            membres.append(d)
+                            if d == e:
+                                break
+                        composantes.append(membres)
+        return composante, composantes
+
+    @staticmethod
+    def _cycle_lisant(composante, composantes, successeurs) -> bool:
+        """Vrai si une composante contient une transition sur un symbole (un cycle d'ε ne compte pas)."""
+        return any(symbole != "ε" and composante.get(d) == c
+                   for c, membres in enumerate(composantes) for e in membres for symbole, d in successeurs[e])
+
+    @mesure()
+    def est_vide(self) -> bool:
+        """Vrai si aucun mot n'est reconnu (aucun état final accessible)."""
+        return not self._graphe_utile()[-1]
+
+    @mesure()
+    def est_fini(self) -> bool:
+        """Vrai si le langage est fini : aucun cycle lisant un symbole parmi les états utiles."""
+        _, _, successeurs, utiles = self._graphe_utile()
+        return not self._cycle_lisant(*self._composantes(utiles, successeurs), successeurs)
+
+    @mesure()
+    def mot_le_plus_court(self):
+        """Un mot reconnu de longueur minimale, ou None si le langage est vide.
+
+        Parcours en largeur 0-1 : une ε-transition ne coûte rien, un symbole coûte 1.
+        """
+        initiaux, finaux, successeurs, utiles = self._graphe_utile()
+        distance = dict.fromkeys(initiaux, 0)
+        precedent = dict.fromkeys(initiaux)
+        file = deque((0, e) for e in initiaux)
+        while file:
+            dist, e = file.popleft()
+            if dist > distance[e]:
+                continue
+            if e in finaux:
+                symboles = []
+                while precedent[e] is not None:
+                    e, symbole = precedent[e]
+                    if symbole != "ε":
+                        symboles.append(symbole)
+                return "".join(reversed(symboles))
+            for symbole, d in successeurs[e]:
+                cout = symbole != "ε"
+                if d in utiles and dist + cout < distance.get(d, dist + cout + 1):
+                    distance[d] = dist + cout
+                    precedent[d] = (e, symbole)
+                    if cout:
+                        file.append((dist + 1, d))
+                    else:
+                        file.appendleft((dist, d))
+        return None
+
+    @mesure()
+    def mot_le_plus_long(self):
+        """Un mot reconnu de longueur maximale, ou None si le langage est vide.
+
+        Plus long chemin dans le graphe des composantes fortement connexes (les ε
+        ne comptent pas). Lève ValueError si le langage est infini.
+        """
+        initiaux, finaux, successeurs, utiles = self._graphe_utile()
+        composante, composantes = self._composantes(utiles, successeurs)
+        if self._cycle_lisant(composante, composantes, successeurs):
+            raise ValueError("Le langage est infini : il n'y a pas de mot le plus long")
+        # Composantes dans l'ordre topologique inverse : les successeurs sont déjà calculés
+        longueur, choix = [], {}
+        for c, membres in enumerate(composantes):
+            longueur.append(0 if any(e in finaux for e in membres) else -1)
+            for e in membres:
+                for symbole, d in successeurs[e]:
+                    if d in utiles and composante[d] != c:
+                        candidat = longueur[composante[d]] + (symbole != "ε")
+                        if candidat > longueur[c]:
+                            longueur[c], choix[c] = candidat, (symbole, composante[d])
+        if not initiaux:
+            return None
+        c = composante[max(initiaux, key=lambda i: longueur[composante[i]])]
+        symboles = []
+        while c in choix and longueur[c] > 0:
+            symbole, c = choix[c]
+            if symbole != "ε":
+                symboles.append(symbole)
+        return "".join(symboles)
+
+    @mesure()
+    def nombre_mots(self, controle=None) -> int:
+        """Nombre de mots reconnus (langage fini), compté sur l'AFD : chaque chemin y est un mot distinct.
+
+        Lève ValueError si le langage est infini.
+        """
+        afd = self.determiniser(controle)
+        initiaux, finaux, successeurs, utiles = afd._graphe_utile()
+        composante, composantes = self._composantes(utiles, successeurs)
+        # Sans ε, le langage est fini si chaque composante est un état seul, sans boucle
+        if self._cycle_lisant(composante, composantes, successeurs):
+            raise ValueError("Le langage est infini")
+        nombre = {}
+        for (e,) in composantes:
+            nombre[e] = (e in finaux) + sum(nombre[d] for _, d in successeurs[e] if d in utiles)
+        return sum(nombre[e] for e in initiaux)
+
+    @mesure()
+    def union_mots(self, autre_automate: 'Automate', max_length: int = 5, controle=None) -> set:
         if {a.valeur for a in self.alphabets} != {a.valeur for a in autre_automate.alphabets}:
             raise ValueError("Les alphabets doivent être identiques")
-        mots_self = self.generer_mots_acceptes(max_length)
-        mots_autre = autre_automate.generer_mots_acceptes(max_length)      
+        mots_self = self.generer_mots_acceptes(max_length, controle)
+        mots_autre = autre_automate.generer_mots_acceptes(max_length, controle)
         return mots_self.union(mots_autre)
 
 
     
-    def intersection_mots(self, autre_automate: 'Automate', max_length: int = 5) -> set:
+    @mesure()
+    def intersection_mots(self, autre_automate: 'Automate', max_length: int = 5, controle=None) -> set:
         if {a.valeur for a in self.alphabets} != {a.valeur for a in autre_automate.alphabets}:
             raise ValueError("Les alphabets doivent être identiques")
         return (
-            self.generer_mots_acceptes(max_length) & 
-            autre_automate.generer_mots_acceptes(max_length)
+            self.generer_mots_acceptes(max_length, controle) & 
+            autre_automate.generer_mots_acceptes(max_length, controle)
         )
     
+    @staticmethod
+    @mesure()
+    def depuis_mots(mots, nom: str = "dictionnaire", controle=None):
+        """AFD minimal acyclique d'une liste de mots triée, construit en un seul passage.
+
+        Le résultat est un AutomateCompact (classes.compact) ; `vers_automate()`
+        en donne la forme habituelle quand elle reste de taille raisonnable.
+        """
+        from classes.compact import depuis_mots
+        return depuis_mots(mots, nom, controle)
+
+    @classmethod
+    @mesure()
+    def depuis_regex(cls, expr: str, methode: str = "glushkov", nom: str = None, alphabet=None) -> 'Automate':
+        """Compile une expression régulière (voir classes.regex pour la syntaxe).
+
+        "glushkov" (par défaut) donne un AFN sans ε, "thompson" un ε-AFN.
+        """
+        from classes.regex import compiler
+        return compiler(expr, methode, nom, alphabet)
+
+    @mesure()
+    def figer(self, nom_memoire: str = None, controle=None):
+        """AFD immuable en mémoire partagée, attachable par nom depuis d'autres processus (classes.fige).
+
+        Le segment appartient à l'appelant, qui le détruit avec `liberer()` (ou un bloc with).
+        """
+        from classes.fige import AutomateFige
+        return AutomateFige.creer(self, nom_memoire, controle)
+
+    def scanner(self, longueur_max: int = None):
+        """Scanner de flux (classes.scanner) : toutes les occurrences, plus à gauche et plus longues."""
+        from classes.scanner import Scanner
+        return Scanner(self, longueur_max)
+
     @classmethod
     def charger(cls, nom: str):
-        with open(f"automates/{nom}.json", "r") as f:
+        return cls.charger_fichier(f"automates/{nom}.json")
+
+    @classmethod
+    @mesure()
+    def charger_fichier(cls, chemin):
+        """Charge un automate depuis un fichier JSON quelconque."""
+        with open(chemin, "r") as f:
             data = json.load(f)
         
         automate = cls(data["nom"])
@@ -427,10 +908,9 @@ class Automate:
         for a in alphabets.values():
             automate.ajouter_alphabet(a)
         
-        # Chargement des états
+        # Chargement des états (ids uniques : ce sont les clés du dictionnaire)
         etats = {e["idEtat"]: Etat.from_dict(e) for e in data["etats"]}
-        for e in etats.values():
-            automate.ajouter_etat(e)
+        automate.etats = list(etats.values())
         
         # Chargement des transitions
         for t in data["transitions"]:
@@ -440,118 +920,153 @@ class Automate:
     
 
 
-    def minimiser_auto(self):
-        
-        from collections import defaultdict
-
-        # Suprimer etat n acessibles
-        def accessibles(etat_init, transitions):
-            vus = set()
-            pile = [etat_init]
-            while pile:
-                e = pile.pop()
-                if e not in vus:
-                    vus.add(e)
-                    for t in transitions:
-                        if t.source.id == e:
-                            pile.append(t.destination.id)
-            return vus
-
+    @mesure()
+    def emonder(self, controle=None):
+        """Supprime sur place les états inaccessibles et ceux qui n'atteignent aucun état final."""
         etats_init = [e.id for e in self.etats if "initial" in e.type]
         if not etats_init:
             raise ValueError("Aucun état initial trouvé.")
-        accessibles_ids = accessibles(etats_init[0], self.transitions)
-        self.etats = [e for e in self.etats if e.id in accessibles_ids]
-        self.transitions = [t for t in self.transitions if t.source.id in accessibles_ids and t.destination.id in accessibles_ids]
-
-        # 2. Supprime le etat stériles (qui n'ateignent jamai un f)
-        finals = {e.id for e in self.etats if "final" in e.type}
-        def atteint_final(eid, visited=None):
-            if visited is None:
-                visited = set()
-            if eid in visited:
-                return False
-            visited.add(eid)
-            if eid in finals:
-                return True
-            for t in self.transitions:
-                if t.source.id == eid:
-                    if atteint_final(t.destination.id, visited):
-                        return True
-            return False
-        utiles = {e.id for e in self.etats if atteint_final(e.id)}
+
+        successeurs = defaultdict(list)
+        predecesseurs = defaultdict(list)
+        for t in self.transitions:
+            successeurs[t.source.id].append(t.destination.id)
+            predecesseurs[t.destination.id].append(t.source.id)
+        if controle is not None:
+            controle.point(0, len(self.etats), "Suppression des états inaccessibles")
+        accessibles = self._parcours([etats_init[0]], successeurs)
+
+        # Parcours arrière depuis les états finaux accessibles
+        if controle is not None:
+            controle.point(len(accessibles), len(self.etats), "Suppression des états non co-accessibles")
+        finals = {e.id for e in self.etats if "final" in e.type and e.id in accessibles}
+        utiles = self._parcours(finals, predecesseurs, accessibles)
+
         self.etats = [e for e in self.etats if e.id in utiles]
         self.transitions = [t for t in self.transitions if t.source.id in utiles and t.destination.id in utiles]
+        return self
 
-        # Partition initial  finaux / aures
-        finaux = {e.id for e in self.etats if "final" in e.type}
-        autres = {e.id for e in self.etats if e.id not in finaux}
-        partitions = [finaux, autres] if autres else [finaux]
-
-        alphabet = [a.valeur for a in self.alphabets]
-        transitions_map = {(t.source.id, t.alphabet.valeur): t.destination.id for t in self.transitions}
-
-        # 4. Raffinement des partitions
-        changed = True
-        while changed:
-            changed = False
-            nouvelles_partitions = []
-            for groupe in partitions:
-                sous_groupes = defaultdict(set)
-                for etat in groupe:
-                    signature = []
-                    for symbole in alphabet:
-                        dest = transitions_map.get((etat, symbole))
-                        for i, p in enumerate(partitions):
-                            if dest in p:
-                                signature.append(i)
-                                break
-                        else:
-                            signature.append(-1)
-                    sous_groupes[tuple(signature)].add(etat)
-                if len(sous_groupes) > 1:
-                    changed = True
-                nouvelles_partitions.extend(sous_groupes.values())
-            partitions = nouvelles_partitions
+    @mesure()
+    def minimiser_auto(self, controle=None):
+        """AFD minimal (Hopcroft) ; self n'est pas modifié, l'émondage porte sur un instantané."""
+        # 1-2. Supprime les états inaccessibles et stériles
+        emonde = self.instantane().emonder(controle)
+
+        # 3-4. Classes d'équivalence, partant de la partition finaux / autres
+        finaux = {e.id for e in emonde.etats if "final" in e.type}
+        alphabet = [a.valeur for a in emonde.alphabets]
+        transitions_map = {(t.source.id, t.alphabet.valeur): t.destination.id for t in emonde.transitions}
+        partitions = self._partition_minimale([e.id for e in emonde.etats], finaux, transitions_map,
+                                              alphabet, controle)
 
         # 5. Construction du nouvel automate minimal
         afd_min = Automate(nom=f"{self.nom}_minimal")
-        etat_map = {}
+        for a in emonde.alphabets:
+            afd_min.ajouter_alphabet(a)
+        etats_par_id = {e.id: e for e in emonde.etats}
+        classe_de = {}
         for i, groupe in enumerate(partitions):
-            label = next(e.label for e in self.etats if e.id in groupe)
+            membres = [etats_par_id[e] for e in groupe]
             type_etat = []
-            if any("initial" in e.type for e in self.etats if e.id in groupe):
+            if any("initial" in e.type for e in membres):
                 type_etat.append("initial")
-            if any("final" in e.type for e in self.etats if e.id in groupe):
+            if any("final" in e.type for e in membres):
                 type_etat.append("final")
             if not type_etat:
                 type_etat.append("normal")
-            nouvel_etat = Etat(id_etat=i + 1, label_etat=label, type_etat="_".join(type_etat))
-            afd_min.ajouter_etat(nouvel_etat)
-            etat_map[frozenset(groupe)] = nouvel_etat
+            # Ids neufs 1..k : ajout direct sans vérification d'unicité
+            afd_min.etats.append(Etat(id_etat=i + 1, label_etat=membres[0].label, type_etat="_".join(type_etat)))
+            for e in groupe:
+                classe_de[e] = i
 
         # Ajouter les transitions
-        for groupe, nouvel_etat in etat_map.items():
-            representant = next(iter(groupe))
+        symboles = {a.valeur: a for a in emonde.alphabets}
+        for groupe, nouvel_etat in zip(partitions, afd_min.etats):
+            representant = groupe[0]
             for sym in alphabet:
                 dest = transitions_map.get((representant, sym))
                 if dest is None:
                     continue
-                for g, e in etat_map.items():
-                    if dest in g:
-                        alphabet_obj = next(a for a in self.alphabets if a.valeur == sym)
-                        afd_min.ajouter_transition(
-                            Transition(
-                                id_transition=len(afd_min.transitions) + 1,
-                                etat_source=nouvel_etat,
-                                etat_destination=e,
-                                alphabet=alphabet_obj
-                            )
-                        )
-                        break
+                afd_min.ajouter_transition(
+                    Transition(
+                        id_transition=len(afd_min.transitions) + 1,
+                        etat_source=nouvel_etat,
+                        etat_destination=afd_min.etats[classe_de[dest]],
+                        alphabet=symboles[sym]
+                    )
+                )
 
         return afd_min
+
+    @mesure()
+    def minimiser_nfa(self, methode: str = "auto", controle=None):
+        """(AFD minimal, rapport) depuis un AFN, sans modifier self.
+
+        `methode` : "classique" (déterminiser puis minimiser_auto), "brzozowski"
+        (renverser et déterminiser deux fois) ou "auto" (modèle de coût de
+        classes.minimisation). Le rapport indique la méthode suivie et pourquoi.
+        """
+        from classes.minimisation import minimiser
+        return minimiser(self, methode, controle)
     
+    def empreinte(self) -> str:
+        """Hash du contenu (alphabet, états, transitions), indépendant de l'ordre des listes."""
+        contenu = json.dumps({
+            "alphabets": sorted(a.valeur for a in self.alphabets),
+            "etats": sorted((e.id, e.type) for e in self.etats),
+            "transitions": sorted((t.source.id, t.destination.id, t.alphabet.valeur) for t in self.transitions)
+        })
+        return hashlib.sha256(contenu.encode()).hexdigest()
+
+    @mesure()
+    def hash_canonique(self, controle=None) -> str:
+        """Hash du langage reconnu : deux automates ont le même hash ssi ils sont équivalents.
+
+        On calcule l'AFD minimal émondé, on renumérote ses états dans l'ordre d'un
+        parcours en largeur depuis l'état initial (symboles triés), puis on hache
+        cette forme canonique avec l'alphabet.
+        """
+        afd = self.determiniser(controle)
+        symboles = sorted(a.valeur for a in afd.alphabets if a.valeur != "ε")
+
+        # Langage vide : minimiser_auto n'a alors plus aucun état à construire
+        initiaux = [e.id for e in afd.etats if "initial" in e.type]
+        finaux = {e.id for e in afd.etats if "final" in e.type}
+        successeurs = defaultdict(list)
+        for t in afd.transitions:
+            successeurs[t.source.id].append(t.destination.id)
+        vus, file = set(initiaux), deque(initiaux)
+        while file:
+            for d in successeurs[file.popleft()]:
+                if d not in vus:
+                    vus.add(d)
+                    file.append(d)
+        if not vus & finaux:
+            forme = {"alphabet": symboles, "vide": True}
+        else:
+            minimal = afd.minimiser_auto(controle)
+            table = {(t.source.id, t.alphabet.valeur): t.destination.id for t in minimal.transitions}
+            initial = next(e.id for e in minimal.etats if "initial" in e.type)
+            numero = {initial: 0}
+            file = deque([initial])
+            transitions = []
+            while file:
+                e = file.popleft()
+                for sym in symboles:
+                    d = table.get((e, sym))
+                    if d is None:
+                        continue
+                    if d not in numero:
+                        numero[d] = len(numero)
+                        file.append(d)
+                    transitions.append((numero[e], sym, numero[d]))
+            forme = {
+                "alphabet": symboles,
+                "finaux": sorted(numero[e.id] for e in minimal.etats if "final" in e.type and e.id in numero),
+                "transitions": transitions,
+            }
+        return hashlib.sha256(json.dumps(forme, ensure_ascii=False).encode()).hexdigest()
+
     def __str__(self):
         return (
             f"Automate {self.nom}\n"
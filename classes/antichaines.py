@@ -0,0 +1,205 @@
+"""Inclusion et équivalence de langages d'AFN par antichaînes, sans déterminisation complète.
+
+Pour tester L(A) ⊆ L(B), on explore paresseusement les paires (p, P) : p état
+de A, P ensemble des états de B atteints par le même mot. Une paire avec p
+final et P sans état final donne un contre-exemple. On ne garde que les paires
+minimales : si (p, P) a déjà été rencontrée, toute (p, R) avec P ⊆ R est
+inutile, car un contre-exemple depuis (p, R) en est aussi un depuis (p, P).
+
+Avec `simulation=True`, la relation de simulation maximale ≼ (calculée sur
+l'union disjointe de A et B) élague davantage :
+  - P ne garde que ses éléments ≼-maximaux ;
+  - (p, P) est abandonnée si un état de P simule p ;
+  - (r, R) est couverte par (p, P) si r ≼ p et chaque état de P est simulé par un état de R.
+"""
+from collections import defaultdict, deque
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from classes.Automate import Automate
+from classes.metriques import compter
+
+
+class _Graphe:
+    """Partie utile d'un automate sans ε, états numérotés à partir de `decalage`."""
+
+    def __init__(self, automate: Automate, decalage: int = 0):
+        if automate.contient_epsilon():
+            automate = automate.eliminer_epsilon()
+        initiaux, finaux, successeurs, utiles = automate._graphe_utile()
+        numero = {}
+        for e in automate.etats:
+            if e.id in utiles:
+                numero[e.id] = decalage + len(numero)
+        self.etats = range(decalage, decalage + len(numero))
+        self.initiaux = frozenset(numero[e] for e in initiaux)
+        self.finaux = frozenset(numero[e] for e in finaux if e in numero)
+        self.successeurs: Dict[int, Dict[str, List[int]]] = {i: {} for i in self.etats}
+        for e, i in numero.items():
+            for symbole, d in successeurs[e]:
+                if d in numero:
+                    self.successeurs[i].setdefault(symbole, []).append(numero[d])
+
+
+def simulation_maximale(graphes: List[_Graphe]) -> Dict[int, Set[int]]:
+    """Simulation maximale : q ∈ simulateurs[p] ssi q simule p (et donc L(p) ⊆ L(q)).
+
+    Raffinement par compteurs (Henzinger, Henzinger, Kopke) : N[q, a][p'] = nombre
+    de a-successeurs de q qui simulent p'. Quand il tombe à 0, q ne simule plus
+    aucun a-prédécesseur de p'. Compteurs seulement pour q ayant des a-successeurs
+    et p' ayant des a-prédécesseurs, et seulement non nuls : O(|T|·|Q|) au pire,
+    sans facteur |Σ|.
+    """
+    successeurs, finaux = {}, set()
+    for g in graphes:
+        successeurs.update(g.successeurs)
+        finaux |= g.finaux
+    predecesseurs = defaultdict(lambda: defaultdict(list))
+    for p, sortantes in successeurs.items():
+        for symbole, destinations in sortantes.items():
+            for d in destinations:
+                predecesseurs[d][symbole].append(p)
+
+    etats = list(successeurs)
+    simulateurs = {p: {q for q in etats
+                       if (p not in finaux or q in finaux) and all(s in successeurs[q] for s in successeurs[p])}
+                   for p in etats}
+    simules = defaultdict(list)
+    for p2, qs in simulateurs.items():
+        for d in qs:
+            simules[d].append(p2)
+    compteurs: Dict[Tuple[int, str], Dict[int, int]] = {}
+    for q in etats:
+        for symbole, destinations in successeurs[q].items():
+            compte = compteurs[q, symbole] = {}
+            for d in destinations:
+                for p2 in simules[d]:
+                    if symbole in predecesseurs[p2]:
+                        compte[p2] = compte.get(p2, 0) + 1
+
+    file = deque()
+
+    def retirer(p: int, q: int):
+        simulateurs[p].discard(q)
+        file.append((p, q))
+
+    for p in etats:
+        for symbole, destinations in successeurs[p].items():
+            for p2 in destinations:
+                # q ∈ simulateurs[p] a des a-successeurs : compteurs[q, a] existe
+                for q in [q for q in simulateurs[p] if p2 not in compteurs[q, symbole]]:
+                    retirer(p, q)
+    while file:
+        p2, q2 = file.popleft()
+        compter("paires_simulation")
+        for symbole, sources in predecesseurs[q2].items():
+            if symbole not in predecesseurs[p2]:
+                continue
+            for q in sources:
+                compte = compteurs[q, symbole]
+                compte[p2] -= 1
+                if compte[p2] == 0:
+                    del compte[p2]
+                    for p in predecesseurs[p2][symbole]:
+                        if q in simulateurs[p]:
+                            retirer(p, q)
+    return simulateurs
+
+
+def inclusion(a: Automate, b: Automate, simulation: bool = False, controle=None) -> Optional[str]:
+    """Un mot de L(a) \\ L(b), ou None si L(a) ⊆ L(b).
+
+    L'exploration en largeur donne un contre-exemple court, pas forcément le plus court.
+    """
+    ga = _Graphe(a)
+    gb = _Graphe(b, len(ga.etats))
+    if simulation:
+        simulateurs = simulation_maximale([ga, gb])
+    else:
+        simulateurs = {p: {p} for g in (ga, gb) for p in g.etats}
+    simules = defaultdict(set)
+    for p, qs in simulateurs.items():
+        for q in qs:
+            simules[q].add(p)
+
+    def reduire(ensemble: Set[int]) -> FrozenSet[int]:
+        """Éléments ≼-maximaux ; entre états équivalents, le plus petit numéro."""
+        return frozenset(q for q in ensemble
+                         if not any(r != q and r in ensemble and (q not in simulateurs[r] or r < q)
+                                    for r in simulateurs[q]))
+
+    # Antichaîne : état de A -> ensembles minimaux de B déjà rencontrés avec lui
+    antichaine: Dict[int, Set[FrozenSet[int]]] = defaultdict(set)
+    parents: Dict[Tuple[int, FrozenSet[int]], Optional[tuple]] = {}
+
+    def couverte(r: int, ensemble: FrozenSet[int]) -> bool:
+        for p in simulateurs[r]:
+            for autre in antichaine.get(p, ()):
+                if all(any(q2 in simulateurs[q] for q2 in ensemble) for q in autre):
+                    return True
+        return False
+
+    def ajouter(r: int, ensemble: FrozenSet[int]):
+        # Retire les paires devenues inutiles : celles que (r, ensemble) couvre
+        for p in simules[r]:
+            inutiles = [autre for autre in antichaine.get(p, ())
+                        if all(any(q2 in simulateurs[q] for q2 in autre) for q in ensemble)]
+            for autre in inutiles:
+                antichaine[p].discard(autre)
+        antichaine[r].add(ensemble)
+
+    def mot(cle) -> str:
+        symboles = []
+        while parents[cle] is not None:
+            cle, symbole = parents[cle]
+            symboles.append(symbole)
+        return "".join(reversed(symboles))
+
+    file = deque()
+    depart = reduire(set(gb.initiaux))
+    for p in sorted(ga.initiaux):
+        if p in ga.finaux and not depart & gb.finaux:
+            return ""
+        if any(q in simulateurs[p] for q in depart) or couverte(p, depart):
+            continue
+        ajouter(p, depart)
+        parents[p, depart] = None
+        file.append((p, depart))
+
+    explorees = 0
+    while file:
+        p, ensemble = file.popleft()
+        if ensemble not in antichaine[p]:
+            continue  # couverte entre-temps par une paire plus petite
+        explorees += 1
+        if controle is not None and explorees % 1000 == 0:
+            controle.point(explorees, message=f"{explorees} paires explorées")
+        for symbole in sorted(ga.successeurs[p]):
+            suivant = set()
+            for q in ensemble:
+                suivant.update(gb.successeurs[q].get(symbole, ()))
+            suivant = reduire(suivant)
+            for r in ga.successeurs[p][symbole]:
+                if (r, suivant) in parents:
+                    continue
+                if r in ga.finaux and not suivant & gb.finaux:
+                    compter("paires_explorees", explorees)
+                    return mot((p, ensemble)) + symbole
+                if any(q in simulateurs[r] for q in suivant) or couverte(r, suivant):
+                    continue
+                ajouter(r, suivant)
+                parents[r, suivant] = ((p, ensemble), symbole)
+                file.append((r, suivant))
+    compter("paires_explorees", explorees)
+    return None
+
+
+def equivalence(a: Automate, b: Automate, simulation: bool = False,
+                controle=None) -> Tuple[Optional[str], Optional[int]]:
+    """(contre-exemple, automate qui l'accepte : 1 ou 2), ou (None, None) si L(a) = L(b)."""
+    contre_exemple = inclusion(a, b, simulation, controle)
+    if contre_exemple is not None:
+        return contre_exemple, 1
+    contre_exemple = inclusion(b, a, simulation, controle)
+    if contre_exemple is not None:
+        return contre_exemple, 2
+    return None, None
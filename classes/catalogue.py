@@ -0,0 +1,170 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from classes.Automate import Automate
+
+
+class Catalogue:
+    """Index des automates du dossier 'automates', conservé dans un fichier annexe.
+
+    Chaque entrée décrit un automate (taille, compteurs, déterminisme, minimalité,
+    protection par mot de passe). L'index est mis à jour de façon incrémentale :
+    seuls les fichiers dont la date de modification ou la taille a changé sont relus.
+    """
+
+    # 2 : est_deterministe tient compte des ε-transitions
+    # 3 : champs langage_vide et langage_fini
+    VERSION = 3
+
+    def __init__(self, dossier: str = "automates", security=None):
+        self.dossier = Path(dossier)
+        # Pas d'extension .json pour ne pas apparaître parmi les automates
+        self.fichier_index = self.dossier / ".catalogue"
+        self.security = security
+        self.entrees: Dict[str, dict] = {}
+        self.credentials_mtime = None
+        self._charger_index()
+
+    def _charger_index(self):
+        try:
+            with open(self.fichier_index, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get("version") != self.VERSION:
+            return
+        self.entrees = data.get("entrees", {})
+        self.credentials_mtime = data.get("credentials_mtime")
+
+    def _sauvegarder_index(self):
+        self.dossier.mkdir(exist_ok=True)
+        temp = self.fichier_index.with_name(self.fichier_index.name + ".tmp")
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": self.VERSION,
+                "credentials_mtime": self.credentials_mtime,
+                "entrees": self.entrees
+            }, f)
+        os.replace(temp, self.fichier_index)
+
+    @staticmethod
+    def analyser(chemin, stat=None) -> dict:
+        """Calcule l'entrée du catalogue pour un fichier d'automate."""
+        stat = stat or os.stat(chemin)
+        entree = {
+            "nom": Path(chemin).stem,
+            "mtime": stat.st_mtime_ns,
+            "taille": stat.st_size,
+        }
+        try:
+            automate = Automate.charger_fichier(chemin)
+        except Exception as e:
+            entree["erreur"] = str(e)
+            return entree
+
+        deterministe = automate.est_deterministe()
+        entree.update({
+            "nb_etats": len(automate.etats),
+            "nb_transitions": len(automate.transitions),
+            "nb_symboles": len(automate.alphabets),
+            "deterministe": deterministe,
+            # Même critères que est_minimal, sans les affichages console
+            "minimal": deterministe and automate.tous_etats_accessibles() and automate.tous_etats_distinguables(),
+            "langage_vide": automate.est_vide(),
+            "langage_fini": automate.est_fini(),
+        })
+        return entree
+
+    def rafraichir(self, carte=map) -> bool:
+        """Met l'index à jour à partir du dossier. Retourne True si quelque chose a changé.
+
+        `carte` permet d'analyser les fichiers modifiés en parallèle (par ex. ProcessPoolExecutor.map).
+        """
+        self.dossier.mkdir(exist_ok=True)
+        change = False
+        vus = set()
+        a_analyser = []
+
+        with os.scandir(self.dossier) as it:
+            for f in it:
+                if not f.name.endswith(".json") or not f.is_file():
+                    continue
+                nom = f.name[:-len(".json")]
+                vus.add(nom)
+                stat = f.stat()
+                entree = self.entrees.get(nom)
+                if entree and entree["mtime"] == stat.st_mtime_ns and entree["taille"] == stat.st_size:
+                    continue
+                a_analyser.append(f.path)
+
+        for nouvelle in carte(self.analyser, a_analyser):
+            ancienne = self.entrees.get(nouvelle["nom"])
+            nouvelle["protege"] = ancienne.get("protege", False) if ancienne else False
+            self.entrees[nouvelle["nom"]] = nouvelle
+            change = True
+
+        for nom in set(self.entrees) - vus:
+            del self.entrees[nom]
+            change = True
+
+        if self._rafraichir_protection(force=change):
+            change = True
+
+        if change:
+            self._sauvegarder_index()
+        return change
+
+    def _rafraichir_protection(self, force: bool = False) -> bool:
+        """Recalcule les drapeaux 'protege' si le fichier de credentials a changé."""
+        if self.security is None:
+            return False
+        try:
+            mtime = os.stat(self.security.credentials_file).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if not force and mtime == self.credentials_mtime:
+            return False
+        proteges = self.security.noms_proteges() if mtime is not None else set()
+        for nom, entree in self.entrees.items():
+            entree["protege"] = nom in proteges
+        self.credentials_mtime = mtime
+        return True
+
+    @staticmethod
+    def hash_fichier(chemin) -> Optional[str]:
+        """Hash canonique du langage d'un fichier d'automate (None si illisible)."""
+        try:
+            return Automate.charger_fichier(chemin).hash_canonique()
+        except Exception:
+            return None
+
+    def hashs_canoniques(self, carte=map) -> Dict[str, str]:
+        """Hash canonique de chaque automate, calculé seulement pour les entrées qui n'en ont pas.
+
+        Une entrée est remplacée quand son fichier change, ce qui invalide son hash.
+        """
+        manquants = [nom for nom, e in self.entrees.items() if "hash_canonique" not in e and "erreur" not in e]
+        chemins = [str(self.dossier / f"{nom}.json") for nom in manquants]
+        for nom, h in zip(manquants, carte(self.hash_fichier, chemins)):
+            self.entrees[nom]["hash_canonique"] = h
+        if manquants:
+            self._sauvegarder_index()
+        return {nom: e["hash_canonique"] for nom, e in self.entrees.items() if e.get("hash_canonique")}
+
+    def classes_equivalence(self, carte=map) -> List[List[str]]:
+        """Regroupe les automates reconnaissant le même langage (une recherche de dictionnaire par automate)."""
+        groupes: Dict[str, List[str]] = {}
+        for nom, h in sorted(self.hashs_canoniques(carte).items()):
+            groupes.setdefault(h, []).append(nom)
+        return sorted(groupes.values(), key=lambda g: (-len(g), g))
+
+    def noms(self) -> List[str]:
+        return sorted(self.entrees)
+
+    def entree(self, nom: str) -> Optional[dict]:
+        return self.entrees.get(nom)
+
+    def proteges(self) -> List[dict]:
+        return [self.entrees[nom] for nom in self.noms() if self.entrees[nom].get("protege")]
@@ -0,0 +1,237 @@
+"""Stockage compact d'AFD sur des symboles d'un caractère (tableaux CSR).
+
+Les transitions de l'état e occupent les indices debuts[e] à debuts[e + 1] - 1
+de `codes` (code du caractère, triés) et `destinations`. Un état coûte quelques
+octets au lieu de plusieurs objets Python, ce qui permet de garder des
+dictionnaires de millions de mots en mémoire.
+"""
+import json
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, List, Optional
+
+from classes.Alphabet import Alphabet
+from classes.Automate import Automate
+from classes.Etat import Etat
+from classes.Transition import Transition
+
+ENTETE = b"AUTOMATE-COMPACT 1\n"
+
+
+class AutomateCompact:
+    """AFD immuable en tableaux contigus ; état initial `initial`, états numérotés 0..n-1."""
+
+    def __init__(self, nom: str, debuts: array, codes: array, destinations: array, finaux: bytearray,
+                 initial: int = 0):
+        self.nom = nom
+        self.debuts = debuts
+        self.codes = codes
+        self.destinations = destinations
+        self.finaux = finaux
+        self.initial = initial
+
+    @property
+    def nb_etats(self) -> int:
+        return len(self.finaux)
+
+    @property
+    def nb_transitions(self) -> int:
+        return len(self.destinations)
+
+    def taille_memoire(self) -> int:
+        """Octets occupés par les tableaux."""
+        return sum(a.itemsize * len(a) for a in (self.debuts, self.codes, self.destinations)) + len(self.finaux)
+
+    def transition(self, etat: int, symbole: str) -> Optional[int]:
+        code = ord(symbole)
+        debut, fin = self.debuts[etat], self.debuts[etat + 1]
+        i = bisect_left(self.codes, code, debut, fin)
+        if i == fin or self.codes[i] != code:
+            return None
+        return self.destinations[i]
+
+    def reconnait_mot(self, mot: str) -> bool:
+        etat = self.initial
+        for symbole in mot:
+            etat = self.transition(etat, symbole)
+            if etat is None:
+                return False
+        return bool(self.finaux[etat])
+
+    __contains__ = reconnait_mot
+
+    def reconnait_mots(self, mots: Iterable[str]) -> List[bool]:
+        """reconnait_mot sur un lot : tables liées une fois, transitions déjà suivies mémorisées pour le lot."""
+        debuts, codes, destinations, finaux = self.debuts, self.codes, self.destinations, self.finaux
+        suivants = {}
+        resultats = []
+        for mot in mots:
+            etat = self.initial
+            for symbole in mot:
+                cle = (etat, symbole)
+                suivant = suivants.get(cle, -1)
+                if suivant == -1:
+                    code = ord(symbole)
+                    debut, fin = debuts[etat], debuts[etat + 1]
+                    i = bisect_left(codes, code, debut, fin)
+                    suivant = suivants[cle] = destinations[i] if i < fin and codes[i] == code else None
+                etat = suivant
+                if etat is None:
+                    break
+            resultats.append(etat is not None and bool(finaux[etat]))
+        return resultats
+
+    def mots(self) -> Iterator[str]:
+        """Mots reconnus dans l'ordre lexicographique (automate acyclique, comme ceux de depuis_mots)."""
+        pile = [(self.initial, "", self.debuts[self.initial])]
+        if self.finaux[self.initial]:
+            yield ""
+        while pile:
+            etat, prefixe, i = pile.pop()
+            if i == self.debuts[etat + 1]:
+                continue
+            pile.append((etat, prefixe, i + 1))
+            mot = prefixe + chr(self.codes[i])
+            dest = self.destinations[i]
+            if self.finaux[dest]:
+                yield mot
+            pile.append((dest, mot, self.debuts[dest]))
+
+    @classmethod
+    def depuis_automate(cls, automate: Automate) -> 'AutomateCompact':
+        """Conversion d'un AFD dont les symboles sont des caractères uniques."""
+        if not automate.est_deterministe():
+            raise ValueError("Seul un automate déterministe peut être stocké sous forme compacte")
+        if any(len(a.valeur) != 1 for a in automate.alphabets):
+            raise ValueError("La forme compacte n'accepte que des symboles d'un caractère")
+        numero = {}
+        for e in automate.etats:
+            if "initial" in e.type:
+                numero[e.id] = 0
+        for e in automate.etats:
+            numero.setdefault(e.id, len(numero))
+        sortantes = [[] for _ in numero]
+        for t in automate.transitions:
+            sortantes[numero[t.source.id]].append((ord(t.alphabet.valeur), numero[t.destination.id]))
+        debuts, codes, destinations = array("I", [0]), array("I"), array("I")
+        for ligne in sortantes:
+            for code, dest in sorted(ligne):
+                codes.append(code)
+                destinations.append(dest)
+            debuts.append(len(codes))
+        finaux = bytearray(len(numero))
+        for e in automate.etats:
+            if "final" in e.type:
+                finaux[numero[e.id]] = 1
+        return cls(automate.nom, debuts, codes, destinations, finaux)
+
+    def vers_automate(self) -> Automate:
+        """Automate équivalent en objets Etat/Transition (pour l'interface et les algorithmes généraux)."""
+        automate = Automate(self.nom)
+        alphabets = {}
+        for code in sorted(set(self.codes)):
+            alphabets[code] = Alphabet(len(alphabets) + 1, chr(code))
+            automate.ajouter_alphabet(alphabets[code])
+        for e in range(self.nb_etats):
+            type_etat = []
+            if e == self.initial:
+                type_etat.append("initial")
+            if self.finaux[e]:
+                type_etat.append("final")
+            automate.etats.append(Etat(e, f"q{e}", "_".join(type_etat) or "normal"))
+        for e in range(self.nb_etats):
+            for i in range(self.debuts[e], self.debuts[e + 1]):
+                automate.ajouter_transition(Transition(i + 1, automate.etats[e], automate.etats[self.destinations[i]],
+                                                       alphabets[self.codes[i]]))
+        return automate
+
+    def sauvegarder_fichier(self, chemin):
+        """Format binaire : en-tête, ligne JSON de description, puis les tableaux en petit-boutiste."""
+        description = {"nom": self.nom, "initial": self.initial, "nb_etats": self.nb_etats,
+                       "nb_transitions": self.nb_transitions}
+        with open(chemin, "wb") as f:
+            f.write(ENTETE)
+            f.write(json.dumps(description, ensure_ascii=False).encode("utf-8") + b"\n")
+            for tableau in (self.debuts, self.codes, self.destinations):
+                if sys.byteorder == "big":
+                    tableau = array(tableau.typecode, tableau)
+                    tableau.byteswap()
+                tableau.tofile(f)
+            f.write(self.finaux)
+
+    @classmethod
+    def charger_fichier(cls, chemin) -> 'AutomateCompact':
+        with open(chemin, "rb") as f:
+            if f.readline() != ENTETE:
+                raise ValueError(f"{chemin} n'est pas un automate compact")
+            description = json.loads(f.readline())
+            tableaux = []
+            for longueur in (description["nb_etats"] + 1, description["nb_transitions"],
+                             description["nb_transitions"]):
+                tableau = array("I")
+                tableau.fromfile(f, longueur)
+                if sys.byteorder == "big":
+                    tableau.byteswap()
+                tableaux.append(tableau)
+            finaux = bytearray(f.read(description["nb_etats"]))
+        return cls(description["nom"], *tableaux, finaux, description["initial"])
+
+
+def depuis_mots(mots: Iterable[str], nom: str = "dictionnaire", controle=None) -> AutomateCompact:
+    """AFD minimal acyclique d'une liste de mots triée (construction incrémentale de Daciuk et al.).
+
+    Un seul passage : quand un mot ne partage plus de préfixe avec le précédent,
+    les états du suffixe abandonné sont définitifs et sont remplacés par leur
+    équivalent déjà enregistré ou enregistrés. Seuls le chemin du mot courant et
+    le registre (taille de l'automate minimal) restent en mémoire ; les états
+    enregistrés sont écrits directement dans les tableaux CSR.
+    """
+    debuts, codes, destinations = array("I", [0]), array("I"), array("I")
+    finaux = bytearray()
+    registre = {}
+
+    def enregistrer(final: bool, aretes: list) -> int:
+        # Signature en octets (final, code1, dest1, code2, dest2, ...) : bien plus compacte qu'un tuple d'entiers
+        signature = array("I", aretes).tobytes() + (b"\x01" if final else b"\x00")
+        etat = registre.get(signature)
+        if etat is None:
+            etat = registre[signature] = len(finaux)
+            finaux.append(final)
+            codes.extend(aretes[0::2])
+            destinations.extend(aretes[1::2])
+            debuts.append(len(codes))
+        return etat
+
+    # chemin[i] = [final, arêtes définitives] de l'état atteint par precedent[:i]
+    chemin = [[False, []]]
+    precedent = ""
+
+    def figer(profondeur: int):
+        """Enregistre les états du chemin plus profonds que `profondeur`."""
+        while len(chemin) > profondeur + 1:
+            final, aretes = chemin.pop()
+            etat = enregistrer(final, aretes)
+            chemin[-1][1].extend((ord(precedent[len(chemin) - 1]), etat))
+
+    for n, mot in enumerate(mots):
+        if controle is not None and n % 10000 == 0:
+            controle.point(n, message=f"{n} mots, {len(finaux)} états")
+        if mot < precedent:
+            raise ValueError(f"Les mots doivent être triés : '{mot}' après '{precedent}'")
+        if mot == precedent and n:
+            continue
+        commun = 0
+        limite = min(len(mot), len(precedent))
+        while commun < limite and mot[commun] == precedent[commun]:
+            commun += 1
+        figer(commun)
+        for _ in mot[commun:]:
+            chemin.append([False, []])
+        chemin[-1][0] = True
+        precedent = mot
+
+    figer(0)
+    final, aretes = chemin.pop()
+    initial = enregistrer(final, aretes)
+    return AutomateCompact(nom, debuts, codes, destinations, finaux, initial)
@@ -0,0 +1,146 @@
+"""Test d'un très grand fichier de mots (un par ligne) contre un automate, sur plusieurs processus.
+
+Le fichier est projeté en mémoire (mmap) et découpé en morceaux d'environ
+`taille_morceau` octets, coupés après un saut de ligne. Chaque processus de
+travail reçoit l'automate une seule fois à son démarrage : un AutomateFige,
+qui ne transporte que le nom de son segment de mémoire partagée, ou l'AFD
+lui-même pour des symboles de plusieurs caractères. Il ne reçoit ensuite que
+des bornes (début, fin) et relit son morceau dans sa propre projection du fichier.
+
+Le fichier de sortie contient une ligne par mot, dans l'ordre de l'entrée :
+"1" (accepté) ou "0" (rejeté), suivi du mot avec `avec_mots`. Une dernière
+ligne "# lignes=... acceptes=... rejetes=..." donne les totaux.
+"""
+import mmap
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, Optional, Tuple
+
+from classes.Automate import Automate
+from classes.metriques import compter
+
+TAILLE_MORCEAU = 4 << 20
+_METHODE_DEMARRAGE = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Dans chaque processus de travail : l'automate reçu au démarrage et les fichiers déjà projetés
+_reconnaisseur = None
+_projections: Dict[str, mmap.mmap] = {}
+
+
+def _initialiser(reconnaisseur):
+    global _reconnaisseur
+    _reconnaisseur = reconnaisseur
+
+
+def _projection(chemin: str) -> mmap.mmap:
+    projection = _projections.get(chemin)
+    if projection is None:
+        with open(chemin, "rb") as f:
+            projection = _projections[chemin] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return projection
+
+
+def morceaux(projection, taille_morceau: int = TAILLE_MORCEAU) -> Iterator[Tuple[int, int]]:
+    """Bornes (début, fin) de morceaux qui se terminent juste après un saut de ligne (ou en fin de fichier)."""
+    debut, taille = 0, len(projection)
+    while debut < taille:
+        fin = projection.find(b"\n", min(debut + taille_morceau, taille) - 1)
+        fin = taille if fin == -1 else fin + 1
+        yield debut, fin
+        debut = fin
+
+
+def tester_morceau(chemin: str, debut: int, fin: int, avec_mots: bool = False) -> Tuple[bytes, int, int]:
+    """(lignes de sortie, nombre de mots, nombre d'acceptés) pour les octets [debut, fin) du fichier."""
+    texte = _projection(chemin)[debut:fin].decode("utf-8", errors="surrogateescape")
+    mots = texte.split("\n")
+    if mots[-1] == "":
+        mots.pop()  # le morceau se termine par un saut de ligne
+    mots = [m[:-1] if m.endswith("\r") else m for m in mots]
+    if hasattr(_reconnaisseur, "reconnait_mots"):
+        resultats = _reconnaisseur.reconnait_mots(mots)
+    else:
+        resultats = [_reconnaisseur.reconnait_mot(m) for m in mots]
+    if avec_mots:
+        lignes = [f"{'1' if r else '0'}\t{m}" for r, m in zip(resultats, mots)]
+    else:
+        lignes = ["1" if r else "0" for r in resultats]
+    sortie = ("\n".join(lignes) + "\n" if lignes else "").encode("utf-8", errors="surrogateescape")
+    return sortie, len(mots), sum(resultats)
+
+
+def tester_corpus(automate: Automate, entree, sortie, jobs: Optional[int] = None,
+                  taille_morceau: int = TAILLE_MORCEAU, avec_mots: bool = False, controle=None) -> Dict:
+    """Teste chaque ligne de `entree` et écrit les résultats dans `sortie` au fil de l'eau.
+
+    `jobs` processus (par défaut un par cœur ; 1 = dans ce processus). Au plus
+    2 × jobs morceaux sont en cours à la fois, ce qui borne la mémoire quelle
+    que soit la taille du fichier. Retourne les totaux.
+    """
+    if not any("initial" in e.type for e in automate.etats):
+        raise ValueError("Aucun état initial trouvé.")
+    jobs = jobs or os.cpu_count() or 1
+    entree = os.fspath(entree)
+    depart = time.perf_counter()
+    fige = None
+    if all(len(a.valeur) == 1 for a in automate.alphabets if a.valeur != "ε"):
+        reconnaisseur = fige = automate.figer(controle=controle)
+    else:
+        reconnaisseur = automate.determiniser(controle)
+
+    totaux = {"lignes": 0, "acceptes": 0, "morceaux": 0}
+
+    def ecrire(f, resultat, fin: int, taille: int):
+        octets, lignes, acceptes = resultat
+        f.write(octets)
+        totaux["lignes"] += lignes
+        totaux["acceptes"] += acceptes
+        totaux["morceaux"] += 1
+        if controle is not None:
+            controle.point(fin, taille, f"{totaux['lignes']} mots testés")
+
+    executeur = None
+    try:
+        with open(entree, "rb") as f_entree, open(sortie, "wb") as f_sortie:
+            taille = os.fstat(f_entree.fileno()).st_size
+            # mmap refuse un fichier vide
+            projection = mmap.mmap(f_entree.fileno(), 0, access=mmap.ACCESS_READ) if taille else b""
+            bornes = morceaux(projection, taille_morceau)
+            if jobs == 1:
+                _initialiser(reconnaisseur)
+                for debut, fin in bornes:
+                    ecrire(f_sortie, tester_morceau(entree, debut, fin, avec_mots), fin, taille)
+            else:
+                # Jamais fork : l'appelant peut être un fil de l'interface Tk, dont les verrous
+                # et l'état X11 ne doivent pas être hérités par les processus de travail
+                executeur = ProcessPoolExecutor(max_workers=jobs, initializer=_initialiser, initargs=(reconnaisseur,),
+                                                mp_context=multiprocessing.get_context(_METHODE_DEMARRAGE))
+                en_cours = deque()
+                for debut, fin in bornes:
+                    en_cours.append((fin, executeur.submit(tester_morceau, entree, debut, fin, avec_mots)))
+                    if len(en_cours) >= 2 * jobs:
+                        fin, futur = en_cours.popleft()
+                        ecrire(f_sortie, futur.result(), fin, taille)
+                while en_cours:
+                    fin, futur = en_cours.popleft()
+                    ecrire(f_sortie, futur.result(), fin, taille)
+            rejetes = totaux["lignes"] - totaux["acceptes"]
+            f_sortie.write(f"# lignes={totaux['lignes']} acceptes={totaux['acceptes']} rejetes={rejetes}\n"
+                           .encode("utf-8"))
+            if taille:
+                projection.close()
+    finally:
+        if executeur is not None:
+            executeur.shutdown(cancel_futures=True)
+        _initialiser(None)
+        if fige is not None:
+            fige.liberer()
+        if entree in _projections:
+            _projections.pop(entree).close()
+    secondes = time.perf_counter() - depart
+    compter("mots_corpus", totaux["lignes"])
+    return {**totaux, "rejetes": totaux["lignes"] - totaux["acceptes"], "octets": taille,
+            "secondes": round(secondes, 3), "mots_par_seconde": round(totaux["lignes"] / secondes) if secondes else None}
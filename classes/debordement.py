@@ -0,0 +1,221 @@
+"""Construction des sous-ensembles à mémoire bornée : au-delà d'un plafond, tables sur disque (sqlite3).
+
+Deux structures grossissent avec l'AFD : la table d'internement
+(sous-ensemble -> numéro d'état) et la file des sous-ensembles à développer.
+Chaque sous-ensemble est codé en octets (numéros d'états triés, array "I").
+
+  - Table : un cache LRU en mémoire devant une table sqlite. Les entrées
+    évincées du cache sont écrites sur disque ; une recherche qui échoue en
+    mémoire interroge sqlite (seulement après le premier débordement) et
+    remonte l'entrée trouvée dans le cache.
+  - File : les numéros sont attribués dans l'ordre de la file, qui est donc un
+    intervalle de numéros. Sa tête reste en mémoire ; dès qu'elle dépasse sa
+    part du plafond, les nouveaux éléments partent sur disque (par lots) et
+    sont relus dans l'ordre quand la tête se vide.
+
+Le plafond `memoire_max` (octets, estimés) est partagé : un quart pour la tête
+de la file, le reste pour le cache. L'AFD produit est écrit au fil du parcours
+en tableaux compacts (AutomateCompact) et n'entre pas dans le plafond. La
+numérotation est celle de `determiniser`.
+"""
+import os
+import sqlite3
+import tempfile
+from array import array
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Optional
+
+from classes.Automate import Automate
+from classes.compact import AutomateCompact
+from classes.metriques import compter
+
+MEMOIRE_MAX = 256 << 20
+# Coût estimé d'une entrée en mémoire en plus des octets du sous-ensemble (objet bytes, entier, nœud du dict)
+SURCOUT = 120
+# Éléments écrits ou relus par requête sqlite
+LOT = 4096
+# Appels de `progression` : tous les INTERVALLE états développés
+INTERVALLE = 10000
+
+
+def _coder(etats) -> bytes:
+    return array("I", sorted(etats)).tobytes()
+
+
+class _Stockage:
+    """Table d'internement et file d'attente, en mémoire jusqu'au plafond puis sur disque."""
+
+    def __init__(self, memoire_max: int, dossier: Optional[str] = None):
+        self.limite_file = memoire_max // 4
+        self.limite_cache = memoire_max - self.limite_file
+        self.cache: 'OrderedDict[bytes, int]' = OrderedDict()
+        self.octets_cache = 0
+        self.tete = deque()
+        self.octets_tete = 0
+        self.tampon = []  # fin de la file, pas encore écrite sur disque
+        self.sur_disque = 0  # éléments de la file sur disque
+        self.deborde = False
+        self.statistiques = {"entrees_deportees": 0, "lectures_disque": 0, "succes_disque": 0,
+                             "ecritures_file": 0, "lectures_file": 0}
+        descripteur, self.chemin = tempfile.mkstemp(prefix="sous_ensembles_", suffix=".sqlite", dir=dossier)
+        os.close(descripteur)
+        self.base = sqlite3.connect(self.chemin)
+        # Base jetable : ni journal ni synchronisation
+        self.base.execute("PRAGMA journal_mode=OFF")
+        self.base.execute("PRAGMA synchronous=OFF")
+        self.base.execute("CREATE TABLE internement (cle BLOB PRIMARY KEY, numero INTEGER) WITHOUT ROWID")
+        self.base.execute("CREATE TABLE attente (numero INTEGER PRIMARY KEY, cle BLOB)")
+
+    # Table d'internement
+
+    def chercher(self, cle: bytes) -> Optional[int]:
+        numero = self.cache.get(cle)
+        if numero is not None:
+            self.cache.move_to_end(cle)
+            return numero
+        if not self.deborde:
+            return None
+        self.statistiques["lectures_disque"] += 1
+        ligne = self.base.execute("SELECT numero FROM internement WHERE cle = ?", (cle,)).fetchone()
+        if ligne is None:
+            return None
+        self.statistiques["succes_disque"] += 1
+        self._mettre_en_cache(cle, ligne[0], ecrit=True)
+        return ligne[0]
+
+    def ajouter(self, cle: bytes, numero: int):
+        self._mettre_en_cache(cle, numero, ecrit=False)
+
+    def _mettre_en_cache(self, cle: bytes, numero: int, ecrit: bool):
+        # Le signe mémorise si l'entrée est déjà sur disque : -1 - numero
+        self.cache[cle] = -1 - numero if ecrit else numero
+        self.octets_cache += len(cle) + SURCOUT
+        if self.octets_cache > self.limite_cache:
+            self._evincer()
+
+    def _evincer(self):
+        """Retire du cache les entrées les plus anciennes jusqu'à la moitié de sa part du plafond."""
+        a_ecrire = []
+        while self.cache and self.octets_cache > self.limite_cache // 2:
+            cle, numero = self.cache.popitem(last=False)
+            self.octets_cache -= len(cle) + SURCOUT
+            if numero >= 0:
+                a_ecrire.append((cle, numero))
+        self.base.executemany("INSERT OR IGNORE INTO internement VALUES (?, ?)", a_ecrire)
+        self.statistiques["entrees_deportees"] += len(a_ecrire)
+        self.deborde = True
+
+    # File d'attente
+
+    def empiler(self, numero: int, cle: bytes):
+        if not self.sur_disque and not self.tampon and self.octets_tete <= self.limite_file:
+            self.tete.append((numero, cle))
+            self.octets_tete += len(cle) + SURCOUT
+            return
+        self.tampon.append((numero, cle))
+        if len(self.tampon) >= LOT:
+            self._vider_tampon()
+
+    def _vider_tampon(self):
+        self.base.executemany("INSERT INTO attente VALUES (?, ?)", self.tampon)
+        self.sur_disque += len(self.tampon)
+        self.statistiques["ecritures_file"] += len(self.tampon)
+        self.tampon = []
+
+    def depiler(self):
+        if not self.tete:
+            if self.sur_disque:
+                lignes = self.base.execute("SELECT numero, cle FROM attente ORDER BY numero LIMIT ?",
+                                           (LOT,)).fetchall()
+                self.base.execute("DELETE FROM attente WHERE numero <= ?", (lignes[-1][0],))
+                self.sur_disque -= len(lignes)
+                self.statistiques["lectures_file"] += len(lignes)
+                self.tete.extend(lignes)
+            else:
+                # Tout le reste de la file est dans le tampon
+                self.tete.extend(self.tampon)
+                self.tampon = []
+            self.octets_tete = sum(len(cle) + SURCOUT for _, cle in self.tete)
+        numero, cle = self.tete.popleft()
+        self.octets_tete -= len(cle) + SURCOUT
+        return numero, cle
+
+    def __len__(self) -> int:
+        return len(self.tete) + self.sur_disque + len(self.tampon)
+
+    def fermer(self):
+        self.base.close()
+        os.unlink(self.chemin)
+
+
+def determiniser_borne(automate: Automate, memoire_max: int = MEMOIRE_MAX,
+                       progression: Optional[Callable[[Dict], None]] = None, dossier: Optional[str] = None,
+                       controle=None) -> AutomateCompact:
+    """AFD compact des sous-ensembles accessibles, sans dépasser (environ) `memoire_max` octets de tables.
+
+    `progression(statistiques)` est appelée régulièrement et à la fin avec les
+    compteurs du parcours et du débordement ; `dossier` accueille le fichier
+    sqlite temporaire (par défaut le dossier temporaire du système).
+    """
+    symboles = list(dict.fromkeys(a.valeur for a in automate.alphabets if a.valeur != "ε"))
+    if any(len(s) != 1 for s in symboles):
+        raise ValueError("La forme compacte n'accepte que des symboles d'un caractère")
+    initiaux = {e.id for e in automate.etats if "initial" in e.type}
+    if not initiaux:
+        raise ValueError("Aucun état initial trouvé.")
+    successeurs = automate._successeurs()
+    finaux = {e.id for e in automate.etats if "final" in e.type}
+    # Les codes sont triés comme dans AutomateCompact ; la numérotation suit l'ordre de l'alphabet
+    ordre_codes = sorted(range(len(symboles)), key=lambda rang: ord(symboles[rang]))
+
+    debuts, codes, destinations = array("I", [0]), array("I"), array("I")
+    est_final = bytearray()
+    stockage = _Stockage(memoire_max, dossier)
+
+    def statistiques() -> Dict:
+        return {"etats": len(est_final), "developpes": len(debuts) - 1, "en_attente": len(stockage),
+                "en_memoire": len(stockage.cache), "octets_memoire": stockage.octets_cache + stockage.octets_tete,
+                "deborde": stockage.deborde, **stockage.statistiques}
+
+    def interner(etats) -> int:
+        cle = _coder(etats)
+        numero = stockage.chercher(cle)
+        if numero is None:
+            numero = len(est_final)
+            est_final.append(not finaux.isdisjoint(etats))
+            stockage.ajouter(cle, numero)
+            stockage.empiler(numero, cle)
+        return numero if numero >= 0 else -1 - numero
+
+    try:
+        interner(automate.calculer_epsilon_fermeture(initiaux, successeurs))
+        while len(stockage):
+            _, cle = stockage.depiler()
+            sous_ensemble = array("I")
+            sous_ensemble.frombytes(cle)
+            sortantes = [None] * len(symboles)
+            for rang, symbole in enumerate(symboles):
+                suivants = set()
+                for e in sous_ensemble:
+                    suivants.update(successeurs.get(e, {}).get(symbole, ()))
+                if suivants:
+                    sortantes[rang] = interner(automate.calculer_epsilon_fermeture(suivants, successeurs))
+            for rang in ordre_codes:
+                if sortantes[rang] is not None:
+                    codes.append(ord(symboles[rang]))
+                    destinations.append(sortantes[rang])
+            debuts.append(len(codes))
+            if (len(debuts) - 1) % INTERVALLE == 0:
+                if controle is not None:
+                    controle.point(len(debuts) - 1, message=f"{len(est_final)} états, {len(stockage)} en attente"
+                                   + (" (débordement sur disque)" if stockage.deborde else ""))
+                if progression is not None:
+                    progression(statistiques())
+        resultat = statistiques()
+    finally:
+        stockage.fermer()
+    if progression is not None:
+        progression(resultat)
+    compter("sous_ensembles_crees", len(est_final))
+    compter("entrees_deportees", resultat["entrees_deportees"])
+    return AutomateCompact(f"{automate.nom}_AFD", debuts, codes, destinations, est_final)
@@ -0,0 +1,208 @@
+import json
+import os
+import queue
+import random
+import threading
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # la disposition par forces retombe sur les couches
+    np = None
+
+Positions = Dict[int, Tuple[float, float]]
+
+ESPACEMENT_X = 180
+ESPACEMENT_Y = 100
+LIMITE_FORCES = 1500  # au-delà, le calcul n² des répulsions coûte trop de mémoire
+
+
+def structure(automate) -> Tuple[List[int], List[int], List[Tuple[int, int]]]:
+    """Copie (ids des états, ids initiaux, arcs) utilisable hors du thread Tk."""
+    ids = [e.id for e in automate.etats]
+    initiaux = [e.id for e in automate.etats if "initial" in e.type]
+    presents = set(ids)
+    arcs = sorted({(t.source.id, t.destination.id) for t in automate.transitions
+                   if t.source.id in presents and t.destination.id in presents})
+    return ids, initiaux, arcs
+
+
+def disposition_en_couches(ids, initiaux, arcs, passes: int = 4) -> Iterator[Positions]:
+    """Disposition en couches de gauche à droite (style Sugiyama, comme rankdir=LR).
+
+    Les couches sont les distances BFS depuis les états initiaux ; l'ordre dans
+    chaque couche est amélioré par passes successives de barycentres, et les
+    positions sont produites après chaque passe.
+    """
+    successeurs = defaultdict(list)
+    predecesseurs = defaultdict(list)
+    for src, dest in arcs:
+        if src != dest:
+            successeurs[src].append(dest)
+            predecesseurs[dest].append(src)
+
+    couche = {}
+    for depart in list(initiaux) + list(ids):
+        if depart in couche:
+            continue
+        couche[depart] = 0 if depart in initiaux else 1 + max((couche[p] for p in predecesseurs[depart] if p in couche), default=-1)
+        file = deque([depart])
+        while file:
+            e = file.popleft()
+            for s in successeurs[e]:
+                if s not in couche:
+                    couche[s] = couche[e] + 1
+                    file.append(s)
+
+    couches = defaultdict(list)
+    for e in ids:
+        couches[couche[e]].append(e)
+    niveaux = sorted(couches)
+    rang = {e: i for l in niveaux for i, e in enumerate(couches[l])}
+
+    def positions() -> Positions:
+        pos = {}
+        for l in niveaux:
+            n = len(couches[l])
+            for i, e in enumerate(couches[l]):
+                pos[e] = (l * ESPACEMENT_X, (i - (n - 1) / 2) * ESPACEMENT_Y)
+        return pos
+
+    yield positions()
+    for p in range(passes):
+        ordre = niveaux if p % 2 == 0 else list(reversed(niveaux))
+        voisins = predecesseurs if p % 2 == 0 else successeurs
+        for l in ordre[1:]:
+            def barycentre(e):
+                v = [rang[x] for x in voisins[e] if couche[x] != l]
+                return sum(v) / len(v) if v else rang[e]
+            couches[l].sort(key=barycentre)
+            for i, e in enumerate(couches[l]):
+                rang[e] = i
+        yield positions()
+
+
+def disposition_forces(ids, initiaux, arcs, iterations: int = 200, pas: int = 10,
+                       annulation: Optional[threading.Event] = None) -> Iterator[Positions]:
+    """Disposition par forces (Fruchterman-Reingold), itérations vectorisées avec NumPy.
+
+    Part de la disposition en couches et produit les positions toutes les `pas` itérations.
+    """
+    depart = None
+    for depart in disposition_en_couches(ids, initiaux, arcs):
+        pass
+    if np is None or len(ids) < 2 or len(ids) > LIMITE_FORCES:
+        yield depart
+        return
+
+    indice = {e: i for i, e in enumerate(ids)}
+    pos = np.array([depart[e] for e in ids], dtype=float)
+    pos += np.random.default_rng(0).uniform(-1, 1, pos.shape)
+    aretes = np.array([(indice[s], indice[d]) for s, d in arcs if s != d], dtype=int).reshape(-1, 2)
+    k = float(ESPACEMENT_Y)
+    temperature = ESPACEMENT_X / 2
+
+    for it in range(iterations):
+        if annulation is not None and annulation.is_set():
+            return
+        delta = pos[:, None, :] - pos[None, :, :]
+        distance = np.sqrt((delta ** 2).sum(axis=2))
+        np.fill_diagonal(distance, 1.0)
+        distance = np.maximum(distance, 0.01)
+        deplacement = (delta * (k * k / distance ** 2)[:, :, None]).sum(axis=1)
+
+        if len(aretes):
+            d = pos[aretes[:, 0]] - pos[aretes[:, 1]]
+            longueur = np.maximum(np.sqrt((d ** 2).sum(axis=1)), 0.01)
+            force = d * (longueur / k)[:, None]
+            np.add.at(deplacement, aretes[:, 0], -force)
+            np.add.at(deplacement, aretes[:, 1], force)
+
+        norme = np.maximum(np.sqrt((deplacement ** 2).sum(axis=1)), 0.01)
+        pos += deplacement / norme[:, None] * np.minimum(norme, temperature)[:, None]
+        temperature *= 0.98
+        if (it + 1) % pas == 0 or it == iterations - 1:
+            yield {e: (float(pos[i, 0]), float(pos[i, 1])) for i, e in enumerate(ids)}
+
+
+class MoteurDisposition:
+    """Calcule les dispositions dans un thread et les met en cache par empreinte d'automate.
+
+    Les résultats intermédiaires sont déposés dans une file que le thread Tk
+    consulte avec `recuperer()` ; le calcul ne bloque jamais la boucle Tk.
+    """
+
+    def __init__(self, dossier_cache: str = "automates/.dispositions"):
+        self.dossier_cache = Path(dossier_cache)
+        self._memoire: Dict[str, Positions] = {}
+        self._file: "queue.Queue[Tuple[str, Positions, bool]]" = queue.Queue()
+        self._annulation: Optional[threading.Event] = None
+
+    def methode_auto(self, nb_etats: int) -> str:
+        return "forces" if np is not None and nb_etats <= LIMITE_FORCES else "couches"
+
+    def en_cache(self, empreinte: str) -> Optional[Positions]:
+        if empreinte in self._memoire:
+            return self._memoire[empreinte]
+        try:
+            with open(self.dossier_cache / f"{empreinte}.json", "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        positions = {int(e): tuple(p) for e, p in data["positions"].items()}
+        self._memoire[empreinte] = positions
+        return positions
+
+    def _mettre_en_cache(self, empreinte: str, methode: str, positions: Positions):
+        self._memoire[empreinte] = positions
+        try:
+            self.dossier_cache.mkdir(parents=True, exist_ok=True)
+            temp = self.dossier_cache / f"{empreinte}.json.tmp"
+            with open(temp, "w") as f:
+                json.dump({"methode": methode, "positions": {str(e): list(p) for e, p in positions.items()}}, f)
+            os.replace(temp, self.dossier_cache / f"{empreinte}.json")
+        except OSError:
+            pass  # le cache disque est facultatif
+
+    def demarrer(self, automate, empreinte: str, methode: Optional[str] = None):
+        """Lance le calcul en arrière-plan ; annule le calcul précédent s'il tourne encore."""
+        self.annuler()
+        donnees = structure(automate)
+        methode = methode or self.methode_auto(len(donnees[0]))
+        annulation = threading.Event()
+        self._annulation = annulation
+
+        def travail():
+            dernier = None
+            try:
+                if methode == "forces":
+                    etapes = disposition_forces(*donnees, annulation=annulation)
+                else:
+                    etapes = disposition_en_couches(*donnees)
+                for dernier in etapes:
+                    if annulation.is_set():
+                        return
+                    self._file.put((empreinte, dernier, False))
+            except Exception:
+                return
+            if dernier is not None and not annulation.is_set():
+                self._mettre_en_cache(empreinte, methode, dernier)
+                self._file.put((empreinte, dernier, True))
+
+        threading.Thread(target=travail, daemon=True).start()
+
+    def annuler(self):
+        if self._annulation is not None:
+            self._annulation.set()
+            self._annulation = None
+
+    def recuperer(self) -> List[Tuple[str, Positions, bool]]:
+        """Résultats (empreinte, positions, terminé) arrivés depuis le dernier appel."""
+        resultats = []
+        while True:
+            try:
+                resultats.append(self._file.get_nowait())
+            except queue.Empty:
+                return resultats
@@ -0,0 +1,227 @@
+"""AFD figé : tables immuables en mémoire partagée, attachables par nom sans copie.
+
+Les tableaux CSR d'AutomateCompact (débuts, codes, destinations, finaux) sont
+écrits une seule fois dans un segment `multiprocessing.shared_memory` ou dans
+un fichier projeté en mémoire (mmap). Chaque processus s'y attache par son nom
+et lit directement le segment : N processus de travail partagent une seule
+copie des tables, et rien n'étant modifiable, les threads peuvent lire
+l'automate simultanément sans verrou.
+
+Un AutomateFige se sérialise (pickle) en son seul nom de segment ou chemin :
+l'envoyer à un ProcessPoolExecutor ne copie pas les tables.
+"""
+import mmap
+import os
+import struct
+import sys
+import threading
+from bisect import bisect_left
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional
+
+from classes.Automate import Automate
+from classes.compact import AutomateCompact
+
+MAGIQUE = b"AUTFIGE1"
+# Ordre des octets (détecte un fichier écrit sur une autre architecture), nb_etats, nb_transitions,
+# initial, longueur du nom en octets
+ENTETE = struct.Struct("=IIIII")
+ORDRE = 0x01020304
+
+_verrou = threading.Lock()
+_verrou_enregistrement = threading.Lock()
+# Segments déjà attachés dans ce processus (nom ou chemin -> automate), pour les objets reçus par pickle
+_attaches: Dict[str, 'AutomateFige'] = {}
+
+
+def _attacher_segment(nom: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=nom, track=False)
+    # Avant 3.13, s'attacher enregistre aussi le segment auprès du resource_tracker,
+    # qui le détruirait à la fin de ce processus (bpo-39959) : seul le créateur doit le faire.
+    # L'enregistrement n'est sauté que pour ce thread, le temps de construire l'objet ;
+    # les SharedMemory créés au même moment par d'autres threads restent suivis.
+    with _verrou_enregistrement:
+        enregistrer = resource_tracker.register
+        attacheur = threading.get_ident()
+
+        def filtrer(nom_ressource, type_ressource):
+            if threading.get_ident() != attacheur:
+                enregistrer(nom_ressource, type_ressource)
+
+        resource_tracker.register = filtrer
+        try:
+            return shared_memory.SharedMemory(name=nom)
+        finally:
+            resource_tracker.register = enregistrer
+
+
+def _taille(nom: bytes, nb_etats: int, nb_transitions: int) -> int:
+    return _debut_tables(nom) + 4 * (nb_etats + 1 + 2 * nb_transitions) + nb_etats
+
+
+def _debut_tables(nom: bytes) -> int:
+    # Tableaux d'entiers alignés sur 4 octets
+    return (len(MAGIQUE) + ENTETE.size + len(nom) + 3) // 4 * 4
+
+
+def _ecrire(tampon, compact: AutomateCompact):
+    nom = compact.nom.encode("utf-8")
+    tampon[:len(MAGIQUE)] = MAGIQUE
+    ENTETE.pack_into(tampon, len(MAGIQUE), ORDRE, compact.nb_etats, compact.nb_transitions, compact.initial,
+                     len(nom))
+    position = len(MAGIQUE) + ENTETE.size
+    tampon[position:position + len(nom)] = nom
+    position = _debut_tables(nom)
+    for tableau in (compact.debuts, compact.codes, compact.destinations):
+        octets = tableau.tobytes()
+        tampon[position:position + len(octets)] = octets
+        position += len(octets)
+    tampon[position:position + len(compact.finaux)] = compact.finaux
+
+
+class AutomateFige:
+    """AFD immuable dont les tables résident dans un segment partagé ou un fichier projeté.
+
+    Créer avec `Automate.figer()` (ou `creer`), s'attacher avec `attacher(nom)` ou
+    `ouvrir(chemin)`. Le créateur d'un segment le détruit avec `liberer()` ; les
+    autres processus appellent seulement `fermer()`.
+    """
+
+    def __init__(self, support, nom_memoire: Optional[str] = None, chemin: Optional[str] = None,
+                 proprietaire: bool = False):
+        self._support = support
+        self.nom_memoire = nom_memoire
+        self.chemin = chemin
+        self.proprietaire = proprietaire
+        tampon = memoryview(support.buf if isinstance(support, shared_memory.SharedMemory) else support)
+        if bytes(tampon[:len(MAGIQUE)]) != MAGIQUE:
+            tampon.release()
+            support.close()
+            raise ValueError(f"{nom_memoire or chemin} n'est pas un automate figé")
+        ordre, nb_etats, nb_transitions, self.initial, longueur = ENTETE.unpack_from(tampon, len(MAGIQUE))
+        if ordre != ORDRE:
+            tampon.release()
+            support.close()
+            raise ValueError("Automate figé sur une architecture d'un autre boutisme")
+        position = len(MAGIQUE) + ENTETE.size
+        nom = bytes(tampon[position:position + longueur])
+        self.nom = nom.decode("utf-8")
+        lecture = tampon.toreadonly()
+        position = _debut_tables(nom)
+        vues = [tampon, lecture]
+        tables = []
+        for longueur in (nb_etats + 1, nb_transitions, nb_transitions):
+            octets = lecture[position:position + 4 * longueur]
+            vues.append(octets)
+            tables.append(octets.cast("I"))
+            position += 4 * longueur
+        self.debuts, self.codes, self.destinations = tables
+        self.finaux = lecture[position:position + nb_etats]
+        # Toutes les vues doivent être relâchées avant de fermer le segment
+        self._vues = tables + [self.finaux] + vues[::-1]
+
+    @classmethod
+    def creer(cls, automate: Automate, nom_memoire: Optional[str] = None, controle=None) -> 'AutomateFige':
+        """Déterminise `automate` et copie ses tables dans un nouveau segment de mémoire partagée."""
+        compact = AutomateCompact.depuis_automate(automate.determiniser(controle))
+        nom = compact.nom.encode("utf-8")
+        segment = shared_memory.SharedMemory(name=nom_memoire, create=True,
+                                             size=_taille(nom, compact.nb_etats, compact.nb_transitions))
+        _ecrire(segment.buf, compact)
+        return cls(segment, nom_memoire=segment.name, proprietaire=True)
+
+    @classmethod
+    def attacher(cls, nom_memoire: str) -> 'AutomateFige':
+        """S'attache sans copie au segment créé par un autre processus (ou thread)."""
+        return cls(_attacher_segment(nom_memoire), nom_memoire=nom_memoire)
+
+    @staticmethod
+    def sauvegarder_fichier(automate: Automate, chemin, controle=None):
+        """Écrit les tables dans un fichier, à projeter ensuite avec `ouvrir` (par ex. dans /dev/shm)."""
+        compact = AutomateCompact.depuis_automate(automate.determiniser(controle))
+        contenu = bytearray(_taille(compact.nom.encode("utf-8"), compact.nb_etats, compact.nb_transitions))
+        _ecrire(contenu, compact)
+        with open(chemin, "wb") as f:
+            f.write(contenu)
+
+    @classmethod
+    def ouvrir(cls, chemin) -> 'AutomateFige':
+        """Projette un fichier écrit par `sauvegarder_fichier` en lecture seule : pages partagées par le noyau."""
+        with open(chemin, "rb") as f:
+            projection = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(projection, chemin=os.fspath(chemin))
+
+    @property
+    def nb_etats(self) -> int:
+        return len(self.finaux)
+
+    @property
+    def nb_transitions(self) -> int:
+        return len(self.destinations)
+
+    def taille_memoire(self) -> int:
+        """Octets des tables, partagés entre tous les processus attachés."""
+        return 4 * (len(self.debuts) + len(self.codes) + len(self.destinations)) + len(self.finaux)
+
+    def transition(self, etat: int, symbole: str) -> Optional[int]:
+        code = ord(symbole)
+        debut, fin = self.debuts[etat], self.debuts[etat + 1]
+        i = bisect_left(self.codes, code, debut, fin)
+        if i == fin or self.codes[i] != code:
+            return None
+        return self.destinations[i]
+
+    def reconnait_mot(self, mot: str) -> bool:
+        etat = self.initial
+        for symbole in mot:
+            etat = self.transition(etat, symbole)
+            if etat is None:
+                return False
+        return bool(self.finaux[etat])
+
+    __contains__ = reconnait_mot
+    # Mêmes noms de tables que la forme compacte
+    reconnait_mots = AutomateCompact.reconnait_mots
+
+    def fermer(self):
+        """Détache ce processus (le segment reste disponible pour les autres)."""
+        for vue in self._vues:
+            vue.release()
+        self._vues = []
+        self._support.close()
+
+    def liberer(self):
+        """Ferme puis détruit le segment ; réservé au processus qui l'a créé."""
+        self.fermer()
+        if self.proprietaire and self.nom_memoire is not None:
+            self._support.unlink()
+
+    def __del__(self):
+        # Les vues doivent disparaître avant le segment, sinon sa fermeture échoue (BufferError)
+        try:
+            self.fermer()
+        except Exception:
+            pass
+
+    def __enter__(self) -> 'AutomateFige':
+        return self
+
+    def __exit__(self, *exc):
+        self.liberer()
+
+    def __reduce__(self):
+        if self.nom_memoire is not None:
+            return _attacher_en_cache, (self.nom_memoire, False)
+        return _attacher_en_cache, (self.chemin, True)
+
+
+def _attacher_en_cache(cle: str, fichier: bool) -> AutomateFige:
+    """Reconstruction après pickle : une seule attache par processus et par segment."""
+    with _verrou:
+        fige = _attaches.get(cle)
+    if fige is None:
+        fige = AutomateFige.ouvrir(cle) if fichier else AutomateFige.attacher(cle)
+        with _verrou:
+            fige = _attaches.setdefault(cle, fige)
+    return fige
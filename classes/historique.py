@@ -0,0 +1,52 @@
+"""Historique annuler / rétablir fait d'instantanés d'automates (Automate.instantane, en O(1))."""
+from typing import List, Optional, Tuple
+
+from classes.Automate import Automate
+
+
+class Historique:
+    """Deux piles d'instantanés (libellé, automate) ; au-delà de `limite`, les plus anciens sont oubliés.
+
+    Les instantanés conservés ne sont jamais rendus tels quels : l'appelant reçoit
+    un nouvel instantané qu'il peut modifier sans altérer l'historique.
+    """
+
+    def __init__(self, limite: int = 100):
+        self.limite = limite
+        self._passe: List[Tuple[str, Automate]] = []
+        self._futur: List[Tuple[str, Automate]] = []
+
+    def enregistrer(self, automate: Optional[Automate], libelle: str):
+        """À appeler juste avant de modifier ou de remplacer `automate`."""
+        self._passe.append((libelle, automate.instantane() if automate is not None else None))
+        del self._passe[:-self.limite]
+        self._futur.clear()
+
+    def vider(self):
+        self._passe.clear()
+        self._futur.clear()
+
+    @property
+    def peut_annuler(self) -> bool:
+        return bool(self._passe)
+
+    @property
+    def peut_retablir(self) -> bool:
+        return bool(self._futur)
+
+    def libelle_annuler(self) -> Optional[str]:
+        return self._passe[-1][0] if self._passe else None
+
+    def libelle_retablir(self) -> Optional[str]:
+        return self._futur[-1][0] if self._futur else None
+
+    def annuler(self, courant: Optional[Automate]) -> Optional[Automate]:
+        """Automate d'avant la dernière opération ; `courant` passe dans les opérations à rétablir."""
+        libelle, precedent = self._passe.pop()
+        self._futur.append((libelle, courant.instantane() if courant is not None else None))
+        return precedent.instantane() if precedent is not None else None
+
+    def retablir(self, courant: Optional[Automate]) -> Optional[Automate]:
+        libelle, suivant = self._futur.pop()
+        self._passe.append((libelle, courant.instantane() if courant is not None else None))
+        return suivant.instantane() if suivant is not None else None
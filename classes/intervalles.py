@@ -0,0 +1,129 @@
+"""Ensembles de caractères représentés par des intervalles de points de code triés et disjoints."""
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Tuple
+
+MAX_CODE = 0x10FFFF
+
+
+class Intervalles:
+    """Ensemble immuable de points de code : ((début, fin), ...) inclusifs, triés, disjoints et non contigus."""
+
+    __slots__ = ("bornes", "_debuts")
+
+    def __init__(self, bornes: Iterable[Tuple[int, int]] = ()):
+        fusion: List[List[int]] = []
+        for debut, fin in sorted(bornes):
+            if fusion and debut <= fusion[-1][1] + 1:
+                fusion[-1][1] = max(fusion[-1][1], fin)
+            else:
+                fusion.append([debut, fin])
+        self.bornes = tuple((debut, fin) for debut, fin in fusion)
+        self._debuts = [debut for debut, _ in self.bornes]
+
+    @classmethod
+    def caractere(cls, c: str) -> 'Intervalles':
+        return cls([(ord(c), ord(c))])
+
+    @classmethod
+    def depuis_symboles(cls, symboles: Iterable[str]) -> 'Intervalles':
+        symboles = list(symboles)
+        if any(len(s) != 1 for s in symboles):
+            raise ValueError("Les intervalles ne contiennent que des symboles d'un caractère")
+        return cls((ord(s), ord(s)) for s in symboles)
+
+    @classmethod
+    def tout(cls) -> 'Intervalles':
+        return cls([(0, MAX_CODE)])
+
+    def __contains__(self, c) -> bool:
+        code = c if isinstance(c, int) else ord(c)
+        i = bisect_right(self._debuts, code) - 1
+        return i >= 0 and code <= self.bornes[i][1]
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return iter(self.bornes)
+
+    def __bool__(self) -> bool:
+        return bool(self.bornes)
+
+    def taille(self) -> int:
+        """Nombre de caractères."""
+        return sum(fin - debut + 1 for debut, fin in self.bornes)
+
+    def symboles(self) -> Iterator[str]:
+        for debut, fin in self.bornes:
+            for code in range(debut, fin + 1):
+                yield chr(code)
+
+    def __or__(self, autre: 'Intervalles') -> 'Intervalles':
+        return Intervalles(self.bornes + autre.bornes)
+
+    def complement(self) -> 'Intervalles':
+        bornes, suivant = [], 0
+        for debut, fin in self.bornes:
+            if debut > suivant:
+                bornes.append((suivant, debut - 1))
+            suivant = fin + 1
+        if suivant <= MAX_CODE:
+            bornes.append((suivant, MAX_CODE))
+        return Intervalles(bornes)
+
+    def __and__(self, autre: 'Intervalles') -> 'Intervalles':
+        bornes, i, j = [], 0, 0
+        while i < len(self.bornes) and j < len(autre.bornes):
+            debut = max(self.bornes[i][0], autre.bornes[j][0])
+            fin = min(self.bornes[i][1], autre.bornes[j][1])
+            if debut <= fin:
+                bornes.append((debut, fin))
+            if self.bornes[i][1] < autre.bornes[j][1]:
+                i += 1
+            else:
+                j += 1
+        return Intervalles(bornes)
+
+    def __sub__(self, autre: 'Intervalles') -> 'Intervalles':
+        return self & autre.complement()
+
+    def __eq__(self, autre) -> bool:
+        return isinstance(autre, Intervalles) and self.bornes == autre.bornes
+
+    def __hash__(self) -> int:
+        return hash(self.bornes)
+
+    def __str__(self) -> str:
+        def texte(code: int) -> str:
+            c = chr(code)
+            return c if c.isprintable() and c not in "\\]-^" else f"\\u{code:04x}"
+        if len(self.bornes) == 1 and self.bornes[0][0] == self.bornes[0][1]:
+            return texte(self.bornes[0][0])
+        return "[" + "".join(texte(d) if d == f else f"{texte(d)}-{texte(f)}" for d, f in self.bornes) + "]"
+
+    def __repr__(self) -> str:
+        return f"Intervalles({list(self.bornes)})"
+
+
+def minterms(etiquettes: List[Intervalles]) -> List[Tuple[int, int, frozenset]]:
+    """Découpe l'union des étiquettes en segments (début, fin, indices des étiquettes qui le contiennent).
+
+    Balayage des bornes : O(b log b) pour b bornes, plus la taille de la sortie.
+    """
+    evenements = []
+    for i, etiquette in enumerate(etiquettes):
+        for debut, fin in etiquette:
+            evenements.append((debut, 1, i))
+            evenements.append((fin + 1, -1, i))
+    evenements.sort()
+    segments = []
+    actifs = {}
+    k = 0
+    while k < len(evenements):
+        position = evenements[k][0]
+        while k < len(evenements) and evenements[k][0] == position:
+            _, sens, i = evenements[k]
+            actifs[i] = actifs.get(i, 0) + sens
+            if not actifs[i]:
+                del actifs[i]
+            k += 1
+        if actifs and k < len(evenements):
+            segments.append((position, evenements[k][0] - 1, frozenset(actifs)))
+    return segments
@@ -0,0 +1,116 @@
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from typing import Dict
+
+
+class RegistreMetriques:
+    """Registre des mesures par opération (temps, pic mémoire, compteurs), commun au processus.
+
+    Désactivé par défaut : une opération instrumentée ne coûte alors qu'un test
+    de booléen. Les compteurs s'ajoutent à l'opération en cours la plus interne
+    du thread courant. Le pic mémoire (tracemalloc) n'est relevé que pour les
+    opérations de premier niveau, car tracemalloc n'a qu'un seul pic global.
+    """
+
+    def __init__(self):
+        self.actif = False
+        self.memoire = False
+        self.operations: Dict[str, dict] = {}
+        self._verrou = threading.Lock()
+        self._local = threading.local()
+
+    def activer(self, memoire: bool = False):
+        self.memoire = memoire
+        self.actif = True
+
+    def desactiver(self):
+        self.actif = False
+        if self.memoire and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.memoire = False
+
+    def reinitialiser(self):
+        with self._verrou:
+            self.operations = {}
+
+    def _pile(self) -> list:
+        pile = getattr(self._local, "pile", None)
+        if pile is None:
+            pile = self._local.pile = []
+        return pile
+
+    def _entree(self, nom: str) -> dict:
+        entree = self.operations.get(nom)
+        if entree is None:
+            entree = self.operations[nom] = {"appels": 0, "secondes": 0.0, "pic_memoire": 0, "compteurs": {}}
+        return entree
+
+    def executer(self, nom: str, fonction, *args, **kwargs):
+        pile = self._pile()
+        compteurs = {}
+        pile.append(compteurs)
+        suivre_memoire = self.memoire and len(pile) == 1
+        if suivre_memoire:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        debut = time.perf_counter()
+        try:
+            return fonction(*args, **kwargs)
+        finally:
+            duree = time.perf_counter() - debut
+            pic = tracemalloc.get_traced_memory()[1] if suivre_memoire else 0
+            pile.pop()
+            with self._verrou:
+                entree = self._entree(nom)
+                entree["appels"] += 1
+                entree["secondes"] += duree
+                entree["pic_memoire"] = max(entree["pic_memoire"], pic)
+                for cle, valeur in compteurs.items():
+                    entree["compteurs"][cle] = entree["compteurs"].get(cle, 0) + valeur
+
+    def compter(self, nom: str, n: int = 1):
+        pile = self._pile()
+        if pile:
+            pile[-1][nom] = pile[-1].get(nom, 0) + n
+
+    def exporter(self) -> dict:
+        with self._verrou:
+            return json.loads(json.dumps(self.operations))
+
+    def fusionner(self, operations: dict):
+        """Ajoute les mesures exportées par un autre registre (par ex. d'un processus de travail)."""
+        with self._verrou:
+            for nom, autre in operations.items():
+                entree = self._entree(nom)
+                entree["appels"] += autre["appels"]
+                entree["secondes"] += autre["secondes"]
+                entree["pic_memoire"] = max(entree["pic_memoire"], autre["pic_memoire"])
+                for cle, valeur in autre["compteurs"].items():
+                    entree["compteurs"][cle] = entree["compteurs"].get(cle, 0) + valeur
+
+
+REGISTRE = RegistreMetriques()
+
+
+def mesure(nom: str = None):
+    """Décorateur : enregistre chaque appel dans REGISTRE quand il est actif."""
+    def decorateur(fonction):
+        nom_operation = nom or fonction.__name__
+
+        @functools.wraps(fonction)
+        def enveloppe(*args, **kwargs):
+            if not REGISTRE.actif:
+                return fonction(*args, **kwargs)
+            return REGISTRE.executer(nom_operation, fonction, *args, **kwargs)
+        return enveloppe
+    return decorateur
+
+
+def compter(nom: str, n: int = 1):
+    """Incrémente un compteur de l'opération en cours (sans effet si le registre est inactif)."""
+    if REGISTRE.actif:
+        REGISTRE.compter(nom, n)
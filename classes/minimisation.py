@@ -0,0 +1,145 @@
+"""AFD minimal d'un AFN : choix entre deux chaînes de traitement.
+
+  - classique : déterminisation puis minimisation de Hopcroft (minimiser_auto) ;
+  - Brzozowski : renverser, déterminiser, renverser, déterminiser. Le second
+    AFD est directement minimal ; on ne construit jamais l'AFD intermédiaire de
+    l'AFN, qui peut être exponentiellement plus grand que l'AFD minimal.
+
+Le modèle de coût lance, dans les deux sens, une construction des
+sous-ensembles interrompue après `budget` sous-ensembles. Celle qui se termine
+donne la taille exacte de l'AFD correspondant ; sinon on compare le nombre de
+sous-ensembles nouveaux par sous-ensemble traité.
+"""
+from typing import Dict, List, Tuple
+
+from classes.Automate import Automate
+from classes.metriques import compter
+
+METHODES = ("auto", "classique", "brzozowski")
+
+# Sous-ensembles explorés au plus par échantillon : max(BUDGET_MIN, FACTEUR_BUDGET × |Q|)
+BUDGET_MIN = 64
+FACTEUR_BUDGET = 4
+
+
+def _echantillon(automate: Automate, successeurs: Dict[int, Dict[str, List[int]]], initiaux,
+                 symboles: List[str], budget: int) -> Dict:
+    """Construction des sous-ensembles en largeur, arrêtée après `budget` sous-ensembles créés."""
+    depart = frozenset(automate.calculer_epsilon_fermeture(initiaux, successeurs))
+    vus = {depart}
+    file = [depart]
+    traites = 0
+    while traites < len(file) and len(vus) < budget:
+        courant = file[traites]
+        traites += 1
+        for symbole in symboles:
+            destinations = set()
+            for e in courant:
+                destinations.update(successeurs.get(e, {}).get(symbole, ()))
+            if not destinations:
+                continue
+            suivant = frozenset(automate.calculer_epsilon_fermeture(destinations, successeurs))
+            if suivant not in vus:
+                vus.add(suivant)
+                file.append(suivant)
+    return {"sous_ensembles": len(vus), "traites": traites, "termine": traites == len(file)}
+
+
+def statistiques(automate: Automate, budget: int = None) -> Dict:
+    """Nombre d'états, degré de non-déterminisme et échantillons avant / arrière."""
+    budget = budget or max(BUDGET_MIN, FACTEUR_BUDGET * len(automate.etats))
+    successeurs = automate._successeurs()
+    predecesseurs: Dict[int, Dict[str, List[int]]] = {}
+    for t in automate.transitions:
+        predecesseurs.setdefault(t.destination.id, {}).setdefault(t.alphabet.valeur, []).append(t.source.id)
+    paires = [len(d) for sortantes in successeurs.values() for s, d in sortantes.items() if s != "ε"]
+    symboles = [a.valeur for a in automate.alphabets if a.valeur != "ε"]
+    initiaux = [e.id for e in automate.etats if "initial" in e.type]
+    finaux = [e.id for e in automate.etats if "final" in e.type]
+    return {
+        "nb_etats": len(automate.etats),
+        "degre": round(sum(paires) / len(paires), 3) if paires else 0.0,
+        "epsilon": automate.contient_epsilon(),
+        "nb_initiaux": len(initiaux),
+        "budget": budget,
+        "avant": _echantillon(automate, successeurs, initiaux, symboles, budget),
+        "arriere": _echantillon(automate, predecesseurs, finaux, symboles, budget),
+    }
+
+
+def choisir(automate: Automate, budget: int = None) -> Dict:
+    """Rapport {"methode", "raison", "statistiques"} du modèle de coût."""
+    stats = statistiques(automate, budget)
+    avant, arriere = stats["avant"], stats["arriere"]
+    if stats["degre"] <= 1 and not stats["epsilon"] and stats["nb_initiaux"] <= 1:
+        methode, raison = "classique", "automate déjà déterministe"
+    elif avant["termine"]:
+        methode, raison = "classique", f"AFD de {avant['sous_ensembles']} états seulement"
+    elif arriere["termine"]:
+        methode, raison = "brzozowski", (f"AFD du miroir de {arriere['sous_ensembles']} états, "
+                                         f"AFD direct de plus de {avant['sous_ensembles']} états")
+    else:
+        croissance_avant = avant["sous_ensembles"] / max(avant["traites"], 1)
+        croissance_arriere = arriere["sous_ensembles"] / max(arriere["traites"], 1)
+        if croissance_arriere < croissance_avant:
+            methode = "brzozowski"
+        else:
+            methode = "classique"
+        raison = (f"croissance des sous-ensembles : {croissance_avant:.2f} avant, "
+                  f"{croissance_arriere:.2f} en arrière")
+    return {"methode": methode, "raison": raison, "statistiques": stats}
+
+
+def _determiniser_accessible(automate: Automate, controle=None) -> Automate:
+    """AFD réduit à ses états accessibles (determiniser rend l'automate tel quel s'il est déjà déterministe)."""
+    afd = automate.determiniser(controle)
+    if afd is not automate:
+        return afd  # la construction des sous-ensembles ne crée que des états accessibles
+    initiaux = [e.id for e in afd.etats if "initial" in e.type]
+    successeurs = {}
+    for t in afd.transitions:
+        successeurs.setdefault(t.source.id, []).append(t.destination.id)
+    accessibles = afd._parcours(initiaux, successeurs)
+    copie = afd.instantane()
+    copie.etats = [e for e in copie.etats if e.id in accessibles]
+    copie.transitions = [t for t in copie.transitions if t.source.id in accessibles]
+    return copie
+
+
+def brzozowski(automate: Automate, controle=None) -> Automate:
+    """det(miroir(det(miroir(A)))) : AFD minimal émondé, comme minimiser_auto."""
+    intermediaire = _determiniser_accessible(automate.renverser(), controle)
+    compter("etats_intermediaires", len(intermediaire.etats))
+    if not any("final" in e.type for e in intermediaire.etats):
+        # Langage vide : pas d'état utile, comme après emonder()
+        minimal = Automate(automate.nom)
+        minimal.alphabets = list(intermediaire.alphabets)
+    else:
+        minimal = _determiniser_accessible(intermediaire.renverser(), controle)
+    minimal.nom = f"{automate.nom}_minimal"
+    return minimal
+
+
+def classique(automate: Automate, controle=None) -> Automate:
+    afd = automate.determiniser(controle)
+    compter("etats_intermediaires", len(afd.etats))
+    minimal = afd.minimiser_auto(controle)
+    minimal.nom = f"{automate.nom}_minimal"
+    return minimal
+
+
+def minimiser(automate: Automate, methode: str = "auto", controle=None) -> Tuple[Automate, Dict]:
+    """(AFD minimal, rapport) ; le rapport indique la chaîne de traitement suivie et pourquoi."""
+    if methode not in METHODES:
+        raise ValueError(f"Méthode inconnue '{methode}' (attendu : {', '.join(METHODES)})")
+    if not any("initial" in e.type for e in automate.etats):
+        raise ValueError("Aucun état initial trouvé.")
+    if methode == "auto":
+        rapport = choisir(automate)
+    else:
+        rapport = {"methode": methode, "raison": "choix explicite"}
+    if rapport["methode"] == "brzozowski":
+        minimal = brzozowski(automate, controle)
+    else:
+        minimal = classique(automate, controle)
+    return minimal, rapport
@@ -0,0 +1,225 @@
+"""Construction des sous-ensembles répartie sur plusieurs processus.
+
+Chaque sous-ensemble d'états de l'AFN appartient à un fragment, choisi par
+son hash : le fragment k (un processus) calcule les successeurs des
+sous-ensembles qui lui appartiennent et tient la table d'internement de ces
+seuls sous-ensembles (sous-ensemble -> numéro d'état de l'AFD).
+
+Le parcours avance par niveaux. À chaque niveau :
+  1. chaque fragment développe ses nouveaux sous-ensembles et range leurs
+     successeurs par fragment propriétaire ;
+  2. chaque fragment reçoit les successeurs qu'il possède : déjà interné, un
+     successeur donne directement l'état destination ; sinon le fragment le
+     garde comme nouveau, avec sa première découverte (état source, rang du symbole) ;
+  3. le coordinateur trie les nouveaux sous-ensembles de tous les fragments
+     par première découverte et les numérote dans cet ordre.
+
+L'ordre de découverte ne dépend pas du découpage en fragments : la
+numérotation est celle du parcours en largeur séquentiel de `determiniser`,
+quel que soit le nombre de processus. Le coordinateur ne manipule pas les
+sous-ensembles (il relaie les successeurs déjà sérialisés) ; il ne garde que
+les transitions de l'AFD, assemblé à la fin en tableaux compacts (AutomateCompact).
+"""
+import multiprocessing
+import os
+import pickle
+from array import array
+from collections import deque
+from typing import Dict, FrozenSet, List, Tuple
+
+from classes.Automate import Automate
+from classes.compact import AutomateCompact
+from classes.metriques import compter
+
+
+def _fermeture(etats, successeurs) -> FrozenSet[int]:
+    fermeture = set(etats)
+    file = deque(etats)
+    while file:
+        for dest in successeurs.get(file.popleft(), {}).get("ε", ()):
+            if dest not in fermeture:
+                fermeture.add(dest)
+                file.append(dest)
+    return frozenset(fermeture)
+
+
+class _Fragment:
+    """Un fragment de la table d'internement, et le calcul des successeurs des sous-ensembles qu'il possède.
+
+    Les sous-ensembles nouveaux restent dans le fragment qui les a internés : seuls
+    leur première découverte et leur numéro transitent par le coordinateur.
+    """
+
+    def __init__(self, indice: int, nb_fragments: int, successeurs: Dict[int, Dict[str, List[int]]],
+                 symboles: List[str], finaux: FrozenSet[int]):
+        self.indice = indice
+        self.nb_fragments = nb_fragments
+        self.successeurs = successeurs
+        self.symboles = symboles
+        self.finaux = finaux
+        self.numeros: Dict[FrozenSet[int], int] = {}
+        self.nouveaux: List[FrozenSet[int]] = []
+
+    def developper(self, numeros: List[int]) -> List[List[Tuple[int, int, FrozenSet[int]]]]:
+        """Numérote les nouveaux sous-ensembles du niveau, puis renvoie leurs successeurs par fragment propriétaire."""
+        parts = [[] for _ in range(self.nb_fragments)]
+        for numero, sous_ensemble in zip(numeros, self.nouveaux):
+            self.numeros[sous_ensemble] = numero
+            for rang, symbole in enumerate(self.symboles):
+                destinations = set()
+                for e in sous_ensemble:
+                    destinations.update(self.successeurs.get(e, {}).get(symbole, ()))
+                if destinations:
+                    suivant = _fermeture(destinations, self.successeurs)
+                    parts[hash(suivant) % self.nb_fragments].append((numero, rang, suivant))
+        self.nouveaux = []
+        return parts
+
+    def interner(self, parts: List[List[Tuple[int, int, FrozenSet[int]]]]):
+        """Candidats (source, rang du symbole, sous-ensemble) reçus de tous les fragments.
+
+        Renvoie les transitions résolues (source, rang, destination), les nouveaux
+        sous-ensembles [(première découverte, final)] dans l'ordre local et les
+        transitions vers eux (source, rang, indice local).
+        """
+        resolues, en_attente = [], []
+        decouvertes: Dict[FrozenSet[int], int] = {}
+        nouveaux = []
+        for part in parts:
+            for source, rang, sous_ensemble in part:
+                numero = self.numeros.get(sous_ensemble)
+                if numero is not None:
+                    resolues.append((source, rang, numero))
+                    continue
+                indice = decouvertes.get(sous_ensemble)
+                if indice is None:
+                    indice = decouvertes[sous_ensemble] = len(self.nouveaux)
+                    self.nouveaux.append(sous_ensemble)
+                    nouveaux.append([(source, rang), not sous_ensemble.isdisjoint(self.finaux)])
+                elif (source, rang) < nouveaux[indice][0]:
+                    nouveaux[indice][0] = (source, rang)
+                en_attente.append((source, rang, indice))
+        return resolues, nouveaux, en_attente
+
+
+def _travailleur(connexion, indice, nb_fragments, successeurs, symboles, finaux):
+    """Boucle d'un processus fragment ; les candidats voyagent déjà sérialisés, sans repasser par le coordinateur."""
+    fragment = _Fragment(indice, nb_fragments, successeurs, symboles, finaux)
+    while True:
+        message = connexion.recv()
+        if message is None:
+            break
+        methode, argument = message
+        if methode == "developper":
+            connexion.send([pickle.dumps(part, pickle.HIGHEST_PROTOCOL) for part in fragment.developper(argument)])
+        else:
+            connexion.send(fragment.interner([pickle.loads(octets) for octets in argument]))
+    connexion.close()
+
+
+class _Fragments:
+    """Les fragments, dans ce processus (jobs = 1) ou un processus chacun ; appels groupés par niveau."""
+
+    def __init__(self, jobs: int, successeurs, symboles, finaux):
+        self.jobs = jobs
+        self.local = None
+        self.connexions = []
+        self.processus = []
+        if jobs == 1:
+            self.local = _Fragment(0, 1, successeurs, symboles, finaux)
+            return
+        for indice in range(jobs):
+            parent, enfant = multiprocessing.Pipe()
+            p = multiprocessing.Process(target=_travailleur,
+                                        args=(enfant, indice, jobs, successeurs, symboles, finaux), daemon=True)
+            p.start()
+            enfant.close()
+            self.connexions.append(parent)
+            self.processus.append(p)
+
+    def serialiser(self, part: list):
+        return part if self.local is not None else pickle.dumps(part, pickle.HIGHEST_PROTOCOL)
+
+    def appeler(self, methode: str, arguments: List) -> List:
+        """Appelle `methode` sur chaque fragment avec son argument ; tous les fragments travaillent en même temps."""
+        if self.local is not None:
+            return [getattr(self.local, methode)(arguments[0])]
+        for connexion, argument in zip(self.connexions, arguments):
+            connexion.send((methode, argument))
+        return [connexion.recv() for connexion in self.connexions]
+
+    def fermer(self):
+        for connexion in self.connexions:
+            try:
+                connexion.send(None)
+            except OSError:
+                pass
+            connexion.close()
+        for p in self.processus:
+            p.join(timeout=1)
+            if p.is_alive():
+                p.terminate()
+
+
+def determiniser_parallele(automate: Automate, jobs: int = None, controle=None) -> AutomateCompact:
+    """AFD des sous-ensembles accessibles, sous forme compacte, calculé par `jobs` processus.
+
+    Les états sont numérotés comme ceux de `determiniser` (état initial 0), quel que soit `jobs`.
+    """
+    symboles = list(dict.fromkeys(a.valeur for a in automate.alphabets if a.valeur != "ε"))
+    if any(len(s) != 1 for s in symboles):
+        raise ValueError("La forme compacte n'accepte que des symboles d'un caractère")
+    initiaux = {e.id for e in automate.etats if "initial" in e.type}
+    if not initiaux:
+        raise ValueError("Aucun état initial trouvé.")
+    jobs = jobs or os.cpu_count() or 1
+    successeurs = automate._successeurs()
+    finaux = frozenset(e.id for e in automate.etats if "final" in e.type)
+
+    depart = _fermeture(initiaux, successeurs)
+    # Par état de l'AFD : final ?, transitions [(rang du symbole, destination)]
+    est_final = bytearray()
+    sortantes: List[List[Tuple[int, int]]] = []
+    fragments = _Fragments(jobs, successeurs, symboles, finaux)
+    try:
+        # L'état initial est un candidat sans source, envoyé à son fragment
+        candidats = [[] for _ in range(jobs)]
+        candidats[hash(depart) % jobs].append(fragments.serialiser([(-1, 0, depart)]))
+        while True:
+            nouveaux, en_attente, nouveaux_parts = [], [], []
+            for indice, (resolues, nouveaux_part, attente_part) in enumerate(fragments.appeler("interner", candidats)):
+                for source, rang, destination in resolues:
+                    sortantes[source].append((rang, destination))
+                nouveaux.extend((decouverte, indice, local, final)
+                                for local, (decouverte, final) in enumerate(nouveaux_part))
+                en_attente.append(attente_part)
+                nouveaux_parts.append(nouveaux_part)
+            if not nouveaux:
+                break
+            # Ordre de première découverte, comme la file du parcours séquentiel
+            nouveaux.sort()
+            # numeros[fragment][indice local] : numéro global, dans l'ordre local attendu par developper
+            numeros = [[0] * len(part) for part in nouveaux_parts]
+            for _, indice, local, final in nouveaux:
+                numeros[indice][local] = len(est_final)
+                est_final.append(final)
+                sortantes.append([])
+            for indice, attente_part in enumerate(en_attente):
+                for source, rang, local in attente_part:
+                    if source >= 0:
+                        sortantes[source].append((rang, numeros[indice][local]))
+            if controle is not None:
+                controle.point(len(est_final), message=f"{len(est_final)} états créés, {len(nouveaux)} à développer")
+            parts = fragments.appeler("developper", numeros)
+            candidats = [[part[k] for part in parts] for k in range(jobs)]
+    finally:
+        fragments.fermer()
+
+    debuts, codes, destinations = array("I", [0]), array("I"), array("I")
+    for ligne in sortantes:
+        for code, destination in sorted((ord(symboles[rang]), d) for rang, d in ligne):
+            codes.append(code)
+            destinations.append(destination)
+        debuts.append(len(codes))
+    compter("sous_ensembles_crees", len(est_final))
+    return AutomateCompact(f"{automate.nom}_AFD", debuts, codes, destinations, est_final)
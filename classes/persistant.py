@@ -0,0 +1,195 @@
+"""Liste persistante : instantané en O(1), parties inchangées partagées entre versions.
+
+Vecteur en arbre de branchement 32 (à la Clojure) : les éléments sont rangés
+dans des feuilles de 32, les 32 derniers dans une queue à part. Chaque nœud
+porte l'« édition » de la liste qui l'a créé ; une liste ne modifie sur place
+que les nœuds de son édition courante et recopie les autres (au plus un
+chemin de la racine à une feuille, plus la queue).
+
+`instantane()` donne une nouvelle édition aux deux listes : tous les nœuds
+existants deviennent partagés et figés pour l'une comme pour l'autre. Ajouter
+ou remplacer un élément recopie ensuite O(log32 n) nœuds, une seule fois par
+chemin et par instantané.
+"""
+from itertools import chain
+from typing import Iterable, Iterator, List
+
+BITS = 5
+LARGEUR = 1 << BITS
+MASQUE = LARGEUR - 1
+
+
+class _Noeud:
+    __slots__ = ("edition", "enfants")
+
+    def __init__(self, edition, enfants: list):
+        self.edition = edition
+        self.enfants = enfants
+
+
+class ListePersistante:
+    """Séquence modifiable par ajout et remplacement, dont `instantane()` est immédiat."""
+
+    __slots__ = ("_taille", "_decalage", "_racine", "_queue", "_edition_queue", "_edition", "version")
+
+    def __init__(self, elements: Iterable = ()):
+        self._edition = object()
+        self._taille = 0
+        self._decalage = BITS
+        self._racine = _Noeud(self._edition, [])
+        self._queue: list = []
+        self._edition_queue = self._edition
+        # Incrémentée à chaque ajout ou remplacement : sert à invalider les index calculés sur la liste
+        self.version = 0
+        self.extend(elements)
+
+    def instantane(self) -> 'ListePersistante':
+        """Copie indépendante qui partage toute la structure ; les deux listes recopient avant de modifier."""
+        copie = ListePersistante.__new__(ListePersistante)
+        copie._taille = self._taille
+        copie._decalage = self._decalage
+        copie._racine = self._racine
+        copie._queue = self._queue
+        copie._edition = object()
+        copie._edition_queue = None
+        copie.version = 0
+        self._edition = object()
+        self._edition_queue = None
+        return copie
+
+    def _debut_queue(self) -> int:
+        return 0 if self._taille < LARGEUR else ((self._taille - 1) >> BITS) << BITS
+
+    def _modifiable(self, noeud: _Noeud) -> _Noeud:
+        if noeud.edition is self._edition:
+            return noeud
+        return _Noeud(self._edition, list(noeud.enfants))
+
+    def _queue_modifiable(self) -> list:
+        if self._edition_queue is not self._edition:
+            self._queue = list(self._queue)
+            self._edition_queue = self._edition
+        return self._queue
+
+    def append(self, element):
+        self.version += 1
+        if self._taille - self._debut_queue() < LARGEUR:
+            self._queue_modifiable().append(element)
+            self._taille += 1
+            return
+        # Queue pleine : elle devient une feuille de l'arbre (figée si elle est partagée avec un instantané)
+        feuille = _Noeud(self._edition_queue, self._queue)
+        if (self._taille >> BITS) > (1 << self._decalage):
+            self._racine = _Noeud(self._edition, [self._racine, self._chemin(self._decalage, feuille)])
+            self._decalage += BITS
+        else:
+            self._racine = self._pousser(self._decalage, self._racine, feuille)
+        self._queue = [element]
+        self._edition_queue = self._edition
+        self._taille += 1
+
+    def _chemin(self, niveau: int, noeud: _Noeud) -> _Noeud:
+        while niveau:
+            noeud = _Noeud(self._edition, [noeud])
+            niveau -= BITS
+        return noeud
+
+    def _pousser(self, niveau: int, parent: _Noeud, feuille: _Noeud) -> _Noeud:
+        resultat = self._modifiable(parent)
+        indice = ((self._taille - 1) >> niveau) & MASQUE
+        if niveau == BITS:
+            noeud = feuille
+        elif indice < len(parent.enfants):
+            noeud = self._pousser(niveau - BITS, parent.enfants[indice], feuille)
+        else:
+            noeud = self._chemin(niveau - BITS, feuille)
+        if indice < len(resultat.enfants):
+            resultat.enfants[indice] = noeud
+        else:
+            resultat.enfants.append(noeud)
+        return resultat
+
+    def extend(self, elements: Iterable):
+        for element in elements:
+            self.append(element)
+
+    def _indice(self, i: int) -> int:
+        if i < 0:
+            i += self._taille
+        if not 0 <= i < self._taille:
+            raise IndexError("indice hors de la liste")
+        return i
+
+    def _feuille(self, i: int) -> list:
+        if i >= self._debut_queue():
+            return self._queue
+        noeud = self._racine
+        niveau = self._decalage
+        while niveau:
+            noeud = noeud.enfants[(i >> niveau) & MASQUE]
+            niveau -= BITS
+        return noeud.enfants
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(self)[i]
+        i = self._indice(i)
+        return self._feuille(i)[i & MASQUE]
+
+    def __setitem__(self, i: int, element):
+        i = self._indice(i)
+        self.version += 1
+        if i >= self._debut_queue():
+            self._queue_modifiable()[i & MASQUE] = element
+        else:
+            self._racine = self._remplacer(self._decalage, self._racine, i, element)
+
+    def _remplacer(self, niveau: int, noeud: _Noeud, i: int, element) -> _Noeud:
+        resultat = self._modifiable(noeud)
+        if niveau == 0:
+            resultat.enfants[i & MASQUE] = element
+        else:
+            indice = (i >> niveau) & MASQUE
+            resultat.enfants[indice] = self._remplacer(niveau - BITS, noeud.enfants[indice], i, element)
+        return resultat
+
+    def _feuilles(self) -> List[list]:
+        feuilles = []
+
+        def parcourir(noeud: _Noeud, niveau: int):
+            if niveau == 0:
+                feuilles.append(noeud.enfants)
+            else:
+                for enfant in noeud.enfants:
+                    parcourir(enfant, niveau - BITS)
+
+        if self._taille > len(self._queue):
+            parcourir(self._racine, self._decalage)
+        feuilles.append(self._queue)
+        return feuilles
+
+    def __iter__(self) -> Iterator:
+        # Parcours en C : une liste de feuilles construite en O(n / 32)
+        return chain.from_iterable(self._feuilles())
+
+    def __len__(self) -> int:
+        return self._taille
+
+    def __bool__(self) -> bool:
+        return self._taille > 0
+
+    def __contains__(self, element) -> bool:
+        return any(element in feuille for feuille in self._feuilles())
+
+    def __eq__(self, autre) -> bool:
+        if isinstance(autre, (ListePersistante, list, tuple)):
+            return len(self) == len(autre) and all(a == b for a, b in zip(self, autre))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return ListePersistante, (list(self),)
+
+    def __repr__(self) -> str:
+        return f"ListePersistante({list(self)!r})"
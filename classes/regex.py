@@ -0,0 +1,316 @@
+"""Compilation d'expressions régulières en objets Automate.
+
+Syntaxe : concaténation, `|`, `*`, `+`, `?`, parenthèses, classes `[abc]`,
+`[a-z]`, `[^...]` et `.` (ces deux derniers demandent un alphabet explicite),
+`\\` pour échapper un caractère spécial, `ε` ou une branche vide pour le mot vide.
+En mode symbolique (classes.symbolique), les classes restent des intervalles.
+
+Deux constructions :
+  - Thompson : ε-AFN en O(n) états et transitions (n = taille de l'expression) ;
+  - Glushkov : automate des positions, sans ε, un état par symbole de l'expression
+    plus l'état initial. Son nombre de transitions peut être quadratique en n ;
+    la construction reste linéaire en la taille de l'automate produit.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from classes.Alphabet import Alphabet
+from classes.Automate import Automate
+from classes.Etat import Etat
+from classes.Transition import Transition
+from classes.intervalles import Intervalles
+
+METHODES = ("glushkov", "thompson")
+
+
+def analyser(expr: str, alphabet: Optional[Iterable[str]] = None, symbolique: bool = False):
+    """Arbre syntaxique de `expr`.
+
+    Nœuds : ("vide",), ("symboles", frozenset), ("concat", [..]), ("union", [..]),
+    ("etoile", n), ("plus", n), ("option", n). Lève ValueError si l'expression est invalide.
+    Si `symbolique`, les feuilles sont ("intervalles", Intervalles) : les classes
+    ne sont pas développées et `.` / `[^...]` portent sur tout Unicode sans alphabet.
+    """
+    try:
+        return _Analyseur(expr, alphabet, symbolique).analyser()
+    except RecursionError:
+        raise ValueError("Expression invalide : parenthèses imbriquées trop profondément") from None
+
+
+class _Analyseur:
+    """Descente récursive ; la profondeur ne dépend que de l'imbrication des parenthèses."""
+
+    def __init__(self, expr: str, alphabet: Optional[Iterable[str]], symbolique: bool = False):
+        self.expr = expr
+        self.i = 0
+        self.alphabet = frozenset(alphabet) if alphabet is not None else None
+        self.symbolique = symbolique
+
+    def erreur(self, message: str):
+        raise ValueError(f"Expression invalide à la position {self.i} : {message}")
+
+    def courant(self) -> Optional[str]:
+        return self.expr[self.i] if self.i < len(self.expr) else None
+
+    def analyser(self):
+        noeud = self.union()
+        if self.i < len(self.expr):
+            self.erreur(f"'{self.courant()}' inattendu")
+        return noeud
+
+    def union(self):
+        branches = [self.concat()]
+        while self.courant() == "|":
+            self.i += 1
+            branches.append(self.concat())
+        return branches[0] if len(branches) == 1 else ("union", branches)
+
+    def concat(self):
+        facteurs = []
+        while self.courant() is not None and self.courant() not in "|)":
+            facteurs.append(self.facteur())
+        facteurs = [f for f in facteurs if f != ("vide",)]
+        if not facteurs:
+            return ("vide",)
+        return facteurs[0] if len(facteurs) == 1 else ("concat", facteurs)
+
+    def facteur(self):
+        noeud = self.atome()
+        while self.courant() in ("*", "+", "?"):
+            operateur = {"*": "etoile", "+": "plus", "?": "option"}[self.courant()]
+            self.i += 1
+            if noeud == ("vide",):
+                continue
+            noeud = (operateur, noeud)
+        return noeud
+
+    def atome(self):
+        c = self.courant()
+        if c == "(":
+            self.i += 1
+            noeud = self.union()
+            if self.courant() != ")":
+                self.erreur("')' manquante")
+            self.i += 1
+            return noeud
+        if c == "[":
+            return self.feuille(self.classe())
+        if c == ".":
+            self.i += 1
+            return self.feuille(self.tout())
+        if c in ("*", "+", "?"):
+            self.erreur(f"'{c}' sans opérande")
+        if c == "ε":
+            self.i += 1
+            return ("vide",)
+        if c == "\\":
+            self.i += 1
+            if self.courant() is None:
+                self.erreur("'\\' en fin d'expression")
+        c = self.courant()
+        self.i += 1
+        return self.feuille(Intervalles.caractere(c) if self.symbolique else frozenset(c))
+
+    def feuille(self, ensemble):
+        return ("intervalles" if self.symbolique else "symboles", ensemble)
+
+    def tout(self):
+        if self.symbolique:
+            return Intervalles.tout() if self.alphabet is None else Intervalles.depuis_symboles(self.alphabet)
+        if self.alphabet is None:
+            self.erreur("'.' et '[^...]' demandent un alphabet explicite")
+        return self.alphabet
+
+    def classe(self):
+        self.i += 1
+        negation = self.courant() == "^"
+        if negation:
+            self.i += 1
+        bornes = []
+        premier = True
+        while self.courant() != "]" or premier:
+            if self.courant() is None:
+                self.erreur("']' manquant")
+            debut = self.caractere_classe()
+            if self.courant() == "-" and self.i + 1 < len(self.expr) and self.expr[self.i + 1] != "]":
+                self.i += 1
+                fin = self.caractere_classe()
+                if ord(fin) < ord(debut):
+                    self.erreur(f"intervalle {debut}-{fin} vide")
+                bornes.append((ord(debut), ord(fin)))
+            else:
+                bornes.append((ord(debut), ord(debut)))
+            premier = False
+        self.i += 1
+        if self.symbolique:
+            ensemble = Intervalles(bornes)
+        else:
+            ensemble = frozenset(chr(o) for debut, fin in bornes for o in range(debut, fin + 1))
+        if negation:
+            ensemble = self.tout() - ensemble
+        if not ensemble:
+            self.erreur("classe vide")
+        return ensemble
+
+    def caractere_classe(self) -> str:
+        if self.courant() == "\\":
+            self.i += 1
+            if self.courant() is None:
+                self.erreur("'\\' en fin d'expression")
+        c = self.courant()
+        self.i += 1
+        return c
+
+
+def _symboles(noeud, ordre: Dict[str, None]):
+    """Symboles de l'arbre dans l'ordre d'apparition (classes triées)."""
+    pile = [noeud]
+    while pile:
+        n = pile.pop()
+        if n[0] == "symboles":
+            for s in sorted(n[1]):
+                ordre.setdefault(s, None)
+        elif n[0] in ("concat", "union"):
+            pile.extend(reversed(n[1]))
+        elif n[0] != "vide":
+            pile.append(n[1])
+
+
+def _construire(nom: str, symboles: List[str], nb_etats: int, initial: int, finaux: Set[int],
+                transitions: Iterable[Tuple[int, str, int]], labels: List[str]) -> Automate:
+    automate = Automate(nom)
+    alphabets = {}
+    for i, s in enumerate(symboles):
+        alphabets[s] = Alphabet(i + 1, s)
+        automate.ajouter_alphabet(alphabets[s])
+    etats = []
+    for i in range(nb_etats):
+        type_etat = []
+        if i == initial:
+            type_etat.append("initial")
+        if i in finaux:
+            type_etat.append("final")
+        etats.append(Etat(i, labels[i], "_".join(type_etat) or "normal"))
+    # Ids neufs 0..n-1 : ajout direct sans vérification d'unicité
+    automate.etats = etats
+    for source, symbole, destination in transitions:
+        automate.ajouter_transition(Transition(len(automate.transitions) + 1, etats[source], etats[destination],
+                                               alphabets[symbole]))
+    return automate
+
+
+def thompson(noeud, nom: str, symboles: List[str]) -> Automate:
+    """ε-AFN de Thompson : au plus deux états et quatre transitions par nœud."""
+    transitions = []
+    nb = [0]
+
+    def nouvel_etat() -> int:
+        nb[0] += 1
+        return nb[0] - 1
+
+    def fragment(n) -> Tuple[int, int]:
+        debut, fin = nouvel_etat(), nouvel_etat()
+        genre = n[0]
+        if genre == "vide":
+            transitions.append((debut, "ε", fin))
+        elif genre == "symboles":
+            transitions.extend((debut, s, fin) for s in sorted(n[1]))
+        elif genre == "concat":
+            precedent = debut
+            for enfant in n[1]:
+                d, f = fragment(enfant)
+                transitions.append((precedent, "ε", d))
+                precedent = f
+            transitions.append((precedent, "ε", fin))
+        elif genre == "union":
+            for enfant in n[1]:
+                d, f = fragment(enfant)
+                transitions.append((debut, "ε", d))
+                transitions.append((f, "ε", fin))
+        else:
+            d, f = fragment(n[1])
+            transitions.append((debut, "ε", d))
+            transitions.append((f, "ε", fin))
+            if genre in ("etoile", "plus"):
+                transitions.append((f, "ε", d))
+            if genre in ("etoile", "option"):
+                transitions.append((debut, "ε", fin))
+        return debut, fin
+
+    debut, fin = fragment(noeud)
+    if any(s == "ε" for _, s, _ in transitions):
+        symboles = symboles + ["ε"]
+    return _construire(nom, symboles, nb[0], debut, {fin}, transitions, [f"q{i}" for i in range(nb[0])])
+
+
+def positions(noeud) -> Tuple[list, List[Dict[int, None]], Set[int]]:
+    """(étiquette de chaque position, positions suivantes, positions finales) ; la position 0 est initiale.
+
+    Les étiquettes sont celles des feuilles ("symboles" ou "intervalles") telles quelles.
+    """
+    etiquettes = [None]
+    suivants: List[Dict[int, None]] = [{}]
+
+    def relier(depuis: Iterable[int], vers: Iterable[int]):
+        for p in depuis:
+            for q in vers:
+                suivants[p][q] = None
+
+    def calculer(n) -> Tuple[bool, List[int], List[int]]:
+        """(annulable, premières positions, dernières positions) ; remplit `suivants`."""
+        genre = n[0]
+        if genre == "vide":
+            return True, [], []
+        if genre in ("symboles", "intervalles"):
+            etiquettes.append(n[1])
+            suivants.append({})
+            p = len(etiquettes) - 1
+            return False, [p], [p]
+        if genre == "concat":
+            annulable, premiers, derniers = True, [], []
+            for enfant in n[1]:
+                a, p, d = calculer(enfant)
+                relier(derniers, p)
+                if annulable:
+                    premiers = premiers + p
+                derniers = derniers + d if a else d
+                annulable = annulable and a
+            return annulable, premiers, derniers
+        if genre == "union":
+            annulable, premiers, derniers = False, [], []
+            for enfant in n[1]:
+                a, p, d = calculer(enfant)
+                annulable = annulable or a
+                premiers += p
+                derniers += d
+            return annulable, premiers, derniers
+        a, p, d = calculer(n[1])
+        if genre in ("etoile", "plus"):
+            relier(d, p)
+        return a or genre != "plus", p, d
+
+    annulable, premiers, derniers = calculer(noeud)
+    relier([0], premiers)
+    return etiquettes, suivants, set(derniers) | ({0} if annulable else set())
+
+
+def glushkov(noeud, nom: str, symboles: List[str]) -> Automate:
+    """Automate des positions : état 0 initial, un état par occurrence de symbole."""
+    etiquettes, suivants, finaux = positions(noeud)
+    transitions = ((p, s, q) for p in range(len(etiquettes)) for q in suivants[p] for s in sorted(etiquettes[q]))
+    return _construire(nom, symboles, len(etiquettes), 0, finaux, transitions,
+                       [f"p{i}" for i in range(len(etiquettes))])
+
+
+def compiler(expr: str, methode: str = "glushkov", nom: Optional[str] = None,
+             alphabet: Optional[Iterable[str]] = None) -> Automate:
+    """Automate reconnaissant `expr` ; `alphabet` complète les symboles de l'expression."""
+    if methode not in METHODES:
+        raise ValueError(f"Méthode inconnue '{methode}' (attendu : {', '.join(METHODES)})")
+    alphabet = list(alphabet) if alphabet is not None else None
+    noeud = analyser(expr, alphabet)
+    ordre: Dict[str, None] = {}
+    _symboles(noeud, ordre)
+    for s in alphabet or ():
+        ordre.setdefault(s, None)
+    construction = glushkov if methode == "glushkov" else thompson
+    return construction(noeud, nom or "regex", list(ordre))
@@ -0,0 +1,539 @@
+import math
+import tkinter as tk
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from classes.disposition import MoteurDisposition
+
+
+class IndexSpatial:
+    """Grille hiérarchique des positions des états.
+
+    Le niveau 0 range chaque état dans une cellule de `taille_cellule` unités ;
+    le niveau k regroupe des cellules 2^k fois plus grandes, avec le nombre
+    d'états, leur barycentre et le nombre d'arcs entre cellules. Les niveaux
+    agrégés sont construits à la demande.
+    """
+
+    def __init__(self, positions: Dict[int, Tuple[float, float]], arcs: Iterable[Tuple[int, int]], taille_cellule: float):
+        self.positions = positions
+        self.arcs = list(arcs)
+        self.taille = taille_cellule
+        self.cellules: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for etat_id, (x, y) in positions.items():
+            self.cellules[self._cellule(x, y, taille_cellule)].append(etat_id)
+        self._niveaux: Dict[int, tuple] = {}
+
+    @staticmethod
+    def _cellule(x, y, taille):
+        return math.floor(x / taille), math.floor(y / taille)
+
+    def taille_niveau(self, niveau: int) -> float:
+        return self.taille * (2 ** niveau)
+
+    def _dans(self, cellules: dict, taille: float, rect):
+        """Cellules non vides intersectant rect = (xmin, ymin, xmax, ymax)."""
+        cx0, cy0 = self._cellule(rect[0], rect[1], taille)
+        cx1, cy1 = self._cellule(rect[2], rect[3], taille)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(cellules):
+            for (cx, cy), contenu in cellules.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    yield (cx, cy), contenu
+        else:
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    contenu = cellules.get((cx, cy))
+                    if contenu is not None:
+                        yield (cx, cy), contenu
+
+    def etats_dans(self, rect) -> List[int]:
+        xmin, ymin, xmax, ymax = rect
+        resultat = []
+        for _, ids in self._dans(self.cellules, self.taille, rect):
+            for etat_id in ids:
+                x, y = self.positions[etat_id]
+                if xmin <= x <= xmax and ymin <= y <= ymax:
+                    resultat.append(etat_id)
+        return resultat
+
+    def niveau(self, niveau: int):
+        if niveau not in self._niveaux:
+            taille = self.taille_niveau(niveau)
+            cellules = {}
+            cellule_de = {}
+            for etat_id, (x, y) in self.positions.items():
+                c = self._cellule(x, y, taille)
+                cellule_de[etat_id] = c
+                agregat = cellules.get(c)
+                if agregat is None:
+                    cellules[c] = [1, x, y]
+                else:
+                    agregat[0] += 1
+                    agregat[1] += x
+                    agregat[2] += y
+            liens = defaultdict(lambda: defaultdict(int))
+            for src, dest in self.arcs:
+                c1, c2 = cellule_de[src], cellule_de[dest]
+                if c1 != c2:
+                    liens[c1][c2] += 1
+            self._niveaux[niveau] = (cellules, liens)
+        return self._niveaux[niveau]
+
+    def agregats_dans(self, niveau: int, rect):
+        """Liste de (cellule, nombre d'états, x moyen, y moyen) pour le niveau donné."""
+        cellules, _ = self.niveau(niveau)
+        return [(c, n, sx / n, sy / n) for c, (n, sx, sy) in self._dans(cellules, self.taille_niveau(niveau), rect)]
+
+    def liens(self, niveau: int, cellule) -> Dict[Tuple[int, int], int]:
+        return self.niveau(niveau)[1].get(cellule, {})
+
+
+class RenduAutomate:
+    """Dessin incrémental et virtualisé d'un automate sur un canvas Tk.
+
+    Les positions des états sont exprimées en coordonnées « monde » ; la vue
+    (échelle + décalage) se règle à la molette et par glisser-déposer. Seuls les
+    items dans la zone visible existent sur le canvas ; ils sont conservés d'un
+    rendu à l'autre et déplacés avec canvas.coords. Les positions viennent du
+    MoteurDisposition (calcul en arrière-plan, résultats progressifs, cache par
+    empreinte) ; en attendant, une disposition provisoire est affichée. Selon
+    l'échelle, on dessine :
+    - "complet" : états, libellés, boucles et étiquettes des arcs ;
+    - "simple"  : états et arcs seulement ;
+    - "agrege"  : un disque par cellule de la grille et un trait par faisceau d'arcs.
+    """
+
+    RAYON_ETAT = 30
+    DELAI_REDIMENSION = 50  # ms entre deux repositionnements pendant un redimensionnement
+    DELAI_INTERACTION = 16  # ms, soit ~60 images/s pendant un zoom ou un déplacement
+    SEUIL_DETAILS = 0.5
+    SEUIL_AGREGATION = 0.15
+    PIXELS_AGREGAT = 40
+    ECHELLE_MIN = 1e-4
+    ECHELLE_MAX = 4.0
+    DELAI_DISPOSITION = 40  # ms entre deux consultations des résultats de disposition
+
+    def __init__(self, canvas: tk.Canvas, colors: dict, moteur: Optional[MoteurDisposition] = None):
+        self.canvas = canvas
+        self.colors = colors
+        self.automate = None
+        self.moteur = moteur or MoteurDisposition()
+        self.empreinte = None
+        self._attente_disposition: Optional[str] = None
+
+        # Modèle déduit de l'automate
+        self.etats = {}
+        self.arcs: Dict[Tuple[int, int], str] = {}
+        self.adjacence: Dict[int, set] = {}
+        self.positions: Dict[int, Tuple[float, float, float]] = {}
+        self.index: Optional[IndexSpatial] = None
+        self.limites = (0, 0, 0, 0)
+
+        # Vue : écran = monde * echelle + decalage
+        self.echelle = 1.0
+        self.decalage_x = 0.0
+        self.decalage_y = 0.0
+        self.ajuste = True  # la vue suit la taille du canvas tant que l'utilisateur n'a pas zoomé
+        self.niveau_detail = None
+
+        self.items_etats: Dict[int, dict] = {}
+        self.items_arcs: Dict[Tuple[int, int], dict] = {}
+        self.items_agregats: Dict[tuple, int] = {}
+
+        self._structure_sale = False
+        self._rendu_planifie = False
+        self._vue_planifiee: Optional[str] = None
+        self._dernier_clic = None
+
+        canvas.bind("<ButtonPress-1>", self._debut_deplacement)
+        canvas.bind("<B1-Motion>", self._deplacement)
+        canvas.bind("<Double-Button-1>", self.ajuster_vue)
+        canvas.bind("<MouseWheel>", self._molette)
+        canvas.bind("<Button-4>", self._molette)
+        canvas.bind("<Button-5>", self._molette)
+
+    # --- Planification -------------------------------------------------
+
+    def afficher(self, automate):
+        """Affiche `automate` (ou le même automate modifié) au prochain passage idle."""
+        if automate is not self.automate:
+            self.vider()
+            self.automate = automate
+            self.ajuste = True
+            self.empreinte = None
+            self.positions = {}
+            self.moteur.annuler()
+        self.planifier()
+
+    def vider(self):
+        self.canvas.delete("all")
+        self.items_etats.clear()
+        self.items_arcs.clear()
+        self.items_agregats.clear()
+
+    def planifier(self):
+        """Marque l'automate comme modifié ; plusieurs appels ne donnent qu'un rendu."""
+        self._structure_sale = True
+        if not self._rendu_planifie:
+            self._rendu_planifie = True
+            self.canvas.after_idle(self._rendre)
+
+    def _planifier_vue(self, delai: int):
+        """Resynchronise la zone visible au plus une fois par `delai` ms."""
+        if self._vue_planifiee is None:
+            self._vue_planifiee = self.canvas.after(delai, self._apres_changement_vue)
+
+    def redimensionner(self, event=None):
+        self._planifier_vue(self.DELAI_REDIMENSION)
+
+    def _apres_changement_vue(self):
+        self._vue_planifiee = None
+        if self.automate and not self._structure_sale:
+            self._synchroniser_vue()
+
+    def _rendre(self):
+        self._rendu_planifie = False
+        if not self._structure_sale:
+            return
+        self._structure_sale = False
+        if not self.automate:
+            self.vider()
+            return
+        self._reconstruire_modele()
+        self._synchroniser_vue()
+
+    # --- Modèle ---------------------------------------------------------
+
+    def _reconstruire_modele(self):
+        self.etats = {e.id: e for e in self.automate.etats}
+        transitions_grouped = {}
+        for t in self.automate.transitions:
+            transitions_grouped.setdefault((t.source.id, t.destination.id), []).append(t.alphabet.valeur)
+        self.arcs = {cle: ', '.join(symbols) for cle, symbols in transitions_grouped.items()
+                     if cle[0] in self.etats and cle[1] in self.etats}
+        self.adjacence = defaultdict(set)
+        for src_id, dest_id in self.arcs:
+            self.adjacence[src_id].add((src_id, dest_id))
+            self.adjacence[dest_id].add((src_id, dest_id))
+
+        empreinte = self.automate.empreinte()
+        if empreinte != self.empreinte:
+            self.empreinte = empreinte
+            en_cache = self.moteur.en_cache(empreinte)
+            if en_cache is not None:
+                self.positions = {e: (x, y, 0.0) for e, (x, y) in en_cache.items()}
+            else:
+                self.positions = self._positions_provisoires()
+                self.moteur.demarrer(self.automate, empreinte)
+                self._attendre_disposition()
+        self._completer_positions()
+        self._indexer()
+
+        # Retirer les items des états et arcs supprimés ou modifiés
+        for etat_id in list(self.items_etats):
+            etat = self.etats.get(etat_id)
+            if etat is None or self.items_etats[etat_id]["signature"] != (etat.label, etat.type):
+                self._supprimer_items(self.items_etats.pop(etat_id))
+        for cle in list(self.items_arcs):
+            label = self.arcs.get(cle)
+            if label is None:
+                self._supprimer_items(self.items_arcs.pop(cle))
+            elif self.items_arcs[cle]["label"] != label:
+                items = self.items_arcs[cle]
+                if "texte" in items:
+                    self.canvas.itemconfigure(items["texte"], text=label)
+                items["label"] = label
+        for item in self.items_agregats.values():
+            self.canvas.delete(item)
+        self.items_agregats.clear()
+
+    def _positions_provisoires(self):
+        """Positions affichées pendant le calcul de la disposition.
+
+        Après une modification, les états déjà placés gardent leur position ;
+        sinon on part d'une disposition circulaire.
+        """
+        anciennes = {e: p for e, p in self.positions.items() if e in self.etats}
+        if anciennes:
+            return anciennes
+        return self._disposition_circulaire()
+
+    def _completer_positions(self):
+        """Place les états sans position dans une colonne à droite des autres."""
+        manquants = [e.id for e in self.automate.etats if e.id not in self.positions]
+        if not manquants:
+            return
+        x = max((p[0] for p in self.positions.values()), default=0) + 2 * self.RAYON_ETAT + 100
+        for i, etat_id in enumerate(manquants):
+            self.positions[etat_id] = (x, i * (2 * self.RAYON_ETAT + 20), 0.0)
+
+    def _attendre_disposition(self):
+        if self._attente_disposition is None:
+            self._attente_disposition = self.canvas.after(self.DELAI_DISPOSITION, self._recevoir_disposition)
+
+    def _recevoir_disposition(self):
+        """Applique les résultats intermédiaires ou finaux du moteur de disposition."""
+        self._attente_disposition = None
+        termine = False
+        dernier = None
+        for empreinte, positions, fini in self.moteur.recuperer():
+            if empreinte == self.empreinte:
+                dernier = positions
+                termine = termine or fini
+        if dernier is not None and self.automate:
+            self.positions = {e: (x, y, 0.0) for e, (x, y) in dernier.items()}
+            self._completer_positions()
+            self._indexer()
+            for item in self.items_agregats.values():
+                self.canvas.delete(item)
+            self.items_agregats.clear()
+            if not self._structure_sale:
+                self._synchroniser_vue()
+        if not termine and self.automate:
+            self._attendre_disposition()
+
+    def _disposition_circulaire(self):
+        """Disposition circulaire en coordonnées monde : (x, y, angle) pour chaque état.
+
+        Le rayon croît avec le nombre d'états pour qu'ils ne se chevauchent pas.
+        """
+        num_etats = len(self.automate.etats)
+        layout_radius = max(150.0, num_etats * (2 * self.RAYON_ETAT + 20) / (2 * math.pi))
+        positions = {}
+        for i, etat in enumerate(self.automate.etats):
+            angle = (2 * math.pi / num_etats) * i if num_etats > 1 else 0
+            positions[etat.id] = (layout_radius * math.cos(angle), layout_radius * math.sin(angle), angle)
+        return positions
+
+    def _indexer(self):
+        """Reconstruit l'index spatial et les limites à partir de self.positions."""
+        xy = {etat_id: (x, y) for etat_id, (x, y, _) in self.positions.items() if etat_id in self.etats}
+        self.index = IndexSpatial(xy, self.arcs, 4 * self.RAYON_ETAT)
+        if xy:
+            xs = [p[0] for p in xy.values()]
+            ys = [p[1] for p in xy.values()]
+            self.limites = (min(xs), min(ys), max(xs), max(ys))
+        else:
+            self.limites = (0, 0, 0, 0)
+
+    # --- Vue ------------------------------------------------------------
+
+    def ajuster_vue(self, event=None):
+        """Recadre la vue pour montrer tout l'automate (double-clic)."""
+        self.ajuste = True
+        self._planifier_vue(self.DELAI_INTERACTION)
+
+    def _cadrer(self):
+        largeur = max(self.canvas.winfo_width(), 1)
+        hauteur = max(self.canvas.winfo_height(), 1)
+        xmin, ymin, xmax, ymax = self.limites
+        marge = 2 * self.RAYON_ETAT + 20
+        largeur_monde = xmax - xmin + 2 * marge
+        hauteur_monde = ymax - ymin + 2 * marge
+        self.echelle = max(self.ECHELLE_MIN, min(1.0, largeur / largeur_monde, hauteur / hauteur_monde))
+        self.decalage_x = largeur / 2 - (xmin + xmax) / 2 * self.echelle
+        self.decalage_y = hauteur / 2 - (ymin + ymax) / 2 * self.echelle
+
+    def _rectangle_visible(self, marge: float = 0.0):
+        e = self.echelle
+        return ((-self.decalage_x) / e - marge,
+                (-self.decalage_y) / e - marge,
+                (self.canvas.winfo_width() - self.decalage_x) / e + marge,
+                (self.canvas.winfo_height() - self.decalage_y) / e + marge)
+
+    def _ecran(self, x, y):
+        return x * self.echelle + self.decalage_x, y * self.echelle + self.decalage_y
+
+    def _debut_deplacement(self, event):
+        self._dernier_clic = (event.x, event.y)
+
+    def _deplacement(self, event):
+        if self._dernier_clic is None:
+            return
+        dx = event.x - self._dernier_clic[0]
+        dy = event.y - self._dernier_clic[1]
+        self._dernier_clic = (event.x, event.y)
+        self.decalage_x += dx
+        self.decalage_y += dy
+        self.ajuste = False
+        # Déplacement immédiat des items existants, la zone visible est resynchronisée ensuite
+        self.canvas.move("all", dx, dy)
+        self._planifier_vue(self.DELAI_INTERACTION)
+
+    def _molette(self, event):
+        if getattr(event, "num", None) == 5 or getattr(event, "delta", 0) < 0:
+            facteur = 1 / 1.2
+        else:
+            facteur = 1.2
+        nouvelle = min(self.ECHELLE_MAX, max(self.ECHELLE_MIN, self.echelle * facteur))
+        facteur = nouvelle / self.echelle
+        if facteur == 1:
+            return
+        self.echelle = nouvelle
+        self.decalage_x = event.x - (event.x - self.decalage_x) * facteur
+        self.decalage_y = event.y - (event.y - self.decalage_y) * facteur
+        self.ajuste = False
+        self.canvas.scale("all", event.x, event.y, facteur, facteur)
+        self._planifier_vue(self.DELAI_INTERACTION)
+
+    def _synchroniser_vue(self):
+        """Crée, supprime et déplace les items pour correspondre à la zone visible."""
+        if self.ajuste:
+            self._cadrer()
+        if self.echelle < self.SEUIL_AGREGATION:
+            niveau = "agrege"
+        elif self.echelle < self.SEUIL_DETAILS:
+            niveau = "simple"
+        else:
+            niveau = "complet"
+        if niveau != self.niveau_detail:
+            self.vider()
+            self.niveau_detail = niveau
+
+        if niveau == "agrege":
+            self._synchroniser_agregats()
+        else:
+            self._synchroniser_details(niveau == "complet")
+
+    # --- Niveau détaillé -----------------------------------------------
+
+    def _synchroniser_details(self, complet: bool):
+        visibles = set(self.index.etats_dans(self._rectangle_visible(2 * self.RAYON_ETAT)))
+
+        for etat_id in list(self.items_etats):
+            if etat_id not in visibles:
+                self._supprimer_items(self.items_etats.pop(etat_id))
+        for etat_id in visibles:
+            if etat_id not in self.items_etats:
+                self.items_etats[etat_id] = self._creer_etat(self.etats[etat_id], complet)
+            self._placer_etat(etat_id, self.items_etats[etat_id])
+
+        arcs_visibles = set()
+        for etat_id in visibles:
+            for cle in self.adjacence.get(etat_id, ()):
+                if complet or cle[0] != cle[1]:
+                    arcs_visibles.add(cle)
+        for cle in list(self.items_arcs):
+            if cle not in arcs_visibles:
+                self._supprimer_items(self.items_arcs.pop(cle))
+        for cle in arcs_visibles:
+            if cle not in self.items_arcs:
+                self.items_arcs[cle] = self._creer_arc(cle, complet)
+            self._placer_arc(cle, self.items_arcs[cle])
+
+    def _creer_etat(self, etat, complet: bool) -> dict:
+        outline_color = self.colors["primary"] if "initial" in etat.type else self.colors["text"]
+        fill_color = self.colors["secondary"] if "final" not in etat.type else self.colors["final_state_bg"]
+        items = {
+            "signature": (etat.label, etat.type),
+            "cercle": self.canvas.create_oval(0, 0, 0, 0, outline=outline_color, fill=fill_color, width=2),
+        }
+        if complet:
+            items["texte"] = self.canvas.create_text(0, 0, text=etat.label, font=('Arial', 10, 'bold'), fill=self.colors["text"])
+        if "initial" in etat.type:
+            items["fleche"] = self.canvas.create_line(0, 0, 0, 0, arrow=tk.LAST, width=2, fill=self.colors["primary"])
+        if complet and "final" in etat.type:
+            items["interieur"] = self.canvas.create_oval(0, 0, 0, 0, outline=self.colors["text"], width=2)
+        return items
+
+    def _creer_arc(self, cle, complet: bool) -> dict:
+        label = self.arcs[cle]
+        if cle[0] == cle[1]:
+            items = {
+                "arc": self.canvas.create_arc(0, 0, 0, 0, start=225, extent=270, style=tk.ARC,
+                                              outline=self.colors["text"], width=2),
+                "pointe": self.canvas.create_line(0, 0, 0, 0, arrow=tk.LAST, width=2, fill=self.colors["text"]),
+                "texte": self.canvas.create_text(0, 0, text=label, font=('Arial', 9), fill=self.colors["text"]),
+            }
+        else:
+            items = {"ligne": self.canvas.create_line(0, 0, 0, 0, arrow=tk.LAST, width=2, fill=self.colors["text"])}
+            if complet:
+                items["texte"] = self.canvas.create_text(0, 0, text=label, font=('Arial', 9, 'bold'), fill=self.colors["primary"])
+        items["label"] = label
+        return items
+
+    def _supprimer_items(self, items: dict):
+        for cle, item in items.items():
+            if cle not in ("signature", "label"):
+                self.canvas.delete(item)
+
+    def _placer_etat(self, etat_id, items):
+        x, y = self._ecran(*self.positions[etat_id][:2])
+        angle = self.positions[etat_id][2]
+        r = self.RAYON_ETAT * self.echelle
+        coords = self.canvas.coords
+        coords(items["cercle"], x - r, y - r, x + r, y + r)
+        if "texte" in items:
+            coords(items["texte"], x, y)
+        if "fleche" in items:
+            arrow_length = 20 * self.echelle
+            coords(items["fleche"],
+                   x - (r + arrow_length) * math.cos(angle), y - (r + arrow_length) * math.sin(angle),
+                   x - r * math.cos(angle), y - r * math.sin(angle))
+        if "interieur" in items:
+            inner_radius = r - 5 * self.echelle
+            coords(items["interieur"], x - inner_radius, y - inner_radius, x + inner_radius, y + inner_radius)
+
+    def _placer_arc(self, cle, items):
+        src_id, dest_id = cle
+        src_x, src_y = self._ecran(*self.positions[src_id][:2])
+        dest_x, dest_y = self._ecran(*self.positions[dest_id][:2])
+        r = self.RAYON_ETAT * self.echelle
+        coords = self.canvas.coords
+        if src_id == dest_id:
+            loop_radius = r * 0.8
+            loop_center_x = src_x + r * 0.8
+            loop_center_y = src_y - r * 0.8
+            coords(items["arc"], loop_center_x - loop_radius, loop_center_y - loop_radius,
+                   loop_center_x + loop_radius, loop_center_y + loop_radius)
+            arrow_angle = math.radians(225 + 270 - 10)
+            arrow_x = loop_center_x + loop_radius * math.cos(arrow_angle)
+            arrow_y = loop_center_y - loop_radius * math.sin(arrow_angle)
+            coords(items["pointe"], arrow_x, arrow_y, arrow_x - 5, arrow_y + 5)
+            coords(items["texte"], loop_center_x, loop_center_y - loop_radius - 5)
+        else:
+            angle = math.atan2(dest_y - src_y, dest_x - src_x)
+            arrow_start_x = src_x + r * math.cos(angle)
+            arrow_start_y = src_y + r * math.sin(angle)
+            arrow_end_x = dest_x - r * math.cos(angle)
+            arrow_end_y = dest_y - r * math.sin(angle)
+            coords(items["ligne"], arrow_start_x, arrow_start_y, arrow_end_x, arrow_end_y)
+            if "texte" in items:
+                mid_x, mid_y = (arrow_start_x + arrow_end_x) / 2, (arrow_start_y + arrow_end_y) / 2
+                label_offset = 15
+                coords(items["texte"], mid_x + label_offset * math.sin(angle), mid_y - label_offset * math.cos(angle))
+
+    # --- Niveau agrégé -------------------------------------------------
+
+    def _synchroniser_agregats(self):
+        # Plus petit niveau de grille dont les cellules font au moins PIXELS_AGREGAT à l'écran
+        niveau = max(0, math.ceil(math.log2(self.PIXELS_AGREGAT / (self.index.taille * self.echelle))))
+        cellules = self.index.agregats_dans(niveau, self._rectangle_visible(self.index.taille_niveau(niveau)))
+        centres = {c: self._ecran(mx, my) for c, _, mx, my in cellules}
+
+        voulus = {}
+        for c, n, _, _ in cellules:
+            x, y = centres[c]
+            r = min(self.PIXELS_AGREGAT / 2 - 2, 3 + 2 * math.sqrt(n))
+            voulus[("etats", niveau, c)] = ("oval", (x - r, y - r, x + r, y + r), n)
+        for c1 in centres:
+            for c2, n in self.index.liens(niveau, c1).items():
+                if c2 in centres:
+                    voulus[("arcs", niveau, c1, c2)] = ("ligne", centres[c1] + centres[c2], n)
+
+        for cle in list(self.items_agregats):
+            if cle not in voulus:
+                self.canvas.delete(self.items_agregats.pop(cle))
+        for cle, (forme, coordonnees, n) in voulus.items():
+            item = self.items_agregats.get(cle)
+            if item is None:
+                if forme == "oval":
+                    item = self.canvas.create_oval(*coordonnees, outline=self.colors["text"],
+                                                   fill=self.colors["secondary"], width=1)
+                else:
+                    item = self.canvas.create_line(*coordonnees, fill=self.colors["text"],
+                                                   width=min(8, 1 + math.log2(n)))
+                    self.canvas.tag_lower(item)
+                self.items_agregats[cle] = item
+            else:
+                self.canvas.coords(item, *coordonnees)
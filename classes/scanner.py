@@ -0,0 +1,164 @@
+"""Recherche de toutes les sous-chaînes reconnues par un automate dans un flux de texte.
+
+Sémantique « plus à gauche, plus longue » (comme un analyseur lexical) : parmi
+les occurrences non vides, on retient celle qui commence le plus tôt, la plus
+longue pour ce début, puis on reprend la recherche à sa fin. Les positions
+(début, fin) sont absolues dans le flux, fin exclue ; en octets pour un flux
+binaire, où chaque octet est lu comme le symbole chr(octet) (latin-1).
+
+Le scanner simule l'AFD en parallèle depuis chaque position de départ, en ne
+gardant pour chaque état que le départ le plus à gauche : au plus |Q| fils
+actifs par caractère. Seul le texte postérieur à la fin de l'occurrence en
+attente est conservé, pour être relu si elle est validée ; `longueur_max`
+borne la longueur des occurrences, et donc cette attente, quand le motif peut
+s'étendre indéfiniment (par ex. a.*b). Un départ plus à gauche pouvant alors
+expirer, chaque état garde ses départs des `longueur_max` dernières positions.
+"""
+import mmap
+import re
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from classes.Automate import Automate
+
+Morceau = Union[str, bytes, bytearray, memoryview]
+
+
+class Scanner:
+    """Scanner à états : appeler `feed()` pour chaque morceau, puis `terminer()`."""
+
+    def __init__(self, automate: Automate, longueur_max: Optional[int] = None):
+        afd = automate.determiniser()
+        numero = {e.id: i for i, e in enumerate(afd.etats)}
+        self.table: List[Dict[str, int]] = [{} for _ in afd.etats]
+        for t in afd.transitions:
+            self.table[numero[t.source.id]].setdefault(t.alphabet.valeur, numero[t.destination.id])
+        self.finaux = [("final" in e.type) for e in afd.etats]
+        initiaux = [numero[e.id] for e in afd.etats if "initial" in e.type]
+        self.initial = initiaux[0] if initiaux else None
+        self.longueur_max = longueur_max
+        # Saut rapide (en C) jusqu'au prochain caractère pouvant commencer une occurrence
+        premiers = sorted(s for s in self.table[self.initial] if len(s) == 1) if self.initial is not None else []
+        self.premiers = re.compile("[" + "".join(re.escape(s) for s in premiers) + "]") if premiers else None
+        self.reinitialiser()
+
+    def reinitialiser(self):
+        self.tampon = ""
+        self.debut_tampon = 0   # position absolue de tampon[0]
+        self.curseur = 0        # prochain caractère à traiter
+        self.fils: Dict[int, List[int]] = {}  # état -> départs croissants (le seul plus à gauche sans limite)
+        self.candidat: Optional[Tuple[int, int]] = None
+
+    def feed(self, morceau: Morceau) -> List[Tuple[int, int]]:
+        """Ajoute un morceau du flux ; retourne les occurrences désormais certaines."""
+        if not isinstance(morceau, str):
+            morceau = bytes(morceau).decode("latin-1")
+        self.tampon += morceau
+        resultats = []
+        self._traiter(resultats)
+        # On ne peut revenir en arrière qu'à la fin de l'occurrence en attente
+        garder = self.candidat[1] if self.candidat else self.curseur
+        if garder > self.debut_tampon:
+            self.tampon = self.tampon[garder - self.debut_tampon:]
+            self.debut_tampon = garder
+        return resultats
+
+    def terminer(self) -> List[Tuple[int, int]]:
+        """Fin du flux : valide les occurrences en attente et relit la fin du texte."""
+        resultats = []
+        while self.candidat is not None:
+            self._valider(resultats)
+            self._traiter(resultats)
+        self.debut_tampon += len(self.tampon)
+        self.tampon = ""
+        self.fils = {}
+        return resultats
+
+    def _valider(self, resultats: list):
+        debut, fin = self.candidat
+        resultats.append((debut, fin))
+        self.candidat = None
+        self.fils = {}
+        self.curseur = fin
+
+    def _traiter(self, resultats: list):
+        if self.premiers is None:
+            self.curseur = self.debut_tampon + len(self.tampon)
+            return
+        table, finaux, initial, longueur_max = self.table, self.finaux, self.initial, self.longueur_max
+        fin_lue = self.debut_tampon + len(self.tampon)
+        while self.curseur < fin_lue:
+            position = self.curseur
+            c = self.tampon[position - self.debut_tampon]
+            self.curseur += 1
+            fils = self.fils
+            if self.candidat is None:
+                if not fils and c not in table[initial]:
+                    saut = self.premiers.search(self.tampon, self.curseur - self.debut_tampon)
+                    self.curseur = fin_lue if saut is None else self.debut_tampon + saut.start()
+                    continue
+                if initial not in fils:
+                    fils[initial] = [position]
+                elif longueur_max is not None:
+                    fils[initial].append(position)
+
+            suivants = {}
+            for etat, debuts in fils.items():
+                d = table[etat].get(c)
+                if d is None:
+                    continue
+                if longueur_max is not None:
+                    debuts = [debut for debut in debuts if position + 1 - debut <= longueur_max]
+                    if not debuts:
+                        continue
+                if d not in suivants:
+                    suivants[d] = debuts
+                elif longueur_max is None:
+                    if debuts[0] < suivants[d][0]:
+                        suivants[d] = debuts
+                else:
+                    suivants[d] = sorted(set(suivants[d] + debuts))
+
+            candidat = self.candidat
+            for etat, debuts in suivants.items():
+                debut = debuts[0]
+                if finaux[etat] and (candidat is None or debut < candidat[0]
+                                     or (debut == candidat[0] and position + 1 > candidat[1])):
+                    candidat = (debut, position + 1)
+            if candidat is not None:
+                # Seuls les fils partis au plus tard au début du candidat peuvent encore l'améliorer
+                restants = {}
+                for etat, debuts in suivants.items():
+                    debuts = [debut for debut in debuts if debut <= candidat[0]]
+                    if debuts:
+                        restants[etat] = debuts
+                suivants = restants
+            self.fils = suivants
+            self.candidat = candidat
+            if candidat is not None and not suivants:
+                self._valider(resultats)
+
+    def scanner(self, flux: BinaryIO, taille_morceau: int = 1 << 20) -> Iterator[Tuple[int, int]]:
+        """Toutes les occurrences d'un fichier ouvert (texte ou binaire), lu par morceaux."""
+        while True:
+            morceau = flux.read(taille_morceau)
+            if not morceau:
+                break
+            yield from self.feed(morceau)
+        yield from self.terminer()
+
+
+def scanner_fichier(automate: Automate, chemin, longueur_max: Optional[int] = None,
+                    taille_morceau: int = 1 << 22) -> Iterator[Tuple[int, int]]:
+    """Occurrences dans un fichier projeté en mémoire (mmap) : adapté aux fichiers de plusieurs Go."""
+    scanner = Scanner(automate, longueur_max)
+    with open(chemin, "rb") as f:
+        try:
+            projection = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Fichier vide : mmap refuse une longueur nulle
+            yield from scanner.terminer()
+            return
+        with projection:
+            for i in range(0, len(projection), taille_morceau):
+                yield from scanner.feed(projection[i:i + taille_morceau])
+            yield from scanner.terminer()
@@ -1,63 +1,146 @@
 import hashlib
 import csv
 import os
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 class SecurityManager:
+    ENTETE = ['automate_name', 'password_hash', 'last_modified']
+
     def __init__(self):
         self.credentials_file = "Automates/automate_credentials.csv"
+        self.lock_file = self.credentials_file + ".lock"
         Path("automates").mkdir(exist_ok=True)
-        
+        # Cache en mémoire : nom -> ligne, invalidé quand le CSV change (inode, dates, taille)
+        self._cache: Dict[str, dict] = {}
+        self._cache_signature = None
+
         # Créer le fichier de credentials s'il n'existe pas
         if not os.path.exists(self.credentials_file):
-            with open(self.credentials_file, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(['automate_name', 'password_hash', 'last_modified'])
+            with self._verrou():
+                if not os.path.exists(self.credentials_file):
+                    self._ecrire({})
 
     def hash_password(self, password: str) -> str:
         salt = "ENSAM_CASA_CSCC_2025"
         return hashlib.sha256((password + salt).encode()).hexdigest()
 
+    @contextmanager
+    def _verrou(self):
+        """Verrou consultatif exclusif partagé entre processus (fichier .lock)."""
+        Path(self.lock_file).parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_file, 'a+') as f:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _signature(self):
+        # _ecrire remplace le fichier (os.replace) : l'inode change à chaque écriture,
+        # même si la taille et une date de modification grossière restent les mêmes
+        try:
+            stat = os.stat(self.credentials_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size
+
+    def _recharger(self) -> Dict[str, dict]:
+        """Relit le CSV seulement s'il a changé depuis la dernière lecture."""
+        signature = self._signature()
+        if signature == self._cache_signature:
+            return self._cache
+        credentials = {}
+        if signature is not None:
+            with open(self.credentials_file, 'r', newline='') as f:
+                reader = csv.reader(f)
+                next(reader, None)  # Skip header
+                for row in reader:
+                    if len(row) >= 3:
+                        credentials[row[0]] = {
+                            'automate_name': row[0],
+                            'password_hash': row[1],
+                            'last_modified': row[2]
+                        }
+        self._cache = credentials
+        self._cache_signature = signature
+        return credentials
+
+    def _ecrire(self, credentials: Dict[str, dict]):
+        """Réécrit le CSV de façon atomique (fichier temporaire puis renommage)."""
+        dossier = os.path.dirname(self.credentials_file) or "."
+        os.makedirs(dossier, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=dossier, prefix=".credentials_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.ENTETE)
+                for c in credentials.values():
+                    writer.writerow([c['automate_name'], c['password_hash'], c['last_modified']])
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp, self.credentials_file)
+        except BaseException:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+        self._cache = credentials
+        self._cache_signature = self._signature()
+
     def save_credentials(self, automate_name: str, password: str):
-        password_hash = self.hash_password(password)
+        self.save_credentials_bulk([(automate_name, password)])
+
+    def save_credentials_bulk(self, entries: Iterable[Tuple[str, str]]):
+        """Crée ou met à jour plusieurs credentials en une seule réécriture du fichier."""
         last_modified = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Vérifier si l'automate existe déjà
-        existing = self.get_credentials(automate_name)
-        
-        with open(self.credentials_file, 'a' if not existing else 'r+', newline='') as f:
-            writer = csv.writer(f)
-            if existing:
-                # Mettre à jour les credentials existants
-                lines = list(csv.reader(f))
-                f.seek(0)
-                for line in lines:
-                    if line[0] == automate_name:
-                        writer.writerow([automate_name, password_hash, last_modified])
-                    else:
-                        writer.writerow(line)
-            else:
-                # Ajouter de nouveaux credentials
-                writer.writerow([automate_name, password_hash, last_modified])
+        with self._verrou():
+            # Relecture sous verrou : un autre processus a pu écrire entre-temps
+            credentials = dict(self._recharger())
+            for automate_name, password in entries:
+                credentials[automate_name] = {
+                    'automate_name': automate_name,
+                    'password_hash': self.hash_password(password),
+                    'last_modified': last_modified
+                }
+            self._ecrire(credentials)
 
     def get_credentials(self, automate_name: str) -> dict:
-       
-        with open(self.credentials_file, 'r', newline='') as f:
-            reader = csv.reader(f)
-            next(reader)  # Skip header
-            for row in reader:
-                if row[0] == automate_name:
-                    return {
-                        'automate_name': row[0],
-                        'password_hash': row[1],
-                        'last_modified': row[2]
-                    }
-        return None
+        credentials = self._recharger().get(automate_name)
+        return dict(credentials) if credentials else None
 
     def verify_password(self, automate_name: str, password: str) -> bool:
-        
+
         credentials = self.get_credentials(automate_name)
         if not credentials:
             return False
-        return credentials['password_hash'] == self.hash_password(password)
\ No newline at end of file
+        return credentials['password_hash'] == self.hash_password(password)
+
+    def verify_passwords(self, entries: Iterable[Tuple[str, str]]) -> Dict[str, bool]:
+        """Vérifie plusieurs couples (nom, mot de passe) avec une seule lecture du fichier."""
+        credentials = self._recharger()
+        resultats = {}
+        for automate_name, password in entries:
+            c = credentials.get(automate_name)
+            resultats[automate_name] = bool(c) and c['password_hash'] == self.hash_password(password)
+        return resultats
+
+    def noms_proteges(self) -> set:
+        """Retourne les noms des automates ayant des credentials."""
+        return set(self._recharger())
\ No newline at end of file
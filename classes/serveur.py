@@ -0,0 +1,273 @@
+"""Serveur local de reconnaissance de mots : asyncio sur une socket Unix, sans réseau.
+
+Protocole : une requête JSON par ligne, chacune avec un "id" libre repris dans
+les réponses (les requêtes d'une connexion peuvent être envoyées à la suite,
+les réponses arrivent dans l'ordre où elles sont prêtes).
+
+    {"id": 1, "commande": "tester", "automate": "abb", "mots": ["abb", "ab"], "mot_de_passe": "..."}
+    -> {"id": 1, "resultats": [true, false], "fin": true}
+    {"id": 2, "commande": "recharger"}
+    -> {"id": 2, "recharges": ["abb"], "retires": [], "fin": true}
+    {"id": 3, "commande": "stats"}
+    -> {"id": 3, "automates": [...], "requetes": ..., "lots": ..., ..., "fin": true}
+
+Les résultats d'une longue liste de mots sont envoyés par tranches de
+TAILLE_TRANCHE ("fin": false sauf pour la dernière). En cas d'échec :
+{"id": ..., "erreur": "...", "fin": true}.
+
+Les automates compilés (AFD en tableaux compacts) restent en mémoire dans un
+cache LRU. Les requêtes reçues pendant `fenetre` secondes pour un même
+automate sont regroupées en un seul appel de reconnaissance, sur les mots
+distincts du lot. "recharger" relit les fichiers dont la date de modification
+ou la taille a changé.
+"""
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from classes.Automate import Automate
+from classes.compact import AutomateCompact
+
+TAILLE_TRANCHE = 10000
+# Longueur maximale d'une ligne de requête
+LIMITE_LIGNE = 64 * 1024 * 1024
+
+
+class _Compile:
+    """Automate prêt à l'emploi et signature (mtime, taille) du fichier dont il provient."""
+
+    def __init__(self, chemin: Path):
+        stat = os.stat(chemin)
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        afd = Automate.charger_fichier(chemin).determiniser()
+        try:
+            self.automate = AutomateCompact.depuis_automate(afd)
+            self.reconnaitre = self.automate.reconnait_mots
+        except ValueError:
+            # Symboles de plusieurs caractères : on garde l'AFD en objets
+            self.automate = afd
+            self.reconnaitre = lambda mots: [afd.reconnait_mot(m) for m in mots]
+        self.nb_etats = len(afd.etats)
+
+
+class ServeurAutomates:
+    """Sert les automates du dossier `dossier` ; `security` (SecurityManager) protège ceux qui ont un mot de passe."""
+
+    def __init__(self, dossier: str = "automates", security=None, capacite: int = 32, fenetre: float = 0.002):
+        self.dossier = Path(dossier)
+        self.security = security
+        self.capacite = capacite
+        self.fenetre = fenetre
+        self._cache: 'OrderedDict[str, _Compile]' = OrderedDict()
+        self._chargements: Dict[str, asyncio.Future] = {}
+        # Nom -> requêtes en attente [(mots, future)]
+        self._en_attente: Dict[str, list] = {}
+        self.compteurs = {"requetes": 0, "lots": 0, "mots": 0, "mots_distincts": 0, "succes_cache": 0,
+                          "echecs_cache": 0, "evictions": 0}
+        self._serveur = None
+
+    def _chemin(self, nom: str) -> Path:
+        if not nom or Path(nom).name != nom or nom.startswith("."):
+            raise ValueError(f"Nom d'automate invalide : '{nom}'")
+        return self.dossier / f"{nom}.json"
+
+    async def compiler(self, nom: str) -> _Compile:
+        """Automate compilé, depuis le cache ou chargé une seule fois même si plusieurs requêtes l'attendent."""
+        entree = self._cache.get(nom)
+        if entree is not None:
+            self._cache.move_to_end(nom)
+            self.compteurs["succes_cache"] += 1
+            return entree
+        chargement = self._chargements.get(nom)
+        if chargement is None:
+            self.compteurs["echecs_cache"] += 1
+            chemin = self._chemin(nom)
+            chargement = asyncio.get_running_loop().run_in_executor(None, _Compile, chemin)
+            self._chargements[nom] = chargement
+            try:
+                entree = await chargement
+            finally:
+                del self._chargements[nom]
+            self._garder(nom, entree)
+            return entree
+        return await asyncio.shield(chargement)
+
+    def _garder(self, nom: str, entree: _Compile):
+        self._cache[nom] = entree
+        self._cache.move_to_end(nom)
+        while len(self._cache) > self.capacite:
+            self._cache.popitem(last=False)
+            self.compteurs["evictions"] += 1
+
+    def _verifier_acces(self, nom: str, mot_de_passe: Optional[str]):
+        if self.security is None or nom not in self.security.noms_proteges():
+            return
+        if mot_de_passe is None or not self.security.verify_password(nom, mot_de_passe):
+            raise PermissionError(f"Mot de passe incorrect pour '{nom}'")
+
+    async def reconnaitre(self, nom: str, mots: List[str], mot_de_passe: Optional[str] = None) -> List[bool]:
+        """Résultats pour `mots`, calculés avec ceux des autres requêtes arrivées dans la même fenêtre."""
+        self._verifier_acces(nom, mot_de_passe)
+        self.compteurs["requetes"] += 1
+        boucle = asyncio.get_running_loop()
+        lot = self._en_attente.get(nom)
+        if lot is None:
+            lot = self._en_attente[nom] = []
+            boucle.call_later(self.fenetre, lambda: asyncio.ensure_future(self._vider(nom)))
+        resultat = boucle.create_future()
+        lot.append((mots, resultat))
+        return await resultat
+
+    async def _vider(self, nom: str):
+        lot = self._en_attente.pop(nom)
+        try:
+            entree = await self.compiler(nom)
+            distincts = list(dict.fromkeys(mot for mots, _ in lot for mot in mots))
+            self.compteurs["lots"] += 1
+            self.compteurs["mots"] += sum(len(mots) for mots, _ in lot)
+            self.compteurs["mots_distincts"] += len(distincts)
+            # Hors de la boucle : les autres connexions continuent d'être lues pendant le calcul
+            acceptes = await asyncio.get_running_loop().run_in_executor(None, entree.reconnaitre, distincts)
+            acceptes = dict(zip(distincts, acceptes))
+        except Exception as e:
+            for _, resultat in lot:
+                if not resultat.done():
+                    resultat.set_exception(e)
+            return
+        for mots, resultat in lot:
+            if not resultat.done():
+                resultat.set_result([acceptes[mot] for mot in mots])
+
+    async def recharger(self) -> dict:
+        """Recompile les automates en cache dont le fichier a changé ; oublie ceux qui ont disparu.
+
+        Lectures et compilations se font hors de la boucle : les autres requêtes
+        continuent d'être servies (avec l'ancienne version) pendant ce temps.
+        """
+        boucle = asyncio.get_running_loop()
+        recharges, retires = [], []
+        for nom, entree in list(self._cache.items()):
+            chemin = self._chemin(nom)
+            try:
+                stat = await boucle.run_in_executor(None, os.stat, chemin)
+                if (stat.st_mtime_ns, stat.st_size) == entree.signature:
+                    continue
+                nouvelle = await boucle.run_in_executor(None, _Compile, chemin)
+            except Exception:
+                nouvelle = None
+            # Entrée évincée ou remplacée pendant l'attente : on n'y touche plus
+            if self._cache.get(nom) is not entree:
+                continue
+            if nouvelle is None:
+                del self._cache[nom]
+                retires.append(nom)
+            else:
+                self._cache[nom] = nouvelle
+                recharges.append(nom)
+        return {"recharges": recharges, "retires": retires}
+
+    def stats(self) -> dict:
+        return {
+            "automates": [{"nom": nom, "nb_etats": c.nb_etats} for nom, c in self._cache.items()],
+            "capacite": self.capacite,
+            **self.compteurs,
+        }
+
+    async def _traiter(self, requete: dict, ecrire):
+        identifiant = requete.get("id")
+        try:
+            commande = requete.get("commande")
+            if commande == "tester":
+                mots = requete.get("mots", [])
+                if not isinstance(mots, list) or not all(isinstance(m, str) for m in mots):
+                    raise ValueError("'mots' doit être une liste de chaînes")
+                resultats = await self.reconnaitre(requete.get("automate"), mots, requete.get("mot_de_passe"))
+                for debut in range(0, len(resultats), TAILLE_TRANCHE):
+                    fin = debut + TAILLE_TRANCHE >= len(resultats)
+                    await ecrire({"id": identifiant, "resultats": resultats[debut:debut + TAILLE_TRANCHE],
+                                  "fin": fin})
+                if not resultats:
+                    await ecrire({"id": identifiant, "resultats": [], "fin": True})
+            elif commande == "recharger":
+                await ecrire({"id": identifiant, **(await self.recharger()), "fin": True})
+            elif commande == "stats":
+                await ecrire({"id": identifiant, **self.stats(), "fin": True})
+            else:
+                raise ValueError(f"Commande inconnue : '{commande}'")
+        except Exception as e:
+            await ecrire({"id": identifiant, "erreur": f"{type(e).__name__}: {e}", "fin": True})
+
+    async def _connexion(self, lecteur: asyncio.StreamReader, redacteur: asyncio.StreamWriter):
+        verrou = asyncio.Lock()
+
+        async def ecrire(reponse: dict):
+            async with verrou:
+                redacteur.write(json.dumps(reponse, ensure_ascii=False).encode("utf-8") + b"\n")
+                await redacteur.drain()
+
+        taches = set()
+        try:
+            while True:
+                ligne = await lecteur.readline()
+                if not ligne:
+                    break
+                try:
+                    requete = json.loads(ligne)
+                    if not isinstance(requete, dict):
+                        raise ValueError("la requête doit être un objet JSON")
+                except ValueError as e:
+                    await ecrire({"id": None, "erreur": f"Requête invalide : {e}", "fin": True})
+                    continue
+                tache = asyncio.ensure_future(self._traiter(requete, ecrire))
+                taches.add(tache)
+                tache.add_done_callback(taches.discard)
+            if taches:
+                await asyncio.gather(*taches)
+        except (ConnectionError, ValueError):
+            # Client parti, ou ligne plus longue que LIMITE_LIGNE
+            for tache in taches:
+                tache.cancel()
+        finally:
+            redacteur.close()
+
+    async def demarrer(self, socket: str):
+        """Écoute sur la socket Unix `socket` (remplacée si elle existe déjà)."""
+        if os.path.exists(socket):
+            os.unlink(socket)
+        self._serveur = await asyncio.start_unix_server(self._connexion, path=socket, limit=LIMITE_LIGNE)
+        return self._serveur
+
+    async def servir(self, socket: str):
+        """Démarre puis sert jusqu'à annulation (Ctrl+C)."""
+        serveur = await self.demarrer(socket)
+        try:
+            async with serveur:
+                await serveur.serve_forever()
+        finally:
+            if os.path.exists(socket):
+                os.unlink(socket)
+
+
+async def interroger(socket: str, requetes: List[dict]) -> List[dict]:
+    """Client minimal : envoie les requêtes à la suite et renvoie toutes les réponses, dans l'ordre reçu."""
+    lecteur, redacteur = await asyncio.open_unix_connection(socket, limit=LIMITE_LIGNE)
+    try:
+        for requete in requetes:
+            redacteur.write(json.dumps(requete, ensure_ascii=False).encode("utf-8") + b"\n")
+        await redacteur.drain()
+        reponses = []
+        restantes = len(requetes)
+        while restantes:
+            ligne = await lecteur.readline()
+            if not ligne:
+                break
+            reponse = json.loads(ligne)
+            reponses.append(reponse)
+            restantes -= reponse.get("fin", True)
+        return reponses
+    finally:
+        redacteur.close()
+        await redacteur.wait_closed()
@@ -0,0 +1,297 @@
+"""Automates symboliques : chaque transition porte un ensemble d'intervalles de caractères.
+
+Une classe comme [a-z0-9] coûte une transition au lieu de 36, et `.` une seule
+au lieu d'une par caractère de l'alphabet. La déterminisation et la
+minimisation découpent l'espace des caractères en minterms : les ensembles de
+caractères qui ne se distinguent par aucune étiquette sortante (déterminisation)
+ou par aucune étiquette de l'automate (minimisation). La reconnaissance passe
+par une table de classes pour les 256 premiers points de code et par une
+recherche dichotomique au-delà.
+"""
+import json
+from bisect import bisect_right
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from classes.Alphabet import Alphabet
+from classes.Automate import Automate
+from classes.Etat import Etat
+from classes.Transition import Transition
+from classes.intervalles import Intervalles, minterms
+from classes.metriques import compter, mesure
+from classes.regex import analyser, positions
+
+
+class _Tables:
+    """Tables de reconnaissance d'un AFD symbolique."""
+
+    def __init__(self, automate: 'AutomateSymbolique'):
+        # Par état : intervalles triés (début, fin, destination) et leurs débuts pour bisect
+        self.intervalles: List[List[Tuple[int, int, int]]] = []
+        for sortantes in automate.transitions:
+            self.intervalles.append(sorted((debut, fin, d) for etiquette, d in sortantes for debut, fin in etiquette))
+        self.debuts = [[debut for debut, _, _ in ligne] for ligne in self.intervalles]
+
+        # Classes d'octets : deux codes < 256 de la même classe ont le même comportement partout
+        bas = Intervalles([(0, 255)])
+        etiquettes = [etiquette & bas for sortantes in automate.transitions for etiquette, _ in sortantes]
+        self.classe = bytearray(256)  # classe 0 : aucune transition
+        classes: Dict[frozenset, int] = {}
+        for debut, fin, actifs in minterms(etiquettes):
+            k = classes.setdefault(actifs, len(classes) + 1)
+            if k > 255:
+                self.classe = None  # trop de classes pour un octet : dichotomie seule
+                break
+            for code in range(debut, fin + 1):
+                self.classe[code] = k
+        if self.classe is not None:
+            self.octets = [[-1] * (len(classes) + 1) for _ in automate.transitions]
+            for e in range(len(automate.transitions)):
+                for debut, fin, d in self.intervalles[e]:
+                    for code in range(debut, min(fin, 255) + 1):
+                        self.octets[e][self.classe[code]] = d
+
+    def suivant(self, etat: int, code: int) -> int:
+        if code < 256 and self.classe is not None:
+            return self.octets[etat][self.classe[code]]
+        i = bisect_right(self.debuts[etat], code) - 1
+        if i >= 0 and code <= self.intervalles[etat][i][1]:
+            return self.intervalles[etat][i][2]
+        return -1
+
+
+class AutomateSymbolique:
+    """AFN ou AFD à étiquettes Intervalles ; états numérotés 0..n-1, sans ε-transitions."""
+
+    def __init__(self, nom: str):
+        self.nom = nom
+        self.initiaux: Set[int] = set()
+        self.finaux: Set[int] = set()
+        self.transitions: List[List[Tuple[Intervalles, int]]] = []
+        self._tables: Optional[_Tables] = None
+
+    @property
+    def nb_etats(self) -> int:
+        return len(self.transitions)
+
+    @property
+    def nb_transitions(self) -> int:
+        return sum(len(sortantes) for sortantes in self.transitions)
+
+    @property
+    def nb_intervalles(self) -> int:
+        return sum(len(etiquette.bornes) for sortantes in self.transitions for etiquette, _ in sortantes)
+
+    def ajouter_etat(self, initial: bool = False, final: bool = False) -> int:
+        etat = len(self.transitions)
+        self.transitions.append([])
+        if initial:
+            self.initiaux.add(etat)
+        if final:
+            self.finaux.add(etat)
+        self._tables = None
+        return etat
+
+    def ajouter_transition(self, source: int, etiquette: Intervalles, destination: int):
+        if etiquette:
+            self.transitions[source].append((etiquette, destination))
+            self._tables = None
+
+    def est_deterministe(self) -> bool:
+        """Un seul état initial et, pour chaque état, des étiquettes sortantes disjointes."""
+        if len(self.initiaux) != 1:
+            return False
+        for sortantes in self.transitions:
+            bornes = sorted(b for etiquette, _ in sortantes for b in etiquette)
+            if any(bornes[i][0] <= bornes[i - 1][1] for i in range(1, len(bornes))):
+                return False
+        return True
+
+    @mesure("determiniser_symbolique")
+    def determiniser(self, controle=None) -> 'AutomateSymbolique':
+        """Construction des sous-ensembles, un minterm des étiquettes sortantes à la fois."""
+        if self.est_deterministe():
+            return self
+        afd = AutomateSymbolique(f"{self.nom}_AFD")
+        depart = frozenset(self.initiaux)
+        numero = {depart: afd.ajouter_etat(initial=True, final=bool(depart & self.finaux))}
+        file = deque([depart])
+        nb_minterms = 0
+        while file:
+            if controle is not None:
+                controle.point(afd.nb_etats, message=f"{afd.nb_etats} états créés, {len(file)} en attente")
+            courant = file.popleft()
+            sortantes = [t for e in sorted(courant) for t in self.transitions[e]]
+            cibles: Dict[frozenset, List[Tuple[int, int]]] = {}
+            for debut, fin, actifs in minterms([etiquette for etiquette, _ in sortantes]):
+                nb_minterms += 1
+                cibles.setdefault(frozenset(sortantes[i][1] for i in actifs), []).append((debut, fin))
+            for cible, bornes in cibles.items():
+                if cible not in numero:
+                    numero[cible] = afd.ajouter_etat(final=bool(cible & self.finaux))
+                    file.append(cible)
+                afd.ajouter_transition(numero[courant], Intervalles(bornes), numero[cible])
+        compter("sous_ensembles_crees", afd.nb_etats)
+        compter("minterms", nb_minterms)
+        return afd
+
+    @mesure("minimiser_symbolique")
+    def minimiser(self, controle=None) -> 'AutomateSymbolique':
+        """AFD minimal émondé : Hopcroft sur les minterms de toutes les étiquettes."""
+        afd = self.determiniser(controle)
+        if not afd.initiaux:
+            raise ValueError("Aucun état initial trouvé.")
+        successeurs = {e: [d for _, d in sortantes] for e, sortantes in enumerate(afd.transitions)}
+        predecesseurs = defaultdict(list)
+        for e, destinations in successeurs.items():
+            for d in destinations:
+                predecesseurs[d].append(e)
+        accessibles = Automate._parcours(list(afd.initiaux), successeurs)
+        utiles = Automate._parcours(afd.finaux & accessibles, predecesseurs, accessibles)
+        minimal = AutomateSymbolique(f"{self.nom}_minimal")
+        if not utiles:
+            return minimal
+
+        ids = [e for e in range(afd.nb_etats) if e in utiles]
+        aretes = [(e, etiquette, d) for e in ids for etiquette, d in afd.transitions[e] if d in utiles]
+        # Minterm = ensemble d'étiquettes actives ; ses segments ne sont pas forcément contigus
+        symboles: Dict[frozenset, int] = {}
+        segments: List[List[Tuple[int, int]]] = []
+        table = {}
+        for debut, fin, actifs in minterms([etiquette for _, etiquette, _ in aretes]):
+            if actifs not in symboles:
+                symboles[actifs] = len(segments)
+                segments.append([])
+                for i in actifs:
+                    table[aretes[i][0], symboles[actifs]] = aretes[i][2]
+            segments[symboles[actifs]].append((debut, fin))
+        compter("minterms", len(segments))
+
+        classes = Automate._partition_minimale(ids, afd.finaux, table, list(range(len(segments))), controle)
+        classe_de = {}
+        for c, membres in enumerate(classes):
+            minimal.ajouter_etat(initial=bool(afd.initiaux & set(membres)), final=membres[0] in afd.finaux)
+            for e in membres:
+                classe_de[e] = c
+        for c, membres in enumerate(classes):
+            bornes = defaultdict(list)
+            for k, morceaux in enumerate(segments):
+                d = table.get((membres[0], k))
+                if d is not None:
+                    bornes[classe_de[d]].extend(morceaux)
+            for d, morceaux in bornes.items():
+                minimal.ajouter_transition(c, Intervalles(morceaux), d)
+        return minimal
+
+    def reconnait_mot(self, mot: str) -> bool:
+        if not self.est_deterministe():
+            courants = set(self.initiaux)
+            for c in mot:
+                courants = {d for e in courants for etiquette, d in self.transitions[e] if c in etiquette}
+                if not courants:
+                    return False
+            return bool(courants & self.finaux)
+        if self._tables is None:
+            self._tables = _Tables(self)
+        tables = self._tables
+        etat = next(iter(self.initiaux))
+        for c in mot:
+            etat = tables.suivant(etat, ord(c))
+            if etat < 0:
+                return False
+        return etat in self.finaux
+
+    __contains__ = reconnait_mot
+
+    @classmethod
+    def depuis_regex(cls, expr: str, nom: str = None) -> 'AutomateSymbolique':
+        """Automate de Glushkov dont les transitions gardent les classes de l'expression."""
+        etiquettes, suivants, finaux = positions(analyser(expr, symbolique=True))
+        automate = cls(nom or "regex")
+        for p in range(len(etiquettes)):
+            automate.ajouter_etat(initial=p == 0, final=p in finaux)
+        for p in range(len(etiquettes)):
+            for q in suivants[p]:
+                automate.ajouter_transition(p, etiquettes[q], q)
+        return automate
+
+    @classmethod
+    def depuis_automate(cls, automate: Automate) -> 'AutomateSymbolique':
+        """Regroupe les symboles (d'un caractère) de chaque couple (source, destination) en intervalles."""
+        if automate.contient_epsilon():
+            automate = automate.eliminer_epsilon()
+        symbolique = cls(automate.nom)
+        numero = {}
+        for e in automate.etats:
+            numero[e.id] = symbolique.ajouter_etat("initial" in e.type, "final" in e.type)
+        symboles = defaultdict(list)
+        for t in automate.transitions:
+            symboles[numero[t.source.id], numero[t.destination.id]].append(t.alphabet.valeur)
+        for (source, destination), valeurs in symboles.items():
+            symbolique.ajouter_transition(source, Intervalles.depuis_symboles(valeurs), destination)
+        return symbolique
+
+    def vers_automate(self, limite: int = 1 << 16) -> Automate:
+        """Automate classique équivalent : un Alphabet et une Transition par caractère.
+
+        Lève ValueError si les étiquettes couvrent plus de `limite` caractères.
+        """
+        tous = Intervalles([b for sortantes in self.transitions for etiquette, _ in sortantes for b in etiquette])
+        if tous.taille() > limite:
+            raise ValueError(f"{tous.taille()} caractères distincts : trop pour un alphabet explicite")
+        automate = Automate(self.nom)
+        alphabets = {}
+        for c in tous.symboles():
+            alphabets[c] = Alphabet(len(alphabets) + 1, c)
+            automate.ajouter_alphabet(alphabets[c])
+        for e in range(self.nb_etats):
+            type_etat = []
+            if e in self.initiaux:
+                type_etat.append("initial")
+            if e in self.finaux:
+                type_etat.append("final")
+            automate.etats.append(Etat(e, f"q{e}", "_".join(type_etat) or "normal"))
+        for e, sortantes in enumerate(self.transitions):
+            for etiquette, d in sortantes:
+                for c in etiquette.symboles():
+                    automate.ajouter_transition(Transition(len(automate.transitions) + 1, automate.etats[e],
+                                                           automate.etats[d], alphabets[c]))
+        return automate
+
+    def to_dict(self) -> dict:
+        return {
+            "nom": self.nom,
+            "symbolique": True,
+            "nbEtats": self.nb_etats,
+            "initiaux": sorted(self.initiaux),
+            "finaux": sorted(self.finaux),
+            "transitions": [[e, [list(b) for b in etiquette], d]
+                            for e, sortantes in enumerate(self.transitions) for etiquette, d in sortantes],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AutomateSymbolique':
+        automate = cls(data["nom"])
+        for e in range(data["nbEtats"]):
+            automate.ajouter_etat()
+        automate.initiaux = set(data["initiaux"])
+        automate.finaux = set(data["finaux"])
+        for e, bornes, d in data["transitions"]:
+            automate.ajouter_transition(e, Intervalles(tuple(b) for b in bornes), d)
+        return automate
+
+    def sauvegarder_fichier(self, chemin):
+        with open(chemin, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=4, ensure_ascii=False)
+
+    @classmethod
+    def charger_fichier(cls, chemin) -> 'AutomateSymbolique':
+        with open(chemin, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def __str__(self):
+        lignes = [f"Automate symbolique {self.nom}",
+                  f"États: {self.nb_etats} (initiaux {sorted(self.initiaux)}, finaux {sorted(self.finaux)})"]
+        for e, sortantes in enumerate(self.transitions):
+            lignes.extend(f"  q{e} --{etiquette}--> q{d}" for etiquette, d in sortantes)
+        return "\n".join(lignes)
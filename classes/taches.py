@@ -0,0 +1,84 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+class OperationAnnulee(Exception):
+    """Levée par un algorithme quand son Controle a été annulé."""
+
+
+class Controle:
+    """Jeton transmis aux algorithmes longs : annulation coopérative et progression.
+
+    L'algorithme appelle `point()` régulièrement ; l'appel lève OperationAnnulee
+    si `annuler()` a été demandé depuis un autre thread. La progression est
+    simplement mémorisée (pas de rappel vers Tk depuis le thread de calcul) et
+    peut en plus être transmise à `progression(fait, total, message)`.
+    """
+
+    def __init__(self, progression: Optional[Callable[[int, Optional[int], str], None]] = None):
+        self._annule = threading.Event()
+        self.progression = progression
+        self.fait = 0
+        self.total: Optional[int] = None
+        self.message = ""
+
+    def annuler(self):
+        self._annule.set()
+
+    @property
+    def est_annule(self) -> bool:
+        return self._annule.is_set()
+
+    def verifier(self):
+        if self._annule.is_set():
+            raise OperationAnnulee()
+
+    def point(self, fait: Optional[int] = None, total: Optional[int] = None, message: Optional[str] = None):
+        """Point d'annulation ; met aussi à jour la progression si des valeurs sont fournies."""
+        if self._annule.is_set():
+            raise OperationAnnulee()
+        if fait is not None:
+            self.fait = fait
+        if total is not None:
+            self.total = total
+        if message is not None:
+            self.message = message
+        if self.progression is not None:
+            self.progression(self.fait, self.total, self.message)
+
+
+class Tache:
+    """Travail soumis à l'exécuteur : son futur et son Controle."""
+
+    def __init__(self, titre: str, futur: Future, controle: Controle):
+        self.titre = titre
+        self.futur = futur
+        self.controle = controle
+
+    def annuler(self):
+        self.controle.annuler()
+        self.futur.cancel()
+
+    def terminee(self) -> bool:
+        return self.futur.done()
+
+
+class ExecuteurTaches:
+    """Exécute les opérations lourdes hors du thread Tk.
+
+    Les fonctions soumises reçoivent l'argument nommé `controle`. L'interface
+    suit l'avancement en interrogeant `Tache.controle` et `Tache.futur` depuis
+    la boucle Tk (root.after), jamais l'inverse.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="automate")
+
+    def soumettre(self, titre: str, fonction: Callable, *args, **kwargs) -> Tache:
+        controle = Controle()
+        futur = self._pool.submit(fonction, *args, controle=controle, **kwargs)
+        return Tache(titre, futur, controle)
+
+    def arreter(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
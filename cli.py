@@ -0,0 +1,464 @@
+"""Interface en ligne de commande, sans interface graphique.
+
+N'importe ni tkinter ni main.py : utilisable dans un conteneur sans serveur X.
+Chaque résultat est écrit sur la sortie standard sous forme d'une ligne JSON.
+
+Exemples :
+    python cli.py stats automates/
+    python cli.py minimiser automates/ --jobs 4 --sortie resultats/
+    python cli.py tester automates/testminim2.json --mot 0101 --mot 11
+    python cli.py equivalence automates/a.json automates/ --longueur 8
+    python cli.py equivalence automates/a.json automates/ --methode antichaines --simulation
+    python cli.py minimiser_nfa automates/ --methode auto --sortie resultats/
+    python cli.py classes automates/
+    python cli.py regex "(a|b)*abb" --nom abb --sortie automates/
+    python cli.py regex "[a-zA-Z_][a-zA-Z0-9_]*" --symbolique
+    python cli.py dictionnaire mots_tries.txt --sortie mots.autc
+    python cli.py chercher --regex "ERROR [0-9]+" --texte /var/log/app.log
+    python cli.py --metriques mesures.json minimiser automates/
+    python cli.py --jobs 8 determiniser_parallele automates/afn.json --sortie afd.autc
+    python cli.py determiniser_borne automates/afn.json --memoire-max 512 --sortie afd.autc
+    python cli.py --jobs 8 corpus automates/abb.json mots.txt --sortie resultats.txt
+    python cli.py serveur --socket /tmp/automates.sock --dossier automates/
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Iterable, List
+
+from classes.Automate import METHODES_EQUIVALENCE, Automate
+from classes.catalogue import Catalogue
+from classes.corpus import TAILLE_MORCEAU, tester_corpus
+from classes.metriques import REGISTRE
+from classes.minimisation import METHODES as MINIMISATIONS
+from classes.security import SecurityManager
+from classes.serveur import ServeurAutomates
+from classes.symbolique import AutomateSymbolique
+
+
+def _completer(automate: Automate) -> Automate:
+    automate.completer_automate()
+    # Comme les autres transformations (_AFD, _minimal...) : jamais le nom du fichier source
+    automate.nom = f"{automate.nom}_complet"
+    return automate
+
+
+def _minimiser(automate: Automate) -> Automate:
+    # Hopcroft suppose un AFD : les AFN (regex, Glushkov, Thompson) sont d'abord déterminisés
+    if not automate.est_deterministe():
+        automate = automate.determiniser()
+    return automate.minimiser_auto()
+
+
+# Mots par tâche quand un seul automate est testé sur beaucoup de mots
+TAILLE_LOT = 10000
+
+TRANSFORMATIONS = {
+    "determiniser": Automate.determiniser,
+    "eliminer_epsilon": Automate.eliminer_epsilon,
+    "minimiser": _minimiser,
+    "completer": _completer,
+    "complementer": Automate.complementer,
+}
+
+
+def lister_fichiers(chemins: Iterable[str]) -> List[str]:
+    """Développe les dossiers en la liste triée de leurs fichiers .json."""
+    fichiers = []
+    for chemin in chemins:
+        if os.path.isdir(chemin):
+            fichiers.extend(sorted(str(p) for p in Path(chemin).glob("*.json")))
+        else:
+            fichiers.append(chemin)
+    return fichiers
+
+
+def resume(automate: Automate) -> dict:
+    return {
+        "nom": automate.nom,
+        "nb_etats": len(automate.etats),
+        "nb_transitions": len(automate.transitions),
+        "nb_symboles": len(automate.alphabets),
+    }
+
+
+def transformer(operation: str, chemin: str, sortie: str = None) -> dict:
+    resultat = TRANSFORMATIONS[operation](Automate.charger_fichier(chemin))
+    ligne = {"fichier": chemin, "operation": operation, **resume(resultat)}
+    if sortie:
+        destination = os.path.join(sortie, f"{resultat.nom}.json")
+        if os.path.abspath(destination) == os.path.abspath(chemin):
+            raise ValueError(f"{destination} écraserait le fichier source")
+        resultat.sauvegarder_fichier(destination)
+        ligne["sortie"] = destination
+    return ligne
+
+
+def tester(chemin: str, mots: List[str]) -> List[dict]:
+    automate = Automate.charger_fichier(chemin)
+    return [{"fichier": chemin, "operation": "tester", "mot": mot, "accepte": automate.reconnait_mot(mot)}
+            for mot in mots]
+
+
+def tester_fige(fige, chemin: str, mots: List[str]) -> List[dict]:
+    return [{"fichier": chemin, "operation": "tester", "mot": mot, "accepte": fige.reconnait_mot(mot)}
+            for mot in mots]
+
+
+def tester_partage(executeur, chemin: str, mots: List[str]):
+    """Un automate, beaucoup de mots : figé une fois en mémoire partagée, les processus ne reçoivent que son nom."""
+    try:
+        fige = Automate.charger_fichier(chemin).figer()
+    except (OSError, ValueError, KeyError):
+        # Symboles de plusieurs caractères ou fichier invalide : chemin habituel
+        resultat = _executer(tester, chemin, (chemin, mots))
+        yield from (resultat if isinstance(resultat, list) else [resultat])
+        return
+    with fige:
+        lots = [mots[i:i + TAILLE_LOT] for i in range(0, len(mots), TAILLE_LOT)]
+        for groupe in _carte(executeur)(tester_fige, repeat(fige), repeat(chemin), lots):
+            yield from groupe
+
+
+def equivalence(reference: str, chemin: str, longueur: int, methode: str = "produit",
+                simulation: bool = False) -> dict:
+    equivalent, message = Automate.sont_equivalents(
+        Automate.charger_fichier(reference), Automate.charger_fichier(chemin), longueur,
+        methode=methode, simulation=simulation)
+    return {"fichier": chemin, "reference": reference, "operation": "equivalence", "methode": methode,
+            "equivalent": equivalent, "message": message}
+
+
+def minimiser_nfa(chemin: str, methode: str, sortie: str = None) -> dict:
+    minimal, rapport = Automate.charger_fichier(chemin).minimiser_nfa(methode)
+    ligne = {"fichier": chemin, "operation": "minimiser_nfa", "methode": rapport["methode"],
+             "raison": rapport["raison"], **resume(minimal)}
+    if sortie:
+        destination = os.path.join(sortie, f"{minimal.nom}.json")
+        minimal.sauvegarder_fichier(destination)
+        ligne["sortie"] = destination
+    return ligne
+
+
+def _initialiser_travailleur(metriques: bool, memoire: bool):
+    if metriques:
+        REGISTRE.activer(memoire)
+
+
+def regex(expr: str, methode: str, nom: str = None, sortie: str = None, symbolique: bool = False) -> dict:
+    if symbolique:
+        # Transitions étiquetées par intervalles : '.' et '[^...]' sans alphabet explicite
+        automate = AutomateSymbolique.depuis_regex(expr, nom)
+        ligne = {"expression": expr, "operation": "regex", "methode": "glushkov", "symbolique": True,
+                 "nom": automate.nom, "nb_etats": automate.nb_etats, "nb_transitions": automate.nb_transitions,
+                 "nb_intervalles": automate.nb_intervalles}
+    else:
+        automate = Automate.depuis_regex(expr, methode, nom)
+        ligne = {"expression": expr, "operation": "regex", "methode": methode, **resume(automate)}
+    if sortie:
+        # Extension distincte : le catalogue ne lit que les automates classiques (*.json)
+        destination = os.path.join(sortie, f"{automate.nom}.{'symb' if symbolique else 'json'}")
+        automate.sauvegarder_fichier(destination)
+        ligne["sortie"] = destination
+    return ligne
+
+
+def dictionnaire(chemin: str, trier: bool, sortie: str = None) -> dict:
+    """AFD minimal d'un fichier de mots (un par ligne), stocké sous forme compacte."""
+    with open(chemin, "r", encoding="utf-8") as f:
+        mots = (ligne.rstrip("\r\n") for ligne in f)
+        compact = Automate.depuis_mots(sorted(mots) if trier else mots, Path(chemin).stem)
+    ligne = {"fichier": chemin, "operation": "dictionnaire", "nom": compact.nom, "nb_etats": compact.nb_etats,
+             "nb_transitions": compact.nb_transitions, "octets": compact.taille_memoire()}
+    if sortie:
+        compact.sauvegarder_fichier(sortie)
+        ligne["sortie"] = sortie
+    return ligne
+
+
+def chercher(automate: Automate, chemins: List[str], longueur_max: int = None, texte: bool = False):
+    """Occurrences dans chaque fichier (lu par mmap), au fil de l'eau."""
+    from classes.scanner import scanner_fichier
+    for chemin in chemins:
+        try:
+            with open(chemin, "rb") as f:
+                for debut, fin in scanner_fichier(automate, chemin, longueur_max):
+                    ligne = {"fichier": chemin, "operation": "chercher", "debut": debut, "fin": fin}
+                    if texte:
+                        f.seek(debut)
+                        ligne["texte"] = f.read(fin - debut).decode("latin-1")
+                    yield ligne
+        except OSError as e:
+            yield {"fichier": chemin, "erreur": f"{type(e).__name__}: {e}"}
+
+
+def _executer(fonction, fichier, args):
+    """Exécute une tâche en transformant les exceptions en lignes d'erreur."""
+    try:
+        return fonction(*args)
+    except Exception as e:
+        return {"fichier": fichier, "erreur": f"{type(e).__name__}: {e}"}
+
+
+def _avec_metriques(fonction, *args):
+    """Dans un processus de travail : le résultat et les mesures de cette seule tâche."""
+    REGISTRE.reinitialiser()
+    resultat = fonction(*args)
+    return resultat, REGISTRE.exporter()
+
+
+def _carte(executeur):
+    """map ordonné sur le pool ; les mesures des processus de travail sont fusionnées dans REGISTRE."""
+    if executeur is None:
+        return map
+
+    def carte(fonction, *iterables):
+        if not REGISTRE.actif:
+            yield from executeur.map(fonction, *iterables)
+            return
+        for resultat, metriques in executeur.map(_avec_metriques, repeat(fonction), *iterables):
+            REGISTRE.fusionner(metriques)
+            yield resultat
+    return carte
+
+
+def _appliquer(executeur, fonction, fichiers, liste_args):
+    """Résultats dans l'ordre des fichiers, produits au fur et à mesure."""
+    return _carte(executeur)(_executer, repeat(fonction), fichiers, liste_args)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Opérations sur les automates, sans interface graphique.")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="nombre de processus (1 = pas de pool)")
+    parser.add_argument("--metriques", help="fichier JSON où écrire les mesures par opération (temps, compteurs)")
+    parser.add_argument("--memoire", action="store_true", help="avec --metriques, relever aussi le pic mémoire")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+
+    for operation in TRANSFORMATIONS:
+        p = commandes.add_parser(operation, help=f"{operation} chaque automate")
+        p.add_argument("chemins", nargs="+", help="fichiers .json ou dossiers")
+        p.add_argument("--sortie", help="dossier où écrire les automates résultats")
+
+    p = commandes.add_parser("tester", help="tester des mots")
+    p.add_argument("chemins", nargs="+")
+    p.add_argument("--mot", action="append", default=[], help="mot à tester (répétable)")
+    p.add_argument("--mots", help="fichier contenant un mot par ligne")
+
+    p = commandes.add_parser("equivalence", help="comparer une référence à d'autres automates")
+    p.add_argument("reference")
+    p.add_argument("chemins", nargs="+")
+    p.add_argument("--longueur", type=int, default=5, help="longueur maximale des mots explorés (méthode produit)")
+    p.add_argument("--methode", choices=METHODES_EQUIVALENCE, default="produit",
+                   help="antichaines : comparaison exacte des langages d'AFN, avec contre-exemple")
+    p.add_argument("--simulation", action="store_true", help="élagage par simulation (méthode antichaines)")
+
+    p = commandes.add_parser("minimiser_nfa", help="AFD minimal d'AFN (classique, Brzozowski ou choix automatique)")
+    p.add_argument("chemins", nargs="+", help="fichiers .json ou dossiers")
+    p.add_argument("--methode", choices=MINIMISATIONS, default="auto")
+    p.add_argument("--sortie", help="dossier où écrire les automates résultats")
+
+    p = commandes.add_parser("regex", help="compiler des expressions régulières")
+    p.add_argument("expressions", nargs="+")
+    p.add_argument("--methode", choices=["glushkov", "thompson"], default="glushkov")
+    p.add_argument("--nom", help="nom de l'automate (une seule expression)")
+    p.add_argument("--symbolique", action="store_true", help="transitions étiquetées par intervalles de caractères")
+    p.add_argument("--sortie", help="dossier où écrire les automates")
+
+    p = commandes.add_parser("dictionnaire", help="AFD minimal acyclique d'une liste de mots")
+    p.add_argument("fichier", help="un mot par ligne, trié (sinon --trier)")
+    p.add_argument("--trier", action="store_true", help="trier les mots en mémoire avant la construction")
+    p.add_argument("--sortie", help="fichier binaire compact à écrire")
+
+    p = commandes.add_parser("chercher", help="occurrences (plus à gauche, plus longues) dans des fichiers")
+    p.add_argument("chemins", nargs="+", help="fichiers à parcourir")
+    motif = p.add_mutually_exclusive_group(required=True)
+    motif.add_argument("--automate", help="fichier .json de l'automate")
+    motif.add_argument("--regex", help="expression régulière")
+    p.add_argument("--longueur-max", type=int, help="longueur maximale d'une occurrence")
+    p.add_argument("--texte", action="store_true", help="inclure le texte de chaque occurrence")
+
+    p = commandes.add_parser("determiniser_parallele", help="construction des sous-ensembles sur --jobs processus")
+    p.add_argument("chemins", nargs="+", help="fichiers .json ou dossiers")
+    p.add_argument("--sortie", help="dossier où écrire les AFD (format compact .autc)")
+
+    p = commandes.add_parser("determiniser_borne", help="construction des sous-ensembles à mémoire bornée (débordement sqlite)")
+    p.add_argument("chemins", nargs="+", help="fichiers .json ou dossiers")
+    p.add_argument("--memoire-max", type=int, default=256, help="plafond des tables de construction, en Mio")
+    p.add_argument("--temporaire", help="dossier du fichier sqlite temporaire")
+    p.add_argument("--sortie", help="dossier où écrire les AFD (format compact .autc)")
+
+    p = commandes.add_parser("corpus", help="tester chaque ligne d'un très grand fichier de mots")
+    p.add_argument("automate", help="fichier .json de l'automate")
+    p.add_argument("fichier", help="un mot par ligne")
+    p.add_argument("--sortie", required=True, help="fichier des résultats (1/0 par ligne, puis les totaux)")
+    p.add_argument("--avec-mots", action="store_true", help="recopier chaque mot après son résultat")
+    p.add_argument("--morceau", type=int, default=TAILLE_MORCEAU, help="taille des morceaux en octets")
+
+    p = commandes.add_parser("serveur", help="servir la reconnaissance de mots sur une socket Unix")
+    p.add_argument("--socket", default="automates.sock", help="chemin de la socket Unix")
+    p.add_argument("--dossier", default="automates", help="dossier des automates")
+    p.add_argument("--capacite", type=int, default=32, help="automates compilés gardés en mémoire (LRU)")
+    p.add_argument("--fenetre", type=float, default=0.002,
+                   help="secondes pendant lesquelles les requêtes d'un même automate sont regroupées")
+    p.add_argument("--sans-securite", action="store_true", help="ne pas exiger les mots de passe des automates protégés")
+
+    p = commandes.add_parser("stats", help="statistiques (via le catalogue pour les dossiers)")
+    p.add_argument("chemins", nargs="+")
+
+    p = commandes.add_parser("classes", help="regrouper les automates équivalents d'un dossier")
+    p.add_argument("dossiers", nargs="+")
+
+    args = parser.parse_args(argv)
+    if getattr(args, "sortie", None) and args.commande not in ("dictionnaire", "corpus"):
+        os.makedirs(args.sortie, exist_ok=True)
+
+    if args.commande == "serveur":
+        return serveur(args)
+    if args.commande == "corpus":
+        return corpus(args)
+    if args.commande in ("determiniser_parallele", "determiniser_borne"):
+        return determiniser_compact(args)
+    if args.metriques:
+        REGISTRE.activer(args.memoire)
+    executeur = None
+    if args.jobs > 1:
+        executeur = ProcessPoolExecutor(max_workers=args.jobs, initializer=_initialiser_travailleur,
+                                        initargs=(bool(args.metriques), args.memoire))
+    erreurs = 0
+    try:
+        if args.commande in TRANSFORMATIONS:
+            fichiers = lister_fichiers(args.chemins)
+            lignes = _appliquer(executeur, transformer, fichiers, [(args.commande, f, args.sortie) for f in fichiers])
+        elif args.commande == "tester":
+            mots = list(args.mot)
+            if args.mots:
+                with open(args.mots, "r", encoding="utf-8") as f:
+                    mots.extend(ligne.rstrip("\r\n") for ligne in f)
+            fichiers = lister_fichiers(args.chemins)
+            if executeur is not None and len(fichiers) == 1 and len(mots) > TAILLE_LOT:
+                lignes = tester_partage(executeur, fichiers[0], mots)
+            else:
+                lignes = (l for groupe in _appliquer(executeur, tester, fichiers, [(f, mots) for f in fichiers])
+                          for l in (groupe if isinstance(groupe, list) else [groupe]))
+        elif args.commande == "equivalence":
+            fichiers = lister_fichiers(args.chemins)
+            lignes = _appliquer(executeur, equivalence, fichiers, [(args.reference, f, args.longueur, args.methode, args.simulation) for f in fichiers])
+        elif args.commande == "minimiser_nfa":
+            fichiers = lister_fichiers(args.chemins)
+            lignes = _appliquer(executeur, minimiser_nfa, fichiers, [(f, args.methode, args.sortie) for f in fichiers])
+        elif args.commande == "regex":
+            if args.nom and len(args.expressions) > 1:
+                parser.error("--nom n'est possible qu'avec une seule expression")
+            noms = [args.nom or f"regex_{i + 1}" for i in range(len(args.expressions))]
+            lignes = _appliquer(executeur, regex, args.expressions,
+                                [(e, args.methode, n, args.sortie, args.symbolique)
+                                 for e, n in zip(args.expressions, noms)])
+        elif args.commande == "dictionnaire":
+            lignes = [_executer(dictionnaire, args.fichier, (args.fichier, args.trier, args.sortie))]
+        elif args.commande == "chercher":
+            automate = (Automate.depuis_regex(args.regex) if args.regex
+                        else Automate.charger_fichier(args.automate))
+            lignes = chercher(automate, args.chemins, args.longueur_max, args.texte)
+        elif args.commande == "classes":
+            lignes = classes(args.dossiers, executeur)
+        else:
+            lignes = stats(args.chemins, executeur)
+
+        for ligne in lignes:
+            erreurs += "erreur" in ligne
+            sys.stdout.write(json.dumps(ligne, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+    finally:
+        if executeur is not None:
+            executeur.shutdown()
+    if args.metriques:
+        with open(args.metriques, "w", encoding="utf-8") as f:
+            json.dump(REGISTRE.exporter(), f, indent=4, ensure_ascii=False)
+    return 1 if erreurs else 0
+
+
+def determiniser_compact(args) -> int:
+    """Un fichier à la fois : chaque déterminisation occupe déjà les --jobs processus ou le plafond mémoire."""
+    erreurs = 0
+    for chemin in lister_fichiers(args.chemins):
+        ligne = {"fichier": chemin, "operation": args.commande}
+        try:
+            automate = Automate.charger_fichier(chemin)
+            if args.commande == "determiniser_parallele":
+                ligne["jobs"] = args.jobs
+                compact = automate.determiniser_parallele(args.jobs)
+            else:
+                statistiques = {}
+                compact = automate.determiniser_borne(args.memoire_max << 20, statistiques.update, args.temporaire)
+                ligne["debordement"] = statistiques
+            ligne.update({"nom": compact.nom, "nb_etats": compact.nb_etats, "nb_transitions": compact.nb_transitions,
+                          "octets": compact.taille_memoire()})
+            if args.sortie:
+                destination = os.path.join(args.sortie, f"{compact.nom}.autc")
+                compact.sauvegarder_fichier(destination)
+                ligne["sortie"] = destination
+        except (OSError, ValueError, KeyError) as e:
+            ligne["erreur"] = f"{type(e).__name__}: {e}"
+            erreurs += 1
+        sys.stdout.write(json.dumps(ligne, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+    return 1 if erreurs else 0
+
+
+def corpus(args) -> int:
+    """Le runner gère son propre pool : l'automate y est installé une fois par processus."""
+    ligne = {"fichier": args.fichier, "operation": "corpus", "automate": args.automate, "sortie": args.sortie}
+    try:
+        ligne.update(tester_corpus(Automate.charger_fichier(args.automate), args.fichier, args.sortie,
+                                   args.jobs, args.morceau, args.avec_mots))
+    except (OSError, ValueError, KeyError) as e:
+        ligne["erreur"] = f"{type(e).__name__}: {e}"
+    sys.stdout.write(json.dumps(ligne, ensure_ascii=False) + "\n")
+    return 1 if "erreur" in ligne else 0
+
+
+def serveur(args) -> int:
+    """Sert jusqu'à Ctrl+C ; le pool de processus n'est pas utilisé (les lots tournent dans le serveur)."""
+    security = None if args.sans_securite else SecurityManager()
+    service = ServeurAutomates(args.dossier, security, args.capacite, args.fenetre)
+    try:
+        asyncio.run(service.servir(args.socket))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def stats(chemins: List[str], executeur=None):
+    """Statistiques par automate ; les dossiers passent par leur catalogue (mise à jour incrémentale)."""
+    carte = _carte(executeur)
+    for chemin in chemins:
+        if os.path.isdir(chemin):
+            catalogue = Catalogue(chemin)
+            catalogue.rafraichir(carte)
+            for nom in catalogue.noms():
+                yield {"fichier": os.path.join(chemin, f"{nom}.json"), "operation": "stats", **catalogue.entree(nom)}
+        else:
+            try:
+                yield {"fichier": chemin, "operation": "stats", **Catalogue.analyser(chemin)}
+            except OSError as e:
+                yield {"fichier": chemin, "erreur": f"{type(e).__name__}: {e}"}
+
+
+def classes(dossiers: List[str], executeur=None):
+    """Classes d'équivalence de langage, via les hashs canoniques mis en cache dans le catalogue."""
+    carte = _carte(executeur)
+    for dossier in dossiers:
+        catalogue = Catalogue(dossier)
+        catalogue.rafraichir(carte)
+        for groupe in catalogue.classes_equivalence(carte):
+            yield {"dossier": dossier, "operation": "classes", "taille": len(groupe), "automates": groupe}
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,25 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, Menu
+from tkinter import ttk, messagebox, simpledialog, filedialog, Menu
 import json
 import os
 import random
 import math
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from datetime import datetime
+from concurrent.futures import CancelledError
 
 from classes.security import SecurityManager
+from classes.catalogue import Catalogue
+from classes.corpus import tester_corpus
+from classes.historique import Historique
+from classes.rendu import RenduAutomate
+from classes.taches import ExecuteurTaches, OperationAnnulee
+from classes.metriques import REGISTRE
 from classes.Alphabet import Alphabet
 from classes.Etat import Etat
 from classes.Transition import Transition
-from classes.Automate import Automate
+from classes.Automate import METHODES_EQUIVALENCE, Automate
 
 
 class ModernAutomateApp:
@@ -24,6 +31,11 @@ class ModernAutomateApp:
         self.root.title("Automata - ENSAM CASA")
         self.automate_courant: Optional[Automate] = None
         self.security = SecurityManager()
+        self.catalogue = Catalogue("automates", self.security)
+        self._details_planifies = False
+        self.executeur = ExecuteurTaches()
+        # Instantanés en O(1) : pas de copie de l'automate à chaque étape
+        self.historique = Historique()
         self.colors = {
             "primary": "#4a6fa5",
             "secondary": "#f8f9fa",
@@ -183,8 +195,39 @@ class ModernAutomateApp:
 
         self.canvas = tk.Canvas(visu_frame, bg=self.colors["canvas_bg"], bd=1, relief="solid")
         self.canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.rendu = RenduAutomate(self.canvas, self.colors)
         self.canvas.bind("<Configure>", self.on_canvas_resize)
 
+        # Onglet Performance
+        perf_frame = ttk.Frame(notebook, style='TFrame')
+        notebook.add(perf_frame, text="Performance")
+
+        perf_outils = ttk.Frame(perf_frame, style='TFrame')
+        perf_outils.pack(fill=tk.X, padx=5, pady=5)
+        self.metriques_actives = tk.BooleanVar(value=REGISTRE.actif)
+        self.metriques_memoire = tk.BooleanVar(value=REGISTRE.memoire)
+        ttk.Checkbutton(perf_outils, text="Mesurer les opérations", variable=self.metriques_actives,
+                        command=self.basculer_metriques).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(perf_outils, text="Pic mémoire (plus lent)", variable=self.metriques_memoire,
+                        command=self.basculer_metriques).pack(side=tk.LEFT, padx=5)
+        ttk.Button(perf_outils, text="Actualiser", command=self.afficher_metriques,
+                   style='TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(perf_outils, text="Réinitialiser", command=self.reinitialiser_metriques,
+                   style='TButton').pack(side=tk.LEFT, padx=5)
+
+        self.text_metriques = tk.Text(
+            perf_frame,
+            wrap=tk.NONE,
+            font=('Consolas', 10),
+            bg=self.colors["canvas_bg"],
+            fg=self.colors["text"],
+            bd=1,
+            relief="solid"
+        )
+        self.text_metriques.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        notebook.bind("<<NotebookTabChanged>>",
+                      lambda e: self.afficher_metriques() if notebook.index("current") == 2 else None)
+
         # Barre d'outils en bas
         tool_frame = ttk.Frame(self.root, style='TFrame')
         tool_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
@@ -209,17 +252,28 @@ class ModernAutomateApp:
         automate_menu = Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Automates", menu=automate_menu)
         automate_menu.add_command(label="Créer un nouvel automate", command=self.creer_automate)
+        automate_menu.add_command(label="Créer depuis une expression régulière...", command=self.creer_depuis_regex)
         automate_menu.add_command(label="Ouvrir et charger un automate...", command=self.charger_automate_menu)
         automate_menu.add_command(label="Sauvegarder l'automate actuel", command=self.sauvegarder_automate)
         automate_menu.add_command(label="Modifier l'automate actuel", command=self.modifier_automate)
         automate_menu.add_separator()
         automate_menu.add_command(label="Quitter", command=self.root.quit)
 
+        # Menu Édition
+        self.edition_menu = Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Édition", menu=self.edition_menu)
+        self.edition_menu.add_command(label="Annuler", command=self.annuler, accelerator="Ctrl+Z")
+        self.edition_menu.add_command(label="Rétablir", command=self.retablir, accelerator="Ctrl+Y")
+        self.root.bind_all("<Control-z>", lambda event: self.annuler())
+        self.root.bind_all("<Control-y>", lambda event: self.retablir())
+        self.actualiser_menu_edition()
+
         # Menu Analyse
         analyse_menu = Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Analyse", menu=analyse_menu)
         analyse_menu.add_command(label="Vérifier si un automate est déterministe", command=self.verifier_determinisme)
         analyse_menu.add_command(label="Transformer un AFN en AFD", command=self.transformer_afn_afd)
+        analyse_menu.add_command(label="Éliminer les ε-transitions", command=self.eliminer_epsilon)
         analyse_menu.add_command(label="Vérifier si un automate est complet", command=self.verifier_complet)
         analyse_menu.add_command(label="Compléter un automate", command=self.completer_automate)
         analyse_menu.add_command(label="Vérifier si un automate est minimal", command=self.verifier_minimal)
@@ -229,7 +283,9 @@ class ModernAutomateApp:
         avancee_menu = Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Avancée", menu=avancee_menu)
         avancee_menu.add_command(label="Tester si un mot est reconnu", command=self.tester_mot)
+        avancee_menu.add_command(label="Tester un fichier de mots", command=self.tester_fichier_mots)
         avancee_menu.add_command(label="Générer mots acceptés (longueur max)", command=self.generer_mots_acceptes)
+        avancee_menu.add_command(label="Analyser le langage reconnu", command=self.analyser_langage)
         avancee_menu.add_command(label="Tester l'équivalence entre deux automates", command=self.tester_equivalence)
         avancee_menu.add_command(label="Calculer Union de deux automates", command=self.calculerunion)
         avancee_menu.add_command(label="Calculer Intersection de deux automates", command=self.calculer_intersection)
@@ -242,99 +298,143 @@ class ModernAutomateApp:
         security_menu.add_command(label="Afficher les informations de sécurité", command=self.afficher_infos_securite)
         security_menu.add_command(label="Changer le mot de passe", command=self.changer_mot_de_passe)
 
+    def basculer_metriques(self):
+        """Active ou désactive la mesure des opérations d'Automate."""
+        if self.metriques_actives.get():
+            REGISTRE.activer(memoire=self.metriques_memoire.get())
+        else:
+            REGISTRE.desactiver()
+            self.metriques_memoire.set(False)
+        self.afficher_metriques()
+
+    def reinitialiser_metriques(self):
+        REGISTRE.reinitialiser()
+        self.afficher_metriques()
+
+    def afficher_metriques(self):
+        """Affiche, par opération, le nombre d'appels, le temps cumulé, le pic mémoire et les compteurs."""
+        self.text_metriques.delete(1.0, tk.END)
+        operations = REGISTRE.exporter()
+        if not REGISTRE.actif and not operations:
+            self.text_metriques.insert(tk.END, "Mesures désactivées : cochez « Mesurer les opérations ».\n")
+            return
+        self.text_metriques.insert(tk.END, f"{'Opération':<26}{'Appels':>8}{'Total (s)':>12}{'Moyen (ms)':>12}{'Pic mém.':>12}\n")
+        self.text_metriques.insert(tk.END, "-" * 70 + "\n")
+        for nom, m in sorted(operations.items(), key=lambda x: -x[1]["secondes"]):
+            moyen = 1000 * m["secondes"] / m["appels"] if m["appels"] else 0
+            pic = f"{m['pic_memoire'] / 1024:.0f} Ko" if m["pic_memoire"] else "-"
+            self.text_metriques.insert(tk.END, f"{nom:<26}{m['appels']:>8}{m['secondes']:>12.4f}{moyen:>12.2f}{pic:>12}\n")
+            for cle, valeur in sorted(m["compteurs"].items()):
+                self.text_metriques.insert(tk.END, f"    {cle} : {valeur}\n")
+
     def on_canvas_resize(self, event=None):
-        """Redessine l'automate quand le canvas change de taille."""
-        self.dessiner_automate()
+        """Repositionne l'automate quand le canvas change de taille (au plus toutes les 50 ms)."""
+        self.rendu.redimensionner(event)
 
     def dessiner_automate(self):
-        """Dessine l'automate actuel sur le canvas (états, transitions, etc.)."""
-        self.canvas.delete("all")
-        if not self.automate_courant:
+        """Planifie le dessin de l'automate actuel sur le canvas (états, transitions, etc.)."""
+        self.rendu.afficher(self.automate_courant)
+
+    def rafraichir_vue(self):
+        """Planifie la mise à jour des détails et du dessin après une modification."""
+        self.planifier_details()
+        self.dessiner_automate()
+
+    def memoriser(self, avant: Optional[Automate], libelle: str):
+        """Ajoute à l'historique l'état `avant` (instantané pris juste avant l'opération `libelle`)."""
+        self.historique.enregistrer(avant, libelle)
+        self.actualiser_menu_edition()
+
+    def remplacer_automate(self, automate: Optional[Automate], libelle: str):
+        """Remplace l'automate actuel par le résultat d'un algorithme, de façon annulable."""
+        self.memoriser(self.automate_courant, libelle)
+        self.automate_courant = automate
+
+    def ouvrir_automate(self, automate: Optional[Automate]):
+        """Nouvel automate de travail (création, chargement) : l'historique repart de zéro."""
+        self.automate_courant = automate
+        self.historique.vider()
+        self.actualiser_menu_edition()
+
+    def actualiser_menu_edition(self):
+        for indice, (libelle, possible) in enumerate([
+                ("Annuler", self.historique.libelle_annuler()),
+                ("Rétablir", self.historique.libelle_retablir())]):
+            self.edition_menu.entryconfig(indice, label=f"{libelle} : {possible}" if possible else libelle,
+                                          state=tk.NORMAL if possible else tk.DISABLED)
+
+    def annuler(self):
+        if not self.historique.peut_annuler:
+            return
+        self.automate_courant = self.historique.annuler(self.automate_courant)
+        self.actualiser_menu_edition()
+        self.rafraichir_vue()
+
+    def retablir(self):
+        if not self.historique.peut_retablir:
             return
+        self.automate_courant = self.historique.retablir(self.automate_courant)
+        self.actualiser_menu_edition()
+        self.rafraichir_vue()
+
+    def lancer_tache(self, titre: str, fonction: Callable, *args, succes: Callable, erreur: str = "Erreur", parent=None):
+        """Exécute `fonction` hors du thread Tk avec une fenêtre de progression et un bouton Annuler.
+
+        `succes(resultat)` est appelé dans le thread Tk quand le calcul se termine.
+        """
+        parent = parent or self.root
+        tache = self.executeur.soumettre(titre, fonction, *args)
+
+        dialog = tk.Toplevel(parent)
+        dialog.title(titre)
+        dialog.transient(parent)
+        dialog.grab_set()
+        dialog.configure(bg=self.colors["secondary"])
+        dialog_frame = ttk.Frame(dialog, padding="10", style='TFrame')
+        dialog_frame.pack(fill=tk.BOTH, expand=True)
+
+        message_var = tk.StringVar(value="Calcul en cours...")
+        ttk.Label(dialog_frame, textvariable=message_var, style='TLabel').pack(fill=tk.X, pady=(0, 5))
+        barre = ttk.Progressbar(dialog_frame, mode="indeterminate", length=300)
+        barre.pack(fill=tk.X, pady=5)
+
+        def annuler():
+            tache.annuler()
+            message_var.set("Annulation en cours...")
+
+        ttk.Button(dialog_frame, text="Annuler", command=annuler, style='TButton').pack(pady=(5, 0))
+        dialog.protocol("WM_DELETE_WINDOW", annuler)
 
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-        center_x, center_y = canvas_width // 2, canvas_height // 2
-        num_etats = len(self.automate_courant.etats)
-        state_radius = 30
-        layout_radius = min(center_x, center_y) * 0.7
-
-        if num_etats == 0:
-            return
-
-        etat_pos = {}
-        transitions_grouped = {}
-        for t in self.automate_courant.transitions:
-            key = (t.source.id, t.destination.id)
-            if key not in transitions_grouped:
-                transitions_grouped[key] = []
-            transitions_grouped[key].append(t.alphabet.valeur)
-
-        for i, etat in enumerate(self.automate_courant.etats):
-            angle = (2 * math.pi / num_etats) * i if num_etats > 1 else 0
-            x = center_x + layout_radius * math.cos(angle)
-            y = center_y + layout_radius * math.sin(angle)
-            etat_pos[etat.id] = (x, y)
-
-            outline_color = self.colors["primary"] if "initial" in etat.type else self.colors["text"]
-            fill_color = self.colors["secondary"] if "final" not in etat.type else self.colors["final_state_bg"]
-            self.canvas.create_oval(x - state_radius, y - state_radius, x + state_radius, y + state_radius,
-                                   outline=outline_color, fill=fill_color, width=2)
-            self.canvas.create_text(x, y, text=etat.label, font=('Arial', 10, 'bold'), fill=self.colors["text"])
-
-            if "initial" in etat.type:
-                arrow_length = 20
-                arrow_end_x = x - state_radius * math.cos(angle)
-                arrow_end_y = y - state_radius * math.sin(angle)
-                arrow_start_x = x - (state_radius + arrow_length) * math.cos(angle)
-                arrow_start_y = y - (state_radius + arrow_length) * math.sin(angle)
-                self.canvas.create_line(arrow_start_x, arrow_start_y, arrow_end_x, arrow_end_y,
-                                       arrow=tk.LAST, width=2, fill=self.colors["primary"])
-
-            if "final" in etat.type:
-                inner_radius = state_radius - 5
-                self.canvas.create_oval(x - inner_radius, y - inner_radius, x + inner_radius, y + inner_radius,
-                                       outline=self.colors["text"], width=2)
-
-        for (src_id, dest_id), symbols in transitions_grouped.items():
-            src_x, src_y = etat_pos[src_id]
-            dest_x, dest_y = etat_pos[dest_id]
-            label = ', '.join(symbols)
-
-            if src_id == dest_id:
-                loop_radius = state_radius * 0.8
-                loop_center_x = src_x + state_radius * 0.8
-                loop_center_y = src_y - state_radius * 0.8
-                bbox = (loop_center_x - loop_radius, loop_center_y - loop_radius,
-                        loop_center_x + loop_radius, loop_center_y + loop_radius)
-                self.canvas.create_arc(bbox, start=225, extent=270, style=tk.ARC, outline=self.colors["text"], width=2)
-
-                arrow_angle = math.radians(225 + 270 - 10)
-                arrow_x = loop_center_x + loop_radius * math.cos(arrow_angle)
-                arrow_y = loop_center_y - loop_radius * math.sin(arrow_angle)
-                self.canvas.create_line(arrow_x, arrow_y, arrow_x - 5, arrow_y + 5, arrow=tk.LAST, width=2, fill=self.colors["text"])
-                self.canvas.create_text(loop_center_x, loop_center_y - loop_radius - 5,
-                                       text=label, font=('Arial', 9), fill=self.colors["text"])
+        def suivre():
+            controle = tache.controle
+            if controle.total:
+                barre.config(mode="determinate", maximum=controle.total, value=controle.fait)
             else:
-                angle = math.atan2(dest_y - src_y, dest_x - src_x)
-                arrow_start_x = src_x + state_radius * math.cos(angle)
-                arrow_start_y = src_y + state_radius * math.sin(angle)
-                arrow_end_x = dest_x - state_radius * math.cos(angle)
-                arrow_end_y = dest_y - state_radius * math.sin(angle)
-                self.canvas.create_line(arrow_start_x, arrow_start_y, arrow_end_x, arrow_end_y,
-                                       arrow=tk.LAST, width=2, fill=self.colors["text"])
-                mid_x, mid_y = (arrow_start_x + arrow_end_x) / 2, (arrow_start_y + arrow_end_y) / 2
-                label_offset = 15
-                text_x = mid_x + label_offset * math.sin(angle)
-                text_y = mid_y - label_offset * math.cos(angle)
-                self.canvas.create_text(text_x, text_y, text=label, font=('Arial', 9, 'bold'), fill=self.colors["primary"])
+                barre.step()
+            if controle.message and not controle.est_annule:
+                message_var.set(controle.message)
+            if not tache.terminee():
+                dialog.after(100, suivre)
+                return
+
+            dialog.destroy()
+            try:
+                resultat = tache.futur.result()
+            except (OperationAnnulee, CancelledError):
+                messagebox.showinfo("Annulé", f"{titre} : opération annulée.", parent=parent)
+                return
+            except Exception as e:
+                messagebox.showerror("Erreur", f"{erreur}: {str(e)}", parent=parent)
+                return
+            succes(resultat)
+
+        dialog.after(100, suivre)
 
     def actualiser_liste(self):
         """Met à jour la liste des automates sauvegardés dans le dossier 'automates'."""
+        self.catalogue.rafraichir()
         self.liste_automates.delete(0, tk.END)
-        Path("automates").mkdir(exist_ok=True)
-        for f in Path("automates").glob("*.json"):
-            self.liste_automates.insert(tk.END, f.stem)
+        self.liste_automates.insert(tk.END, *self.catalogue.noms())
 
     def creer_automate(self):
         """Crée un nouvel automate avec un nom et un mot de passe."""
@@ -349,11 +449,40 @@ class ModernAutomateApp:
             if not password:
                 return
 
-            self.automate_courant = Automate(nom)
+            self.ouvrir_automate(Automate(nom))
             self.security.save_credentials(nom, password)
             messagebox.showinfo("Succès", f"Automate '{nom}' créé. Ajoutez d'abord des symboles et des états.", parent=self.root)
-            self.afficher_details()
-            self.dessiner_automate()
+            self.rafraichir_vue()
+
+    def creer_depuis_regex(self):
+        """Crée un automate (construction de Glushkov, sans ε) à partir d'une expression régulière."""
+        nom = simpledialog.askstring("Nouvel Automate", "Nom de l'automate:", parent=self.root)
+        if not nom:
+            return
+        if Path(f"automates/{nom}.json").exists():
+            messagebox.showerror("Erreur", f"Un automate nommé '{nom}' existe déjà.", parent=self.root)
+            return
+
+        expr = simpledialog.askstring("Expression régulière",
+                                      "Expression (|, *, +, ?, parenthèses, [a-z], ε) :", parent=self.root)
+        if not expr:
+            return
+        try:
+            automate = Automate.depuis_regex(expr, nom=nom)
+        except ValueError as e:
+            messagebox.showerror("Erreur", str(e), parent=self.root)
+            return
+
+        password = simpledialog.askstring("Sécurité", "Définir un mot de passe pour cet automate:",
+                                          parent=self.root, show='*')
+        if not password:
+            return
+
+        self.ouvrir_automate(automate)
+        self.security.save_credentials(nom, password)
+        messagebox.showinfo("Succès", f"Automate '{nom}' créé : {len(automate.etats)} états, "
+                            f"{len(automate.transitions)} transitions.", parent=self.root)
+        self.rafraichir_vue()
 
     def charger_automate(self, event):
         """Charge un automate depuis la liste en vérifiant le mot de passe."""
@@ -371,10 +500,9 @@ class ModernAutomateApp:
                     messagebox.showerror("Erreur", "Mot de passe incorrect", parent=self.root)
                     return
                 
-                self.automate_courant = Automate.charger(nom)
+                self.ouvrir_automate(Automate.charger(nom))
                 messagebox.showinfo("Automate Chargé", f"Automate '{nom}' chargé avec succès.", parent=self.root)
-                self.afficher_details()
-                self.dessiner_automate()
+                self.rafraichir_vue()
             except FileNotFoundError:
                 messagebox.showerror("Erreur", f"Automate '{nom}' non trouvé.", parent=self.root)
             except Exception as e:
@@ -395,10 +523,9 @@ class ModernAutomateApp:
                     messagebox.showerror("Erreur", "Mot de passe incorrect", parent=self.root)
                     return
                 
-                self.automate_courant = Automate.charger(nom)
+                self.ouvrir_automate(Automate.charger(nom))
                 messagebox.showinfo("Automate Chargé", f"Automate '{nom}' chargé avec succès.", parent=self.root)
-                self.afficher_details()
-                self.dessiner_automate()
+                self.rafraichir_vue()
             except FileNotFoundError:
                 messagebox.showerror("Erreur", f"Automate '{nom}' non trouvé.", parent=self.root)
             except Exception as e:
@@ -444,11 +571,8 @@ class ModernAutomateApp:
             try:
                 os.remove(f"automates/{nom}.json")
                 if self.automate_courant and self.automate_courant.nom == nom:
-                    self.automate_courant = None
-                    self.text_details.config(state=tk.NORMAL)
-                    self.text_details.delete(1.0, tk.END)
-                    self.text_details.config(state=tk.DISABLED)
-                    self.canvas.delete("all")
+                    self.ouvrir_automate(None)
+                    self.rafraichir_vue()
                 self.actualiser_liste()
                 messagebox.showinfo("Succès", f"Automate '{nom}' supprimé.", parent=self.root)
             except FileNotFoundError:
@@ -468,8 +592,10 @@ class ModernAutomateApp:
                 try:
                     max_id = max([a.id for a in self.automate_courant.alphabets], default=0)
                     new_id = max_id + 1
+                    avant = self.automate_courant.instantane()
                     self.automate_courant.ajouter_alphabet(Alphabet(new_id, symbole))
-                    self.afficher_details()
+                    self.memoriser(avant, f"ajout du symbole '{symbole}'")
+                    self.planifier_details()
                 except ValueError as e:
                     messagebox.showerror("Erreur", str(e), parent=self.root)
             else:
@@ -497,9 +623,10 @@ class ModernAutomateApp:
                     try:
                         max_id = max([e.id for e in self.automate_courant.etats], default=0)
                         new_id = max_id + 1
+                        avant = self.automate_courant.instantane()
                         self.automate_courant.ajouter_etat(Etat(new_id, label, type_etat))
-                        self.afficher_details()
-                        self.dessiner_automate()
+                        self.memoriser(avant, f"ajout de l'état '{label}'")
+                        self.rafraichir_vue()
                     except ValueError as e:
                         messagebox.showerror("Erreur", str(e), parent=self.root)
                 else:
@@ -573,10 +700,11 @@ class ModernAutomateApp:
 
                 max_id = max([t.id for t in self.automate_courant.transitions], default=0)
                 new_id = max_id + 1
+                avant = self.automate_courant.instantane()
                 self.automate_courant.ajouter_transition(Transition(new_id, etat_src, etat_dest, alphabet))
+                self.memoriser(avant, "ajout d'une transition")
 
-                self.afficher_details()
-                self.dessiner_automate()
+                self.rafraichir_vue()
                 dialog.destroy()
             except ValueError:
                 messagebox.showerror("Erreur", "Sélection d'état invalide.", parent=dialog)
@@ -596,8 +724,15 @@ class ModernAutomateApp:
             return
         messagebox.showinfo("Modifier Automate", "Fonctionnalité de modification à implémenter.", parent=self.root)
 
+    def planifier_details(self):
+        """Regroupe les demandes de mise à jour des détails en un seul affichage (after_idle)."""
+        if not self._details_planifies:
+            self._details_planifies = True
+            self.root.after_idle(self.afficher_details)
+
     def afficher_details(self):
         """Affiche les détails de l'automate actuel dans l'onglet Détails."""
+        self._details_planifies = False
         self.text_details.config(state=tk.NORMAL)
         self.text_details.delete(1.0, tk.END)
 
@@ -630,6 +765,9 @@ class ModernAutomateApp:
             return
         if not self.automate_courant.transitions and len(self.automate_courant.etats) > 1:
             messagebox.showwarning("Attention", "L'automate n'a pas de transitions.", parent=self.root)
+        elif self.automate_courant.est_vide():
+            messagebox.showwarning("Attention", "Aucun état final n'est accessible : tous les mots seront rejetés.",
+                                   parent=self.root)
 
         mot = simpledialog.askstring("Tester un mot", "Entrez le mot à tester:", parent=self.root)
         if mot is not None:
@@ -641,6 +779,30 @@ class ModernAutomateApp:
             except Exception as e:
                 messagebox.showerror("Erreur", str(e), parent=self.root)
 
+    def tester_fichier_mots(self):
+        """Teste chaque ligne d'un fichier de mots sur plusieurs processus ; résultats écrits dans un fichier."""
+        if not self.automate_courant:
+            messagebox.showerror("Erreur", "Aucun automate sélectionné", parent=self.root)
+            return
+        entree = filedialog.askopenfilename(title="Fichier de mots (un par ligne)", parent=self.root)
+        if not entree:
+            return
+        sortie = filedialog.asksaveasfilename(title="Fichier des résultats", defaultextension=".txt",
+                                              initialfile=Path(entree).stem + "_resultats.txt", parent=self.root)
+        if not sortie:
+            return
+        automate = self.automate_courant
+
+        def afficher(totaux):
+            messagebox.showinfo("Résultat",
+                                f"{totaux['lignes']} mots testés en {totaux['secondes']} s\n"
+                                f"Acceptés : {totaux['acceptes']}\nRejetés : {totaux['rejetes']}\n\n"
+                                f"Résultats écrits dans {sortie}", parent=self.root)
+
+        self.lancer_tache("Test d'un fichier de mots",
+                          lambda controle: tester_corpus(automate, entree, sortie, controle=controle),
+                          succes=afficher, erreur="Erreur lors du test des mots")
+
     def verifier_determinisme(self):
         """Vérifie si l'automate actuel est déterministe."""
         if not self.automate_courant:
@@ -659,14 +821,31 @@ class ModernAutomateApp:
         if self.automate_courant.est_deterministe():
             messagebox.showinfo("Résultat", "L'automate est déjà déterministe.", parent=self.root)
             return
-        try:
-            afd = self.automate_courant.determiniser()
-            self.automate_courant = afd
+
+        def succes(afd):
+            self.remplacer_automate(afd, "AFN → AFD")
             messagebox.showinfo("Succès", "Transformation AFN → AFD réussie.", parent=self.root)
-            self.afficher_details()
-            self.dessiner_automate()
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors de la transformation : {str(e)}", parent=self.root)
+            self.rafraichir_vue()
+
+        self.lancer_tache("Transformation AFN → AFD", self.automate_courant.determiniser,
+                          succes=succes, erreur="Erreur lors de la transformation ")
+
+    def eliminer_epsilon(self):
+        """Remplace l'automate actuel par un AFN équivalent sans ε-transitions."""
+        if not self.automate_courant:
+            messagebox.showerror("Erreur", "Aucun automate sélectionné.", parent=self.root)
+            return
+        if not self.automate_courant.contient_epsilon():
+            messagebox.showinfo("Résultat", "L'automate n'a pas d'ε-transitions.", parent=self.root)
+            return
+
+        def succes(afn):
+            self.remplacer_automate(afn, "élimination des ε")
+            messagebox.showinfo("Succès", "ε-transitions éliminées.", parent=self.root)
+            self.rafraichir_vue()
+
+        self.lancer_tache("Élimination des ε-transitions", self.automate_courant.eliminer_epsilon,
+                          succes=succes, erreur="Erreur lors de l'élimination des ε-transitions ")
 
     def verifier_complet(self):
         """Vérifie si l'automate actuel est complet."""
@@ -687,10 +866,11 @@ class ModernAutomateApp:
             messagebox.showinfo("Info", "L'automate est déjà complet.", parent=self.root)
             return
         try:
+            avant = self.automate_courant.instantane()
             self.automate_courant.completer_automate()
+            self.memoriser(avant, "complétion")
             messagebox.showinfo("Succès", "L'automate a été complété avec succès.", parent=self.root)
-            self.afficher_details()
-            self.dessiner_automate()
+            self.rafraichir_vue()
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors de la complétion: {str(e)}", parent=self.root)
 
@@ -714,42 +894,82 @@ class ModernAutomateApp:
         if not self.automate_courant:
             messagebox.showerror("Erreur", "Aucun automate sélectionné.", parent=self.root)
             return
-        try:
-            afd_min = self.automate_courant.minimiser_auto()
-            self.automate_courant = afd_min
-            messagebox.showinfo("Succès", "L'automate a été minimisé avec succès.", parent=self.root)
-            self.afficher_details()
-            self.dessiner_automate()
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors de la minimisation: {str(e)}", parent=self.root)
+
+        def succes(resultat):
+            afd_min, rapport = resultat
+            self.remplacer_automate(afd_min, "minimisation")
+            methode = "Brzozowski" if rapport["methode"] == "brzozowski" else "déterminisation puis Hopcroft"
+            messagebox.showinfo("Succès", f"L'automate a été minimisé avec succès.\n"
+                                f"Méthode : {methode} ({rapport['raison']}).", parent=self.root)
+            self.rafraichir_vue()
+
+        # minimiser_nfa accepte aussi les AFN et choisit la chaîne de traitement la moins coûteuse
+        self.lancer_tache("Minimisation", self.automate_courant.minimiser_nfa, "auto",
+                          succes=succes, erreur="Erreur lors de la minimisation")
 
    
        
+    def analyser_langage(self):
+        """Affiche si le langage est vide ou fini, ses mots extrêmes et son nombre de mots."""
+        if not self.automate_courant:
+            messagebox.showerror("Erreur", "Aucun automate sélectionné.", parent=self.root)
+            return
+        automate = self.automate_courant
+
+        def analyser(controle=None):
+            if automate.est_vide():
+                return ["Le langage reconnu est vide."]
+            lignes = [f"Mot le plus court : '{automate.mot_le_plus_court()}'"]
+            if automate.est_fini():
+                lignes.insert(0, f"Le langage est fini : {automate.nombre_mots(controle)} mot(s).")
+                lignes.append(f"Mot le plus long : '{automate.mot_le_plus_long()}'")
+            else:
+                lignes.insert(0, "Le langage est infini.")
+            return lignes
+
+        self.lancer_tache("Analyse du langage", analyser,
+                          succes=lambda lignes: messagebox.showinfo("Langage", "\n".join(lignes), parent=self.root),
+                          erreur="Erreur lors de l'analyse du langage")
+
     def generer_mots_acceptes(self):
         """Génère les mots acceptés par l'automate jusqu'à une longueur donnée."""
         if not self.automate_courant:
             messagebox.showerror("Erreur", "Aucun automate sélectionné.", parent=self.root)
             return
+        # Vérifications linéaires avant de lancer une énumération exponentielle
+        if self.automate_courant.est_vide():
+            messagebox.showinfo("Résultat", "Le langage reconnu est vide : aucun mot accepté.", parent=self.root)
+            return
+        maximum = 10
+        if self.automate_courant.est_fini():
+            plus_long = len(self.automate_courant.mot_le_plus_long())
+            maximum = max(1, min(maximum, plus_long))
+            if plus_long <= 10:
+                messagebox.showinfo("Langage fini",
+                                    f"Le langage est fini : aucun mot ne dépasse {plus_long} caractère(s).",
+                                    parent=self.root)
         nb = simpledialog.askinteger(
             "Longueur maximale",
-            "Entrez la longueur (1-10):",
+            f"Entrez la longueur (1-{maximum}):",
             parent=self.root,
             minvalue=1,
-            maxvalue=10
+            maxvalue=maximum
         )
         if nb is None:
             return
-        try:
-            mots = self.automate_courant.generer_mots_acceptes(max_length=nb)
-            messagebox.showinfo("Résultat", f"Mots acceptés générés:\n{', '.join(mots)}", parent=self.root)
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors de la génération: {str(e)}", parent=self.root)
+        self.lancer_tache(
+            "Génération des mots acceptés", self.automate_courant.generer_mots_acceptes, nb,
+            succes=lambda mots: messagebox.showinfo("Résultat", f"Mots acceptés générés:\n{', '.join(mots)}", parent=self.root),
+            erreur="Erreur lors de la génération")
 
     def afficher_mots_rejetes(self):
         """Génère les mots rejetés par l'automate jusqu'à une longueur donnée."""
         if not self.automate_courant:
             messagebox.showerror("Erreur", "Aucun automate sélectionné.", parent=self.root)
             return
+        if self.automate_courant.est_vide():
+            messagebox.showwarning("Attention", "Le langage reconnu est vide : tous les mots sont rejetés.",
+                                   parent=self.root)
         nb = simpledialog.askinteger(
             "Longueur maximale",
             "Entrez la longueur (1-10):",
@@ -759,11 +979,10 @@ class ModernAutomateApp:
         )
         if nb is None:
             return
-        try:
-            mots = self.automate_courant.generer_mots_rejetes(max_length=nb)
-            messagebox.showinfo("Résultat", f"Mots rejetés générés:\n{', '.join(mots)}", parent=self.root)
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors de la génération: {str(e)}", parent=self.root)
+        self.lancer_tache(
+            "Génération des mots rejetés", self.automate_courant.generer_mots_rejetes, nb,
+            succes=lambda mots: messagebox.showinfo("Résultat", f"Mots rejetés générés:\n{', '.join(mots)}", parent=self.root),
+            erreur="Erreur lors de la génération")
 
     def tester_equivalence(self):
         """Teste si deux automates sont équivalents."""
@@ -780,9 +999,13 @@ class ModernAutomateApp:
         spin_length = ttk.Spinbox(top, from_=1, to=10, width=5)
         spin_length.set(5)
         spin_length.grid(row=2, column=1, padx=5, pady=5)
+        ttk.Label(top, text="Méthode:").grid(row=3, column=0, padx=5, pady=5)
+        combo_methode = ttk.Combobox(top, values=METHODES_EQUIVALENCE, state="readonly", width=12)
+        combo_methode.current(0)
+        combo_methode.grid(row=3, column=1, padx=5, pady=5)
 
-        fichiers = sorted(Path("automates").glob("*.json"))
-        noms = [f.stem for f in fichiers]
+        self.catalogue.rafraichir()
+        noms = self.catalogue.noms()
         combo1['values'] = noms
         combo2['values'] = noms
         if len(noms) >= 2:
@@ -794,24 +1017,32 @@ class ModernAutomateApp:
                 auto1 = Automate.charger(combo1.get())
                 auto2 = Automate.charger(combo2.get())
                 max_len = int(spin_length.get())
-                resultat = Automate.sont_equivalents(auto1, auto2, max_len)
-                if isinstance(resultat, tuple) and len(resultat) == 2:
-                    equivalent, message = resultat
-                else:
-                    raise ValueError("La fonction doit retourner un tuple (bool, str)")
+            except Exception as e:
+                messagebox.showerror("Erreur", str(e), parent=top)
+                return
+
+            def afficher(resultat):
+                if not (isinstance(resultat, tuple) and len(resultat) == 2):
+                    messagebox.showerror("Erreur", "La fonction doit retourner un tuple (bool, str)", parent=top)
+                    return
+                equivalent, message = resultat
                 if equivalent:
                     messagebox.showinfo("Résultat", message, parent=top)
                 else:
                     messagebox.showwarning("Résultat", message, parent=top)
-            except Exception as e:
-                messagebox.showerror("Erreur", str(e), parent=top)
+
+            # Les antichaînes comparent exactement les langages : la longueur max est ignorée
+            methode = combo_methode.get()
+            self.lancer_tache("Test d'équivalence",
+                              lambda controle: Automate.sont_equivalents(auto1, auto2, max_len, controle, methode),
+                              succes=afficher, parent=top)
         
-        ttk.Button(top, text="Tester", command=lancer_test).grid(row=3, columnspan=2, pady=10)
+        ttk.Button(top, text="Tester", command=lancer_test).grid(row=4, columnspan=2, pady=10)
 
     def calculerunion(self):
         """Calcule l'union des mots acceptés par deux automates."""
-        fichiers = list(Path("automates").glob("*.json"))
-        noms = [f.stem for f in fichiers]
+        self.catalogue.rafraichir()
+        noms = self.catalogue.noms()
         if len(noms) < 2:
             messagebox.showerror("Erreur", "Besoin d'au moins 2 automates", parent=self.root)
             return
@@ -839,19 +1070,25 @@ class ModernAutomateApp:
                 auto1 = Automate.charger(combo1.get())
                 auto2 = Automate.charger(combo2.get())
                 max_len = int(spin_length.get())
-                mots = auto1.union_mots(auto2, max_len)
-                resultat = "\n".join(sorted(mots, key=lambda x: (len(x), x))[:1000])
-                supplement = f"\n...{len(mots) - resultat.count('\n')} mots supplémentaires" if len(mots) > resultat.count('\n') else ""
-                messagebox.showinfo("Résultat", f"{len(mots)} mots trouvés (longueur ≤ {max_len}):\n\n{resultat}{supplement}", parent=top)
             except Exception as e:
                 messagebox.showerror("Erreur", str(e), parent=top)
+                return
+
+            def afficher(mots):
+                resultat = "\n".join(sorted(mots, key=lambda x: (len(x), x))[:1000])
+                nb_lignes = resultat.count("\n")
+                supplement = f"\n...{len(mots) - nb_lignes} mots supplémentaires" if len(mots) > nb_lignes else ""
+                messagebox.showinfo("Résultat", f"{len(mots)} mots trouvés (longueur ≤ {max_len}):\n\n{resultat}{supplement}", parent=top)
+
+            self.lancer_tache("Union d'automates", auto1.union_mots, auto2, max_len,
+                              succes=afficher, parent=top)
         
         ttk.Button(top, text="Calculer l'union", command=lancer_calcul).grid(row=3, columnspan=2, pady=10)
 
     def calculer_intersection(self):
         """Calcule l'intersection des mots acceptés par deux automates."""
-        fichiers = list(Path("automates").glob("*.json"))
-        noms = [f.stem for f in fichiers]
+        self.catalogue.rafraichir()
+        noms = self.catalogue.noms()
         if len(noms) < 2:
             messagebox.showerror("Erreur", "Besoin d'au moins 2 automates", parent=self.root)
             return
@@ -879,39 +1116,46 @@ class ModernAutomateApp:
                 auto1 = Automate.charger(combo1.get())
                 auto2 = Automate.charger(combo2.get())
                 max_len = int(spin_length.get())
-                mots = auto1.intersection_mots(auto2, max_len)
-                resultat = "\n".join(sorted(mots, key=lambda x: (len(x), x)))
-                messagebox.showinfo("Résultat", f"{len(mots)} mots communs trouvés (longueur ≤ {max_len}):\n{resultat}", parent=top)
             except Exception as e:
                 messagebox.showerror("Erreur", str(e), parent=top)
+                return
+
+            def afficher(mots):
+                resultat = "\n".join(sorted(mots, key=lambda x: (len(x), x)))
+                messagebox.showinfo("Résultat", f"{len(mots)} mots communs trouvés (longueur ≤ {max_len}):\n{resultat}", parent=top)
+
+            self.lancer_tache("Intersection d'automates", auto1.intersection_mots, auto2, max_len,
+                              succes=afficher, parent=top)
         
         ttk.Button(top, text="Calculer l'intersection", command=lancer_calcul).grid(row=3, columnspan=2, pady=10)
 
     def calculer_complement(self):
-        """Calcule le complément de l'automate actuel (pas encore implémenté)."""
+        """Remplace l'automate actuel par son complément."""
         if not self.automate_courant:
             messagebox.showerror("Erreur", "Aucun automate sélectionné.", parent=self.root)
             return
-        messagebox.showinfo("Résultat", "Fonctionnalité de complément non implémentée.", parent=self.root)
+
+        def succes(complement):
+            self.remplacer_automate(complement, "complément")
+            messagebox.showinfo("Succès", "Le complément de l'automate a été calculé.", parent=self.root)
+            self.rafraichir_vue()
+
+        self.lancer_tache("Complément", self.automate_courant.complementer,
+                          succes=succes, erreur="Erreur lors du calcul du complément")
 
     def afficher_infos_securite(self):
         """Affiche un résumé des informations de sécurité pour les automates."""
         try:
-            automates = list(Path("automates").glob("*.json"))
+            self.catalogue.rafraichir()
+            automates = self.catalogue.noms()
             if not automates:
                 messagebox.showinfo("Sécurité", "Aucun automate trouvé dans le dossier 'automates'.", parent=self.root)
                 return
 
             protected_automates = []
-            for automate_file in automates:
-                nom = automate_file.stem
-                try:
-                    has_password = self.security.verify_password(nom, "") is not None
-                    if has_password:
-                        mod_time = datetime.fromtimestamp(automate_file.stat().st_mtime)
-                        protected_automates.append(f"- {nom} (Dernière modification: {mod_time.strftime('%Y-%m-%d %H:%M:%S')})")
-                except Exception:
-                    continue
+            for entree in self.catalogue.proteges():
+                mod_time = datetime.fromtimestamp(entree["mtime"] / 1e9)
+                protected_automates.append(f"- {entree['nom']} (Dernière modification: {mod_time.strftime('%Y-%m-%d %H:%M:%S')})")
 
             total_automates = len(automates)
             total_protected = len(protected_automates)
@@ -0,0 +1,64 @@
+"""Tests de cli.py, lancé comme en ligne de commande (python -m unittest discover tests)."""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from itertools import product
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from classes.Automate import Automate  # noqa: E402
+
+
+def _cli(*arguments) -> list:
+    sortie = subprocess.run([sys.executable, os.path.join(RACINE, "cli.py"), *arguments], cwd=RACINE,
+                            capture_output=True, text=True, check=True).stdout
+    return [json.loads(ligne) for ligne in sortie.splitlines()]
+
+
+def _mots(symboles: str, longueur_max: int):
+    for longueur in range(longueur_max + 1):
+        for lettres in product(symboles, repeat=longueur):
+            yield "".join(lettres)
+
+
+class TestTransformations(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dossier.cleanup)
+
+    def test_minimiser_un_afn(self):
+        source = Automate.depuis_regex("(a|b)*abb", nom="abb")
+        self.assertFalse(source.est_deterministe())
+        chemin = os.path.join(self.dossier.name, "abb.json")
+        source.sauvegarder_fichier(chemin)
+
+        (ligne,) = _cli("minimiser", chemin, "--sortie", self.dossier.name)
+        resultat = Automate.charger_fichier(ligne["sortie"])
+
+        self.assertTrue(resultat.est_deterministe())
+        self.assertEqual(ligne["nb_etats"], 4)
+        for mot in _mots("ab", 8):
+            self.assertEqual(resultat.reconnait_mot(mot), source.reconnait_mot(mot), mot)
+
+    def test_completer_dans_le_dossier_source(self):
+        source = Automate.depuis_regex("ab", nom="ab")
+        chemin = os.path.join(self.dossier.name, "ab.json")
+        source.sauvegarder_fichier(chemin)
+        with open(chemin) as f:
+            contenu = f.read()
+
+        (ligne,) = _cli("completer", chemin, "--sortie", self.dossier.name)
+
+        self.assertNotEqual(os.path.abspath(ligne["sortie"]), os.path.abspath(chemin))
+        with open(chemin) as f:
+            self.assertEqual(f.read(), contenu)
+        self.assertTrue(Automate.charger_fichier(ligne["sortie"]).est_complet())
+
+
+if __name__ == "__main__":
+    unittest.main()